@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+
+
+"""
+=============================
+HTMLLIB Fused Parse Benchmark
+=============================
+
+Compares the peak memory and time of parsing a stream into nodes with the parser holding the full list of tokens
+against a parser fused with the lexer, which only ever holds the current token.
+
+Run from the root of the repository with:
+
+    .. code-block:: bash
+
+        python -m benchmarks.bench_fused_memory [repeat]
+"""
+
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+
+from src import htmllib
+
+
+def measure(build) -> tuple:
+    """
+    Return the result of calling ``build``, the peak amount of memory (in bytes) allocated while it ran and the time
+    (in seconds) that it took.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak, elapsed
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    with open("tests/data/basic.html", "r") as file_obj:
+        stream = file_obj.read() * repeat
+
+    nodes, nodes_peak, nodes_time = measure(lambda: htmllib.Parser(stream)._parse_tokens_to_node_list())
+    fused, fused_peak, fused_time = measure(lambda: htmllib.Parser(stream, fused=True)._parse_tokens_to_node_list())
+    assert len(nodes) == len(fused)
+
+    print(f"Stream size      : {len(stream):>12,} chars")
+    print(f"Nodes            : {len(nodes):>12,}")
+    print(f"Token list       : {nodes_peak:>12,} bytes peak ({nodes_time:.3f}s)")
+    print(f"Fused            : {fused_peak:>12,} bytes peak ({fused_time:.3f}s)")
+    print(f"Reduction        : {nodes_peak / fused_peak:>12.1f}x")
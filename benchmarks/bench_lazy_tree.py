@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+
+
+"""
+===========================
+HTMLLIB Lazy Tree Benchmark
+===========================
+
+Compares the latency to the first result of a query on a large page for a tree parsed up front against a lazy tree,
+which only lexes and parses as far as the query needs.
+
+Run from the root of the repository with:
+
+    .. code-block:: bash
+
+        python -m benchmarks.bench_lazy_tree [repeat]
+"""
+
+
+from __future__ import annotations
+
+import sys
+import time
+
+from src import htmllib
+
+
+def timed(run) -> tuple:
+    """
+    Return the result of calling ``run`` and the time (in seconds) that it took.
+    """
+    start = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    with open("tests/data/basic.html", "r") as file_obj:
+        stream = file_obj.read() * repeat
+
+    queries = {
+        "construct": lambda htmltree: htmltree,
+        "first <title>": lambda htmltree: htmltree.find_first_tag_by_name("title").inner_html,
+        "first <p> (iter)": lambda htmltree: next(htmltree.iter_tags_by_name("p")).inner_html,
+        "search_tags_by_name": lambda htmltree: len(htmltree.search_tags_by_name("p")),
+    }
+
+    print(f"Stream size        : {len(stream):>12,} chars")
+    for name, query in queries.items():
+        eager, eager_time = timed(lambda: query(htmllib.HTMLTree(stream)))
+        lazy, lazy_time = timed(lambda: query(htmllib.HTMLTree(stream, lazy=True)))
+        assert name == "construct" or eager == lazy
+        print(f"{name:<19}: {eager_time * 1000:>9.2f} ms eager {lazy_time * 1000:>9.2f} ms lazy")
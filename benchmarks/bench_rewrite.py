@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+
+"""
+=========================
+HTMLLIB Rewrite Benchmark
+=========================
+
+Compares rewriting a large page (setting the ``src`` of every ``<img>`` and removing every ``<style>``) and writing
+the HTML back out through the rewrite methods and :meth:`HTMLTree.serialize`, against making the same changes with
+:meth:`HTMLTree.apply_edit`, which builds a new stream for each change.
+
+Run from the root of the repository with:
+
+    .. code-block:: bash
+
+        python -m benchmarks.bench_rewrite [repeat]
+"""
+
+
+from __future__ import annotations
+
+import sys
+import time
+
+from src import htmllib
+
+
+def timed(run) -> tuple:
+    """
+    Return the result of calling ``run`` and the time (in seconds) that it took.
+    """
+    start = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - start
+
+
+def rewrite(htmltree: htmllib.HTMLTree) -> str:
+    """
+    Make the changes with the rewrite methods and serialize the tree once.
+    """
+    for node in htmltree.search_tags_by_name("img", self_closing=True): htmltree.set_attribute(node, "src", "/a.png")
+    for node in htmltree.search_tags_by_name("style"): htmltree.remove_node(node)
+    return htmltree.serialize()
+
+
+def edit(htmltree: htmllib.HTMLTree) -> str:
+    """
+    Make the same changes with :meth:`HTMLTree.apply_edit`, from the last to the first so the offsets stay valid.
+    """
+    changes = []
+    for node in htmltree.search_tags_by_name("img", self_closing=True):
+        start, end = node.cursor_start.index, node.cursor_end.index + 1
+        changes.append((start, end, '<img src="/a.png"' + htmltree.html_stream[start:end].split('"None"', 1)[1]))
+    for node in htmltree.search_tags_by_name("style"):
+        changes.append((node.cursor_start.index, node.closing_tag.cursor_end.index + 1, ""))
+    for start, end, text in sorted(changes, reverse=True): htmltree.apply_edit(start, end - start, text)
+    return htmltree.html_stream
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    with open("tests/data/basic.html", "r") as file_obj:
+        stream = file_obj.read() * repeat
+
+    rewritten_tree, edited_tree = htmllib.HTMLTree(stream), htmllib.HTMLTree(stream)
+    rewritten, rewrite_time = timed(lambda: rewrite(rewritten_tree))
+    edited, edit_time = timed(lambda: edit(edited_tree))
+    assert rewritten == edited
+
+    print(f"Stream size        : {len(stream):>12,} chars")
+    print(f"rewrite + serialize: {rewrite_time * 1000:>9.2f} ms")
+    print(f"apply_edit         : {edit_time * 1000:>9.2f} ms")
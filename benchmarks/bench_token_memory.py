@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+
+
+"""
+==============================
+HTMLLIB Token Memory Benchmark
+==============================
+
+Compares the memory held by a list of ``Token`` objects against a compact ``TokenTable`` for the same stream.
+
+Run from the root of the repository with:
+
+    .. code-block:: bash
+
+        python -m benchmarks.bench_token_memory [repeat]
+"""
+
+
+from __future__ import annotations
+
+import sys
+import tracemalloc
+
+from src import htmllib
+
+
+def measure(build) -> tuple:
+    """
+    Return the result of calling ``build`` and the amount of memory (in bytes) still held by it afterwards.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    with open("tests/data/basic.html", "r") as file_obj:
+        stream = file_obj.read() * repeat
+
+    tokens, tokens_size = measure(lambda: htmllib.Lexer(stream).lex())
+    table, table_size = measure(lambda: htmllib.Lexer(stream).lex_table())
+
+    print(f"Stream size      : {len(stream):>12,} chars")
+    print(f"Tokens           : {len(tokens):>12,}")
+    print(f"list[Token]      : {tokens_size:>12,} bytes ({tokens_size / len(tokens):.1f} bytes/token)")
+    print(f"TokenTable       : {table_size:>12,} bytes ({table_size / len(table):.1f} bytes/token)")
+    print(f"Reduction        : {tokens_size / table_size:>12.1f}x")
@@ -21,6 +21,7 @@ __license__ = "GNU GPLv3"
 from .lexer import (
     Lexer,
     TokenTypes,
+    TokenTable,
     pretty_print_tokens
 )
 
@@ -31,8 +32,31 @@ from .parser import (
     HTMLClosingTagNode,
     HTMLSelfClosingTagNode,
     HTMLErrorNode,
+    HTMLNode,
+    ErrorCodes,
+    ErrorPolicy,
     NonValidTagIDError,
     NeverEndedTagError
 )
 
+from .entities import decode_entities
+
+from .text import iter_text
+
+from .selector import (
+    compile_selector,
+    select_many,
+    Selector,
+    SelectorSyntaxError
+)
+
 from .htmltree import *  # Main interface.
+
+from .batch import (
+    parse_many,
+    to_records,
+    ParsedDocument,
+    NodeRecord
+)
+
+from .cache import ParseCache
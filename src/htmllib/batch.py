@@ -0,0 +1,159 @@
+"""
+=====================
+HTMLLIB Batch Parsing
+=====================
+
+Parse many HTML documents at once, fanned out across a pool of worker processes. Only a compact picklable copy of the
+nodes (or whatever a query callback picks out of each tree) is sent back from the workers.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from os import cpu_count
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+
+from .parser import (
+    ErrorCodes,
+    HTMLDoctypeOrCommNode,
+    HTMLOpeningTagNode,
+    HTMLSelfClosingTagNode,
+    HTMLErrorNode
+)
+from .htmltree import HTMLTree
+
+
+class NodeRecord(NamedTuple):
+    """
+    A compact, picklable copy of a parsed node. Offsets index into the document the node was parsed from.
+    """
+    kind: type  # The class of the node, e.g. ``HTMLOpeningTagNode``.
+    tag_name: str = None
+    attributes: dict = None
+    start: int = None  # Index of the node's '<'.
+    end: int = None  # Index of the node's '>' (or where it stopped, for error nodes).
+    inner_end: int = None  # Opening tags only, the inner HTML is ``document[end + 1 : inner_end]`` once closed.
+    text: str = None  # Doctype/ comment nodes only, their raw text.
+    error: ErrorCodes = None  # Error nodes only.
+
+
+class ParsedDocument(NamedTuple):
+    """
+    The result of parsing one document with :func:`parse_many` when no query callback was given.
+    """
+    nodes: list
+    error_count: int
+
+
+def to_records(htmltree: HTMLTree) -> ParsedDocument:
+    """
+    Copy the nodes of ``htmltree`` into a :class:`ParsedDocument` of :class:`NodeRecord` tuples.
+    """
+    records = []
+    for node in htmltree.nodes_list:
+        node_type = type(node)
+        if node_type == HTMLOpeningTagNode:
+            inner_end = node.closing_tag.cursor_start.index if node.closing_tag is not None else None
+            records.append(NodeRecord(node_type, node.tag_name, node.attributes, node.cursor_start.index,
+                                      node.cursor_end.index, inner_end))
+        elif node_type == HTMLDoctypeOrCommNode:
+            records.append(NodeRecord(node_type, start=node.cursor_start.index, end=node.cursor_end.index,
+                                      text=node.text_raw))
+        elif node_type == HTMLErrorNode:
+            records.append(NodeRecord(node_type, start=node.cursor_start.index, end=node.cursor_end.index,
+                                      error=node.code))
+        else:
+            attributes = node.attributes if node_type == HTMLSelfClosingTagNode else None
+            records.append(NodeRecord(node_type, node.tag_name, attributes, node.cursor_start.index,
+                                      node.cursor_end.index))
+    return ParsedDocument(records, htmltree.error_count)
+
+
+def _chunks(documents: Iterable, chunksize: int) -> Iterator[tuple]:
+    """
+    **For internal use only**
+
+    Split ``documents`` into lists of ``chunksize`` documents, yielded along with the index of their first document.
+    """
+    documents, start = iter(documents), 0
+    while True:
+        chunk = list(islice(documents, chunksize))
+        if not chunk: return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _parse_chunk(start: int, documents: list, query: Callable, options: dict) -> list:
+    """
+    **For internal use only**
+
+    Parse a chunk of documents in a worker process, returning the ``(index, result)`` pair of each.
+    """
+    results = []
+    for index, document in enumerate(documents, start):
+        htmltree = HTMLTree(document, **options)
+        results.append((index, query(htmltree) if query is not None else to_records(htmltree)))
+    return results
+
+
+def parse_many(documents: Iterable[str | bytes], *, workers: int=None, chunksize: int=16, ordered: bool=True,
+               query: Callable[[HTMLTree], Any]=None, **options) -> Iterator:
+    """
+    Parse each of ``documents`` into an :class:`HTMLTree` across a pool of ``workers`` processes (as many as there are
+    CPUs by default, or in this process with ``0``) and lazily yield the results.
+
+    Documents are sent to the workers ``chunksize`` at a time, with only a few chunks per worker in flight so that the
+    documents can come from a lazy iterable of any length. Any other keyword arguments are passed on to each
+    :class:`HTMLTree`.
+
+    :param ordered: Yield the results in the same order as ``documents``, else yield ``(index, result)`` pairs as soon
+        as they are ready
+    :type ordered: bool, optional
+
+    :param query: Called with each tree in the worker, only its (picklable) return value is sent back instead of a
+        :class:`ParsedDocument`
+    :type query: Callable, optional
+
+    ::
+
+        def links(htmltree):
+            return [node.attributes["href"] for node in htmltree.search_tags_by_attr_key("href")]
+
+        if __name__ == "__main__":
+            for hrefs in htmllib.parse_many(pages, query=links, keep="a"):
+                print(hrefs)
+    """
+    assert chunksize > 0, "The chunk size must be at least 1"
+    assert workers is None or workers >= 0, "The number of workers can not be negative"
+    chunks = _chunks(documents, chunksize)
+
+    if workers == 0:
+        for start, chunk in chunks:
+            for index, result in _parse_chunk(start, chunk, query, options):
+                yield result if ordered else (index, result)
+        return
+
+    in_flight = (workers or cpu_count() or 1) * 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque() if ordered else set()
+        for start, chunk in chunks:
+            future = executor.submit(_parse_chunk, start, chunk, query, options)
+            if ordered:
+                pending.append(future)
+                if len(pending) >= in_flight:
+                    for _, result in pending.popleft().result(): yield result
+            else:
+                pending.add(future)
+                if len(pending) >= in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done: yield from future.result()
+
+        if ordered:
+            for future in pending:
+                for _, result in future.result(): yield result
+        else:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done: yield from future.result()
@@ -0,0 +1,267 @@
+"""
+===================
+HTMLLIB Parse Cache
+===================
+
+A persistent, content addressed cache of parsed HTML. Trees are stored on local disk as a compact binary table of
+their nodes, keyed by a hash of the stream and the parser options, so parsing the same HTML again only has to load the
+table instead of lexing and parsing the stream.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import marshal
+import os
+import struct
+import tempfile
+
+from array import array
+from hashlib import sha256
+
+from .lexer import Cursor, Token, TokenTypes
+from .parser import (
+    Parser,
+    ErrorCodes,
+    ErrorPolicy,
+    HTMLDoctypeOrCommNode,
+    HTMLOpeningTagNode,
+    HTMLClosingTagNode,
+    HTMLSelfClosingTagNode,
+    HTMLErrorNode
+)
+from .htmltree import HTMLTree
+
+
+CACHE_FORMAT_VERSION = 2  # Bumped whenever the table format (or what the parser makes of a stream) changes.
+
+_MAGIC = b"HTMLLIBC"
+_HEADER = struct.Struct("<8sH")
+_SUFFIX = ".htmlc"
+_KINDS = (HTMLOpeningTagNode, HTMLClosingTagNode, HTMLSelfClosingTagNode, HTMLDoctypeOrCommNode, HTMLErrorNode)
+_KIND_CODES = {kind: code for code, kind in enumerate(_KINDS)}
+
+
+def _dump_tree(htmltree: HTMLTree) -> bytes:
+    """
+    **For internal use only**
+
+    Encode the nodes of ``htmltree`` into the binary cache format: a versioned header followed by a marshalled tuple
+    of node columns. Nodes are referred to by their position in :attr:`HTMLTree.nodes_list`.
+    """
+    nodes = htmltree.nodes_list
+    positions = {id(node): position for position, node in enumerate(nodes)}
+    names, name_ids = {}, array("i")
+    kinds, starts, ends, attributes, links = bytearray(), array("q"), array("q"), [], []
+    parents = array("q") if htmltree.root_nodes is not None else None
+
+    for node in nodes:
+        kind = type(node)
+        kinds.append(_KIND_CODES[kind])
+        starts.append(node.cursor_start.index)
+        ends.append(node.cursor_end.index)
+        name = getattr(node, "tag_name", None)
+        name_ids.append(-1 if name is None else names.setdefault(name, len(names)))
+        attributes.append(node.attributes if kind == HTMLOpeningTagNode or kind == HTMLSelfClosingTagNode else None)
+        if parents is not None:
+            parent = getattr(node, "parent", None)
+            parents.append(-1 if parent is None else positions[id(parent)])
+
+        if kind == HTMLOpeningTagNode:
+            closing_tag = node.closing_tag
+            if closing_tag is None: links.append(None)
+            elif id(closing_tag) in positions: links.append(positions[id(closing_tag)])
+            else:  # Implied, or dropped by ``keep``.
+                links.append((closing_tag.cursor_start.index, closing_tag.cursor_end.index, closing_tag.implied))
+        elif kind == HTMLDoctypeOrCommNode:
+            links.append((node.token.cursor.index, node.token.extra_len))
+        elif kind == HTMLErrorNode:
+            links.append((node.code.value, node.value))
+        else:
+            links.append(None)
+
+    table = (tuple(names), name_ids.tobytes(), bytes(kinds), starts.tobytes(), ends.tobytes(), tuple(attributes),
+             tuple(links), None if parents is None else parents.tobytes(), htmltree.error_count)
+    return _HEADER.pack(_MAGIC, CACHE_FORMAT_VERSION) + marshal.dumps(table, 4)
+
+
+def _load_tree(html_stream: str, data: bytes, options: dict, *, query_cache_size: int=256) -> HTMLTree:
+    """
+    **For internal use only**
+
+    Rebuild the tree encoded in ``data`` by :func:`_dump_tree` for ``html_stream``, without lexing or parsing it.
+    """
+    magic, version = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != CACHE_FORMAT_VERSION: raise ValueError("Not a parse cache entry of this version")
+    names, name_ids, kinds, starts, ends, attributes, links, parents, error_count = marshal.loads(data[_HEADER.size:])
+    name_ids, starts, ends = array("i", name_ids), array("q", starts), array("q", ends)
+
+    parser = Parser(html_stream, fused=True, **options)  # Nothing is lexed until tokens are pulled from it.
+    lines, cursors = parser.lexer.lines, {}
+
+    def cursor(index: int) -> Cursor:  # Nodes share cursors at the same index, as they do when sharing tokens.
+        found = cursors.get(index)
+        if found is None: found = cursors[index] = Cursor(index, lines=lines)
+        return found
+
+    nodes = []
+    for position, kind in enumerate(kinds):
+        start, end, link = cursor(starts[position]), cursor(ends[position]), links[position]
+        name = names[name_ids[position]] if name_ids[position] != -1 else None
+        if kind == 0: node = HTMLOpeningTagNode(name, attributes[position], start, end)
+        elif kind == 1: node = HTMLClosingTagNode(name, start, end)
+        elif kind == 2: node = HTMLSelfClosingTagNode(name, attributes[position], start, end)
+        elif kind == 3: node = HTMLDoctypeOrCommNode(Token(TokenTypes.EXCLAMATION, "!", cursor(link[0]),
+                                                           extra_len=link[1]), start, end)
+        else: node = HTMLErrorNode(ErrorCodes(link[0]), link[1], start, end)
+        nodes.append(node)
+
+    for position, node in enumerate(nodes):
+        link = links[position]
+        if kinds[position] != 0 or link is None: continue
+        if type(link) == int: node.closing_tag = nodes[link]
+        else: node.closing_tag = HTMLClosingTagNode(node.tag_name, cursor(link[0]), cursor(link[1]), link[2])
+
+    root_nodes = None
+    if parents is not None:
+        root_nodes = []
+        for node in nodes:
+            if type(node) == HTMLOpeningTagNode: node.children = []
+        for position, parent in enumerate(array("q", parents)):
+            node = nodes[position]
+            if type(node) == HTMLClosingTagNode: continue
+            if parent != -1: node.parent = nodes[parent]
+            (node.parent.children if node.parent is not None else root_nodes).append(node)
+
+    parser._restore_nodes(nodes, root_nodes, error_count)
+    return HTMLTree._from_parser(parser, query_cache_size=query_cache_size)
+
+
+class ParseCache:
+    """
+    An opt-in cache around :class:`HTMLTree`, backed by a directory on local disk. Each entry is keyed by a hash of the
+    decoded stream plus the options the tree was parsed with, and holds a compact binary table of the tree's nodes.
+    When the entries take up more than ``max_bytes`` the least recently used ones are evicted.
+
+    Trees loaded from the cache are not backed by any tokens, so they can not be edited with
+    :meth:`HTMLTree.apply_edit`.
+
+    :param directory: The directory to keep the cache entries in, created if it does not exist
+    :type directory: str
+
+    :param max_bytes: The most disk space the entries may take up
+    :type max_bytes: int, optional
+
+    -------------
+    Example Usage
+    -------------
+
+    ::
+
+        import htmllib
+
+        cache = htmllib.ParseCache(".htmllib_cache", max_bytes=256 * 1024 * 1024)
+
+        for page in pages:
+            htmltree = cache.parse(page, keep=["a", "meta"])  # Only parsed the first time this page is seen.
+            print(htmltree.search_tags_by_name("a"))
+    """
+    def __init__(self, directory: str, *, max_bytes: int=512 * 1024 * 1024) -> None:
+        assert max_bytes > 0, "The cache must be allowed to take up some space"
+        os.makedirs(directory, exist_ok=True)
+        self.__directory = directory
+        self.__max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def directory(self) -> str:
+        """
+        The directory the cache entries are kept in.
+        """
+        return self.__directory
+
+    @staticmethod
+    def key(html_stream: str, options: dict) -> str:
+        """
+        The key of the cache entry for ``html_stream`` parsed with ``options``.
+        """
+        keep = options.get("keep")
+        if keep is not None:
+            keep = (keep,) if type(keep) == str or callable(keep) else tuple(keep)
+            assert all(type(item) == str for item in keep), "Only trees kept by tag name can be cached"
+            options = dict(options, keep=sorted(item.lower() for item in keep))
+        options = {name: value for name, value in options.items() if name != "fused"}  # Does not change the nodes.
+        digest = sha256(f"{CACHE_FORMAT_VERSION}:{sorted(options.items())!r}:".encode("utf-8"))
+        digest.update(html_stream.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def __path(self, key: str) -> str:
+        """
+        **For internal use only**
+
+        The path of the file for the cache entry ``key``.
+        """
+        return os.path.join(self.__directory, key + _SUFFIX)
+
+    def parse(self, html_stream: str | bytes, *, build_tree: bool=False, error_policy: ErrorPolicy=ErrorPolicy.COLLECT,
+              max_errors: int=None, keep: str | list=None, decode_entities: bool=False, fused: bool=False,
+              query_cache_size: int=256) -> HTMLTree:
+        """
+        Return the :class:`HTMLTree` for ``html_stream``, loaded from the cache if it has been parsed with the same
+        options before, else parsed and then stored. The options are the same as those of :class:`HTMLTree`, except
+        that there is no ``lazy`` option: the whole stream has to be parsed to store it, and a tree loaded from the
+        cache has nothing left to parse. Neither ``fused`` nor ``query_cache_size`` change the nodes, so they are not
+        part of the key.
+        """
+        assert type(html_stream) == bytes or type(html_stream) == str, "HTML Stream must be bytes string or string"
+        html_stream = html_stream.decode("utf-8") if type(html_stream) == bytes else html_stream
+        options = {"build_tree": build_tree, "error_policy": error_policy, "max_errors": max_errors, "keep": keep,
+                   "decode_entities": decode_entities}
+        path = self.__path(self.key(html_stream, options))
+
+        try:
+            with open(path, "rb") as file_obj:
+                htmltree = _load_tree(html_stream, file_obj.read(), options, query_cache_size=query_cache_size)
+            os.utime(path)  # Marks the entry as recently used.
+            self.hits += 1
+            return htmltree
+        except FileNotFoundError:
+            pass
+        except (ValueError, EOFError, TypeError, IndexError, struct.error):  # Corrupt or from another version.
+            with contextlib.suppress(FileNotFoundError): os.remove(path)  # Unless another process got to it first.
+
+        self.misses += 1
+        htmltree = HTMLTree(html_stream, fused=fused, query_cache_size=query_cache_size, **options)
+        self.__store(path, _dump_tree(htmltree))
+        return htmltree
+
+    def __store(self, path: str, data: bytes) -> None:
+        """
+        **For internal use only**
+
+        Atomically write a cache entry, then evict the least recently used entries while over :attr:`max_bytes`.
+        """
+        descriptor, temp_path = tempfile.mkstemp(dir=self.__directory, suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as file_obj:
+            file_obj.write(data)
+        os.replace(temp_path, path)
+
+        stats = {}
+        for entry in os.scandir(self.__directory):
+            if not entry.name.endswith(_SUFFIX): continue
+            with contextlib.suppress(FileNotFoundError): stats[entry.path] = entry.stat()  # Unless removed meanwhile.
+        total = sum(stat.st_size for stat in stats.values())
+        for entry_path in sorted(stats, key=lambda entry_path: stats[entry_path].st_mtime_ns):
+            if total <= self.__max_bytes: break
+            if entry_path == path: continue  # Never evict the entry that was just stored.
+            with contextlib.suppress(FileNotFoundError): os.remove(entry_path)
+            total -= stats[entry_path].st_size
+
+    def clear(self) -> None:
+        """
+        Remove every entry from the cache.
+        """
+        for entry in os.scandir(self.__directory):
+            if not entry.name.endswith(_SUFFIX): continue
+            with contextlib.suppress(FileNotFoundError): os.remove(entry.path)
@@ -0,0 +1,92 @@
+"""
+=======================
+HTMLLIB Entity Decoding
+=======================
+
+Decode the named (``&amp;``) and numeric (``&#39;``, ``&#x27;``) character references in attribute values and text, by
+the rules of the HTML standard. Strings without a ``&`` in them are returned as they are without being scanned.
+"""
+
+from __future__ import annotations
+
+import re
+
+from html.entities import html5
+
+
+_REFERENCE = re.compile(r"&(#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[^\t\n\f <&#;]{1,32};?)")
+
+_NAMED = html5  # E.g. {"amp;": "&", "amp": "&", ...}, only a few legacy names are also valid without the ';'.
+_LEGACY_MAX_LEN = max(len(name) for name in _NAMED if not name.endswith(";"))
+
+# Numeric references that do not map to their own code point, mostly the C1 controls read as windows-1252.
+_NUMERIC_REPLACEMENTS = {0x00: "�", 0x0d: "\r", 0x80: "€", 0x81: "\x81", 0x82: "‚", 0x83: "ƒ",
+                         0x84: "„", 0x85: "…", 0x86: "†", 0x87: "‡", 0x88: "ˆ", 0x89: "‰",
+                         0x8a: "Š", 0x8b: "‹", 0x8c: "Œ", 0x8d: "\x8d", 0x8e: "Ž", 0x8f: "\x8f",
+                         0x90: "\x90", 0x91: "‘", 0x92: "’", 0x93: "“", 0x94: "”", 0x95: "•",
+                         0x96: "–", 0x97: "—", 0x98: "˜", 0x99: "™", 0x9a: "š", 0x9b: "›",
+                         0x9c: "œ", 0x9d: "\x9d", 0x9e: "ž", 0x9f: "Ÿ"}
+
+# Code points that are dropped when referenced, the non-characters and (most of) the control characters.
+_NUMERIC_DROPPED = frozenset([*range(0x01, 0x09), 0x0b, *range(0x0e, 0x20), 0x7f, *range(0xfdd0, 0xfdf0),
+                              *(plane | low for plane in range(0, 0x110000, 0x10000) for low in (0xfffe, 0xffff))])
+
+
+def _decode_numeric(reference: str) -> str:
+    """
+    **For internal use only**
+
+    Decode a numeric reference without its ``&``, e.g. ``#39;`` or ``#x27``.
+    """
+    digits = reference[1:].rstrip(";")
+    code_point = int(digits[1:], 16) if digits[0] in "xX" else int(digits)
+    if code_point in _NUMERIC_REPLACEMENTS: return _NUMERIC_REPLACEMENTS[code_point]
+    if 0xd800 <= code_point <= 0xdfff or code_point > 0x10ffff: return "�"
+    if code_point in _NUMERIC_DROPPED: return ""
+    return chr(code_point)
+
+
+def _replace_text(match: re.Match) -> str:
+    """
+    **For internal use only**
+
+    Replace one reference found in text. Legacy names without a ``;`` are decoded even when followed by other chars,
+    e.g. ``&copy2024`` is ``©2024``.
+    """
+    reference = match.group(1)
+    if reference[0] == "#": return _decode_numeric(reference)
+    if reference in _NAMED: return _NAMED[reference]
+    for length in range(min(len(reference) - 1, _LEGACY_MAX_LEN), 1, -1):  # Longest legacy name it starts with.
+        if reference[:length] in _NAMED: return _NAMED[reference[:length]] + reference[length:]
+    return match.group(0)
+
+
+def _replace_attribute(match: re.Match) -> str:
+    """
+    **For internal use only**
+
+    Replace one reference found in an attribute value. Unlike in text, a legacy name without a ``;`` is left as it is
+    when it is followed by an alphanumeric char or ``=``, so ``?a=1&copy=2`` in a URL is not changed.
+    """
+    reference = match.group(1)
+    if reference[0] == "#": return _decode_numeric(reference)
+    if reference in _NAMED: return _NAMED[reference]
+    for length in range(min(len(reference) - 1, _LEGACY_MAX_LEN), 1, -1):
+        if reference[:length] in _NAMED:
+            if reference[length].isalnum() or reference[length] == "=": return match.group(0)
+            return _NAMED[reference[:length]] + reference[length:]
+    return match.group(0)
+
+
+def decode_entities(value: str, *, attribute: bool=False) -> str:
+    """
+    Decode the character references in ``value``, a string of text or (with ``attribute``) an attribute value. The
+    same string is returned when there are none, so this is cheap to call on values that were never encoded.
+
+    ::
+
+        decode_entities("Fish &amp; Chips &#x27;n&#39; &copy2024")  # "Fish & Chips 'n' ©2024"
+        decode_entities("/search?q=1&copy=2", attribute=True)  # "/search?q=1&copy=2"
+    """
+    if "&" not in value: return value  # Fast path, nothing to decode.
+    return _REFERENCE.sub(_replace_attribute if attribute else _replace_text, value)
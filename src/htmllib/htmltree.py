@@ -8,14 +8,31 @@ A (kind of) tree like interface that acts as an API over the parsed HTML nodes g
 
 from __future__ import annotations
 
+
+from heapq import merge
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from .lexer import _bisect_index
 from .parser import (
+    _element_end,
+    _ElementStack,
     Parser,
+    ErrorPolicy,
     HTMLDoctypeOrCommNode,
     HTMLOpeningTagNode,
     HTMLClosingTagNode,
     HTMLSelfClosingTagNode,
-    HTMLErrorNode
+    HTMLErrorNode,
+    HTMLNode
 )
+from .selector import compile_selector, select_many, _CLASS_TOKEN
+from .text import iter_text as _iter_text
+from .memo import CacheInfo, LRUCache, MISSING, memoized_query
+from .rewrite import Rewrites, render_tag
+
+
+__all__ = ["HTMLTree"]
 
 
 class HTMLTree:
@@ -25,6 +42,42 @@ class HTMLTree:
     :param html_stream: A stream of raw HTML code to parse
     :type html_stream: bytes, str
 
+    :param build_tree: Also link the nodes into an element tree while parsing, see :attr:`root_nodes`
+    :type build_tree: bool, optional
+
+    :param fused: Parse the tokens as they are lexed without keeping them, this saves memory but the tree can not be
+        edited with :meth:`apply_edit`
+    :type fused: bool, optional
+
+    :param error_policy: What the parser does with the errors it finds, see :class:`ErrorPolicy`
+    :type error_policy: ErrorPolicy, optional
+
+    :param max_errors: The most error nodes to keep, any errors after that are only counted in :attr:`error_count`
+    :type max_errors: int, optional
+
+    :param keep: Only keep the tags asked for, given as tag names and/ or predicates called with each tag node, all
+        other nodes are dropped while parsing (see :meth:`Parser.iter_nodes`)
+    :type keep: str, Callable, Iterable[str | Callable], optional
+
+    :param decode_entities: Decode character references such as ``&amp;`` in the attribute values of the tags
+    :type decode_entities: bool, optional
+
+    :param build_indexes: Build the indexes used by the search methods straight after parsing, instead of each one the
+        first time it is needed (see :meth:`build_indexes`)
+    :type build_indexes: bool, optional
+
+    :param lazy: Do not parse anything up front, the stream is only lexed and parsed as far as it needs to be for each
+        query, e.g. :meth:`find_first_tag_by_id` stops as soon as it has found the node (and its closing tag). Anything
+        that needs every node, like :attr:`nodes_list` or a ``search_tags_by_*`` method, parses the rest of the stream
+        first. A lazy tree is fused, so it can not be edited with :meth:`apply_edit`. If parsing fails part way (with
+        :attr:`ErrorPolicy.FAIL_FAST`), every later query that needs more of the stream raises the same exception
+    :type lazy: bool, optional
+
+    :param query_cache_size: The most query results (e.g. of :meth:`select` or a ``search_tags_by_*`` method) to keep
+        cached by their arguments, the least recently used are dropped first and all of them when the tree is edited
+        (see :meth:`cache_info`)
+    :type query_cache_size: int, optional
+
     -------------
     Example Usage
     -------------
@@ -48,16 +101,242 @@ class HTMLTree:
         # Stdout output: You found me!
         print(htmltree.search_tags_by_id("find_me")[0].inner_html)
     """
-    def __init__(self, html_stream: str | bytes) -> None:
+    def __init__(self, html_stream: str | bytes, *, build_tree: bool=False, fused: bool=False,
+                 error_policy: ErrorPolicy=ErrorPolicy.COLLECT, max_errors: int=None,
+                 keep: str | Callable | Iterable[str | Callable]=None, decode_entities: bool=False,
+                 build_indexes: bool=False, lazy: bool=False, query_cache_size: int=256) -> None:
         assert type(html_stream) == bytes or type(html_stream) == str, "HTML Stream must be bytes string or string"
         self.__html_stream = html_stream.decode("utf-8") if type(html_stream) == bytes else html_stream
-        self.__parser_obj = Parser(self.__html_stream)
-        self.__nodes_list = self.__parser_obj._parse_tokens_to_node_list()
-        self.__doctype_or_comment_nodes = [node for node in self.__nodes_list if type(node) == HTMLDoctypeOrCommNode]
-        self.__opening_tag_nodes = [node for node in self.__nodes_list if type(node) == HTMLOpeningTagNode]
-        self.__closing_tag_nodes = [node for node in self.__nodes_list if type(node) == HTMLClosingTagNode]
-        self.__self_closing_tag_nodes = [node for node in self.__nodes_list if type(node) == HTMLSelfClosingTagNode]
-        self.__error_nodes = [node for node in self.__nodes_list if type(node) == HTMLErrorNode]
+        self.__parser_obj = Parser(self.__html_stream, build_tree=build_tree, fused=fused or lazy,
+                                   error_policy=error_policy, max_errors=max_errors, keep=keep,
+                                   decode_entities=decode_entities)
+        self.__pending = self.__parser_obj.iter_nodes() if lazy else None  # Nodes left to parse, in lazy mode.
+        self.__parse_error = None  # Raised again by every later query once lazy parsing has failed.
+        if not lazy: self.__parser_obj._parse_tokens_to_node_list()
+        self.__query_cache = LRUCache(query_cache_size)
+        self.__rewrites = Rewrites()  # Changes made by the rewrite methods (e.g. set_attribute), see serialize.
+        self.__classify_nodes()
+        if build_indexes: self.build_indexes()
+
+    @classmethod
+    def _from_parser(cls, parser: Parser, *, query_cache_size: int=256) -> HTMLTree:
+        """
+        **For internal use only**
+
+        Wrap a parser whose nodes have already been generated (e.g. restored from a cache), without parsing again.
+        ``query_cache_size`` is the same as that of :class:`HTMLTree`.
+        """
+        htmltree = cls.__new__(cls)
+        htmltree.__html_stream = parser.html_raw
+        htmltree.__parser_obj = parser
+        htmltree.__pending = None
+        htmltree.__parse_error = None
+        htmltree.__query_cache = LRUCache(query_cache_size)
+        htmltree.__rewrites = Rewrites()
+        htmltree.__classify_nodes()
+        return htmltree
+
+    def __classify_nodes(self) -> None:
+        """
+        **For internal use only**
+
+        Drop the derived views (like the isolated lists of each kind of node), the search indexes and the cached query
+        results, so they are made again from the nodes generated by the parser when they are next needed.
+        """
+        self.__views = {}  # Views derived from the nodes, e.g. the list of each kind (class), made when first needed.
+        self.__indexes = {}  # Search indexes by (kind, self_closing), each built when it is first needed.
+        self.__query_cache.invalidate()
+
+    def __view(self, key: object, make: Callable) -> object:
+        """
+        **For internal use only**
+
+        Get the derived view under ``key``, making it with ``make`` if that is not done yet.
+        """
+        view = self.__views.get(key)
+        if view is None: view = self.__views[key] = make()
+        return view
+
+    def __nodes_of(self, kind: type) -> list:
+        """
+        **For internal use only**
+
+        Get the isolated list of the nodes of ``kind``, sorting them out of all the nodes if that is not done yet.
+        """
+        return self.__view(kind, lambda: [node for node in self.nodes_list if type(node) == kind])
+
+    def __parse_next(self) -> bool:
+        """
+        **For internal use only**
+
+        Parse one more node in lazy mode, returns ``False`` once the whole stream has been parsed. Once parsing has
+        failed (e.g. with :attr:`ErrorPolicy.FAIL_FAST`) the same exception is raised again, as the tree is incomplete.
+        """
+        if self.__parse_error is not None: raise self.__parse_error
+        if self.__pending is None: return False
+        try:
+            if next(self.__pending, None) is not None: return True
+        except Exception as error:
+            self.__parse_error = error
+            raise
+        self.__pending = None
+        return False
+
+    def __parse_rest(self) -> None:
+        """
+        **For internal use only**
+
+        Parse the rest of the stream in lazy mode.
+        """
+        while self.__parse_next(): pass
+
+    def __iter_parsing(self, kind: type, predicate: Callable) -> Iterator:
+        """
+        **For internal use only**
+
+        Lazily yield the nodes of ``kind`` that ``predicate`` returns true for, parsing only as far as is needed to find
+        each one. An opening tag node is only yielded once its closing tag has been parsed too (or the whole stream
+        has), so its ``inner_html`` is complete.
+        """
+        for node in self.__iter_all_nodes():
+            if type(node) != kind or not predicate(node): continue
+            while kind is HTMLOpeningTagNode and node.closing_tag is None and self.__parse_next(): pass
+            yield node
+
+    def __iter_all_nodes(self) -> Iterator:
+        """
+        **For internal use only**
+
+        Lazily yield every node, parsing them as they are needed in lazy mode.
+        """
+        nodes, position = self.__parser_obj.tag_nodes_list, 0
+        while position < len(nodes) or self.__parse_next():
+            yield nodes[position]
+            position += 1
+
+    @staticmethod
+    def _index_keys(kind: str, tag_name: str, attributes: dict) -> tuple:
+        """
+        **For internal use only**
+
+        The keys a node with ``tag_name`` and ``attributes`` is filed under in the index of ``kind``, the same as
+        :meth:`_index_nodes` files it under.
+        """
+        if kind == "name": return tag_name,
+        if kind == "tag": return tag_name.lower(),
+        if attributes is None: return ()
+        if kind == "key": return tuple(attributes)
+        if kind == "attr": return tuple(attributes.items())
+        return tuple(dict.fromkeys(_CLASS_TOKEN.findall(attributes.get("class", ""))))
+
+    @staticmethod
+    def __file(index: dict, key: object, node: object) -> None:
+        """
+        **For internal use only**
+
+        Add ``node`` to the list of nodes under ``key`` in ``index``, keeping it in document order.
+        """
+        nodes = index.setdefault(key, [])
+        nodes.insert(_bisect_index(nodes, node.cursor_start.index, lambda node: node.cursor_start.index), node)
+
+    @staticmethod
+    def __unfile(index: dict, key: object, node: object) -> None:
+        """
+        **For internal use only**
+
+        Take ``node`` out of the list of nodes under ``key`` in ``index``, dropping the key once it has no nodes.
+        """
+        nodes = index.get(key, [])
+        position = _bisect_index(nodes, node.cursor_start.index, lambda node: node.cursor_start.index)
+        if position < len(nodes) and nodes[position] is node: del nodes[position]
+        if not nodes: index.pop(key, None)
+
+    @staticmethod
+    def _index_nodes(nodes: list, kinds: Iterable[str]) -> dict:
+        """
+        **For internal use only**
+
+        Build the indexes of ``kinds`` over ``nodes`` in one pass, mapping each tag name (``"name"``), lower case tag
+        name (``"tag"``), attribute key (``"key"``), attribute (key, value) pair (``"attr"``) and class token
+        (``"class"``) to the list of nodes that have it, in document order.
+        """
+        indexes = {kind: {} for kind in kinds}
+        names, tags, keys, attrs = indexes.get("name"), indexes.get("tag"), indexes.get("key"), indexes.get("attr")
+        classes = indexes.get("class")
+        for node in nodes:
+            if names is not None: names.setdefault(node.tag_name, []).append(node)
+            if tags is not None: tags.setdefault(node.tag_name.lower(), []).append(node)
+            if node.attributes is None: continue
+            if keys is not None:
+                for key in node.attributes: keys.setdefault(key, []).append(node)
+            if attrs is not None:
+                for attr in node.attributes.items(): attrs.setdefault(attr, []).append(node)
+            if classes is not None and "class" in node.attributes:
+                for token in dict.fromkeys(_CLASS_TOKEN.findall(node.attributes["class"])):
+                    classes.setdefault(token, []).append(node)
+        return indexes
+
+    def __index(self, kind: str, self_closing: bool) -> dict:
+        """
+        **For internal use only**
+
+        Get the index of ``kind`` over the opening (or self closing) tag nodes, building it if it is not built yet.
+        """
+        index = self.__indexes.get((kind, self_closing))
+        if index is None:
+            nodes = self.self_closing_tag_nodes if self_closing else self.opening_tag_nodes
+            index = self.__indexes[(kind, self_closing)] = self._index_nodes(nodes, (kind,))[kind]
+        return index
+
+    def build_indexes(self) -> None:
+        """
+        Build every index used by the search methods now, in one pass over each node list. Otherwise each index is
+        built the first time a search method needs it. The indexes are rebuilt after :meth:`apply_edit`.
+        """
+        for self_closing in (False, True):
+            nodes = self.self_closing_tag_nodes if self_closing else self.opening_tag_nodes
+            for kind, index in self._index_nodes(nodes, ("name", "tag", "key", "attr", "class")).items():
+                self.__indexes[(kind, self_closing)] = index
+
+    def _index_lookup(self, kind: str, key: object) -> list:
+        """
+        **For internal use only**
+
+        Look ``key`` up in the index of ``kind`` over both the opening and self closing tag nodes, returning the
+        nodes found in document order.
+        """
+        opening, self_closing = self.__index(kind, False).get(key, ()), self.__index(kind, True).get(key, ())
+        if not self_closing or not opening: return list(opening or self_closing)
+        return list(merge(opening, self_closing, key=lambda node: node.cursor_start.index))
+
+    def _element_nodes(self) -> list:
+        """
+        **For internal use only**
+
+        All the opening and self closing tag nodes in document order.
+        """
+        return [node for node in self.nodes_list
+                if type(node) == HTMLOpeningTagNode or type(node) == HTMLSelfClosingTagNode]
+
+    def _element_structure(self) -> tuple:
+        """
+        **For internal use only**
+
+        Map the ``id()`` of every opening and self closing tag node to its parent element (``None`` at the top level)
+        and to its (1 based) position among the elements with the same parent. Without ``build_tree`` the parents are
+        found the same way the tree is linked (see :class:`_ElementStack`), so both give the same structure.
+        """
+        structure = self.__indexes.get(("structure", None))
+        if structure is not None: return structure
+        parents, positions, counts = {}, {}, {}
+        linked, open_elements = self.root_nodes is not None, _ElementStack()
+        for node in self._element_nodes() if linked else self.nodes_list:
+            parent = node.parent if linked else open_elements.parent_of(node)  # Every node is fed to the stack.
+            if type(node) != HTMLOpeningTagNode and type(node) != HTMLSelfClosingTagNode: continue
+            parents[id(node)] = parent
+            positions[id(node)] = counts[id(parent)] = counts.get(id(parent), 0) + 1
+        structure = self.__indexes[("structure", None)] = parents, positions
+        return structure
 
     @property
     def html_stream(self) -> str:
@@ -71,179 +350,785 @@ class HTMLTree:
         """
         The list of nodes that was generated by this instance's parser.
         """
-        return self.__nodes_list
+        self.__parse_rest()
+        return self.__parser_obj.tag_nodes_list
+
+    @property
+    def root_nodes(self) -> list:
+        """
+        The top level nodes of the element tree (``None`` unless this instance was created with ``build_tree``). Each
+        opening tag node in the tree links to its ``parent``, ``children`` and ``closing_tag``, the other nodes only to
+        their ``parent``.
+
+        ::
+
+            htmltree = htmllib.HTMLTree("<ul><li>a</li><li>b</li></ul>", build_tree=True)
+
+            # Stdout output: ['li', 'li']
+            print([node.tag_name for node in htmltree.root_nodes[0].children])
+        """
+        self.__parse_rest()
+        return self.__parser_obj.root_nodes
 
     @property
     def doctype_or_comment_nodes(self) -> list:
         """
         All of the doctype/ comment tag nodes generated from parser, referenced in an iscolated list.
         """
-        return self.__doctype_or_comment_nodes
+        return self.__nodes_of(HTMLDoctypeOrCommNode)
 
     @property
     def doctypes_raw(self) -> list:
         """
         List of all raw doctype declarations found in the HTML as processed strings.
         """
-        raw = []
-        for node in self.doctype_or_comment_nodes:
-            if len(node.text_raw) < 4: continue
-            if node.text_raw[:2] == "--" and node.text_raw[2:] == "--": continue
-            if "DOCTYPE".casefold() not in node.text_raw.strip()[:7].casefold(): continue
-            raw.append(node.text_raw.strip())
-        return raw
+        return list(self.__doctypes_raw())
+
+    def __doctypes_raw(self) -> list:
+        """
+        **For internal use only**
+
+        The (shared, not to be changed) list behind :attr:`doctypes_raw`.
+        """
+        return self.__view("doctypes_raw", lambda: [node.text_raw.strip() for node in self.doctype_or_comment_nodes
+                                                    if node.is_doctype])
 
     @property
     def doctype_raw(self) -> str:
         """
         The most recent doctype declaration.
         """
-        return self.doctypes_raw[-1] if len(self.doctypes_raw) > 0 else None
+        doctypes = self.__doctypes_raw()
+        return doctypes[-1] if len(doctypes) > 0 else None
 
     @property
     def opening_tag_nodes(self) -> list:
         """
         All of the opening tag nodes generated from parser, referenced in an iscolated list.
         """
-        return self.__opening_tag_nodes
+        return self.__nodes_of(HTMLOpeningTagNode)
 
     @property
     def closing_tag_nodes(self) -> list:
         """
         All of the closing tag nodes generated from parser, referenced in an iscolated list.
         """
-        return self.__closing_tag_nodes
+        return self.__nodes_of(HTMLClosingTagNode)
 
     @property
     def self_closing_tag_nodes(self) -> list:
         """
         All of the self closing tag nodes generated from parser, referenced in an iscolated list.
         """
-        return self.__self_closing_tag_nodes
+        return self.__nodes_of(HTMLSelfClosingTagNode)
 
     @property
     def error_nodes(self) -> list:
         """
         All of the error nodes generated from parser, referenced in an iscolated list.
         """
-        return self.__error_nodes
+        return self.__nodes_of(HTMLErrorNode)
 
-    def search_tags_by_name(self, name: str, *, self_closing: bool=False) -> list:
+    @property
+    def error_count(self) -> int:
         """
-        Search through opening tags node list (or self closing if specified) and return a list of nodes that match the
-        tag name provided.
+        The number of errors the parser found, including any that were not kept as error nodes.
         """
-        assert type(name) == str, "You need to provide the tag name as a string"
+        self.__parse_rest()
+        return self.__parser_obj.error_count
+
+    def apply_edit(self, offset: int, removed_len: int, inserted_text: str) -> None:
+        """
+        Replace ``removed_len`` chars at ``offset`` in the HTML stream with ``inserted_text`` and update the tree in
+        place. Only the region around the edit is lexed and parsed again, nodes after it are kept (with their cursors
+        shifted) and tag pairing is only re-run as far as the edit can affect it.
+
+        ::
+
+            htmltree = htmllib.HTMLTree("<p id='a'>Hello</p>")
+            htmltree.apply_edit(10, 5, "Goodbye")
+
+            # Stdout output: Goodbye
+            print(htmltree.search_tags_by_id("a")[0].inner_html)
+        """
+        assert type(inserted_text) == str, "The inserted text must be a string"
+        assert 0 <= offset and 0 <= removed_len and offset + removed_len <= len(self.html_stream), "Edit out of range"
+        assert not self.__rewrites, "A rewritten tree can not be edited, parse its serialized HTML into a new one"
+        self.__parser_obj._apply_edit(offset, removed_len, inserted_text)
+        self.__html_stream = self.__parser_obj.html_raw
+        self.__classify_nodes()
+
+    def __element_end(self, node: HTMLOpeningTagNode) -> int:
+        """
+        **For internal use only**
+
+        The index the content of the element ``node`` ends at, where its parent ends if it was never closed (see
+        :func:`_element_end`).
+        """
+        parent_of = lambda element: self._element_structure()[0].get(id(element))  # Only needed if never closed.
+        return _element_end(node, parent_of, len(self.__html_stream))
+
+    def __locate(self, node: object) -> int:
+        """
+        **For internal use only**
+
+        The position of ``node`` in :attr:`nodes_list`, which it must (still) be in.
+        """
+        nodes = self.nodes_list
+        position = _bisect_index(nodes, node.cursor_start.index, lambda node: node.cursor_start.index)
+        assert position < len(nodes) and nodes[position] is node, "The node is not (or no longer) in this tree"
+        return position
+
+    def __node_end(self, node: object) -> int:
+        """
+        **For internal use only**
+
+        The index just past ``node`` in the stream, past its closing tag for an opening tag node (or at the start of
+        the tag that implied it). An opening tag node that was never closed runs to where its parent ends.
+        """
+        if type(node) != HTMLOpeningTagNode: return node.cursor_end.index + 1
+        closing_tag = node.closing_tag
+        if closing_tag is None: return self.__element_end(node)
+        return closing_tag.cursor_start.index if closing_tag.implied else closing_tag.cursor_end.index + 1
+
+    def __set_attributes(self, node: HTMLOpeningTagNode | HTMLSelfClosingTagNode, attributes: dict) -> None:
+        """
+        **For internal use only**
+
+        Give ``node`` new ``attributes``, moving it to the right keys in the indexes that are built and rendering its
+        tag again.
+        """
+        old_attributes, node.attributes = node.attributes, attributes or None  # No attributes is 'None', as parsed.
+        self_closing = type(node) == HTMLSelfClosingTagNode
+        for kind in ("key", "attr", "class"):
+            index = self.__indexes.get((kind, self_closing))
+            if index is None: continue
+            old_keys = self._index_keys(kind, node.tag_name, old_attributes)
+            new_keys = self._index_keys(kind, node.tag_name, node.attributes)
+            for key in old_keys:
+                if key not in new_keys: self.__unfile(index, key, node)
+            for key in new_keys:
+                if key not in old_keys: self.__file(index, key, node)
+        tag = render_tag(node, self.__html_stream, escape_ampersands=self.__parser_obj.decode_entities)
+        self.__rewrites.replace(node.cursor_start.index, node.cursor_end.index + 1, tag)
+        self.__query_cache.invalidate()
+
+    def set_attribute(self, node: HTMLOpeningTagNode | HTMLSelfClosingTagNode, key: str, value: str) -> None:
+        """
+        Set the attribute ``key`` of the opening (or self closing) tag ``node`` to ``value``, adding it after the
+        others if the tag does not have it yet. The indexes are updated in place and only the tag itself is rendered
+        again when the tree is serialized, see :meth:`serialize`.
+
+        The value is taken as it would be in :attr:`HTMLOpeningTagNode.attributes`, so when the tree was created with
+        ``decode_entities`` any ``&`` in it is escaped when it is rendered.
+        """
+        assert type(node) == HTMLOpeningTagNode or type(node) == HTMLSelfClosingTagNode, \
+            "Only opening and self closing tag nodes have attributes"
+        assert type(key) == str and key != "" and type(value) == str, "The attribute key and value must be strings"
+        self.__locate(node)
+        self.__set_attributes(node, {**(node.attributes or {}), key: value})
+
+    def remove_attribute(self, node: HTMLOpeningTagNode | HTMLSelfClosingTagNode, key: str) -> None:
+        """
+        Remove the attribute ``key`` from the opening (or self closing) tag ``node``, if it has it. See
+        :meth:`set_attribute`.
+        """
+        assert type(node) == HTMLOpeningTagNode or type(node) == HTMLSelfClosingTagNode, \
+            "Only opening and self closing tag nodes have attributes"
+        self.__locate(node)
+        if node.attributes is None or key not in node.attributes: return
+        self.__set_attributes(node, {name: value for name, value in node.attributes.items() if name != key})
+
+    def remove_node(self, node: object) -> None:
+        """
+        Remove ``node`` from the tree, along with everything inside it and its closing tag for an opening tag node. The
+        removed nodes are taken out of :attr:`nodes_list`, the node lists of each kind, the indexes that are built and
+        (with ``build_tree``) the children of their parent, without sorting out or indexing any of the other nodes
+        again.
+
+        ::
+
+            htmltree = htmllib.HTMLTree("<p>Hi<script src='t.js'></script></p>")
+            htmltree.remove_node(htmltree.search_tags_by_name("script")[0])
+
+            # Stdout output: <p>Hi</p>
+            print(htmltree.serialize())
+        """
+        self.__replace_node(node, "")
+
+    def replace_node(self, node: object, html: str) -> None:
+        """
+        Replace ``node`` (and everything inside it) with the raw ``html``, see :meth:`remove_node`. Like the HTML of
+        :meth:`insert_html`, the new HTML is only written out by :meth:`serialize` and is not parsed into the tree.
+        """
+        assert type(html) == str, "The HTML must be a string"
+        self.__replace_node(node, html)
+
+    def __replace_node(self, node: object, html: str) -> None:
+        """
+        **For internal use only**
+
+        Replace the span of ``node`` in the stream with ``html`` and take the nodes in that span out of the tree.
+        """
+        assert type(node) != HTMLClosingTagNode, "A closing tag is only removed along with its opening tag"
+        nodes, first = self.nodes_list, self.__locate(node)
+        start, end = node.cursor_start.index, self.__node_end(node)
+        start_of = lambda node: node.cursor_start.index
+        last = _bisect_index(nodes, end, start_of, first)
+        removed = nodes[first:last]
+        del nodes[first:last]
+        self.__rewrites.replace(start, end, html)
+
+        for key, view in list(self.__views.items()):
+            if type(key) != type: del self.__views[key]  # Only the node lists of each kind are kept up to date.
+            else: del view[_bisect_index(view, start, start_of) : _bisect_index(view, end, start_of)]
+        self.__indexes.pop(("structure", None), None)
+        for (kind, self_closing), index in self.__indexes.items():
+            tag_kind = HTMLSelfClosingTagNode if self_closing else HTMLOpeningTagNode
+            for removed_node in removed:
+                if type(removed_node) != tag_kind: continue
+                for key in self._index_keys(kind, removed_node.tag_name, removed_node.attributes):
+                    self.__unfile(index, key, removed_node)
+
+        if self.__parser_obj.root_nodes is not None:
+            removed_ids = {id(removed_node) for removed_node in removed}
+            for removed_node in removed:
+                if type(removed_node) == HTMLClosingTagNode or id(removed_node.parent) in removed_ids: continue
+                parent = removed_node.parent
+                siblings = parent.children if parent is not None else self.__parser_obj.root_nodes
+                siblings[:] = [sibling for sibling in siblings if sibling is not removed_node]
+                removed_node.parent = None
+        self.__query_cache.invalidate()
+
+    def insert_html(self, node: object, html: str, where: str="afterend") -> None:
+        """
+        Insert the raw ``html`` next to ``node``, ``where`` being one of (as for ``insertAdjacentHTML`` in the DOM)
+        ``"beforebegin"``, ``"afterbegin"`` (inside an opening tag node, before its content), ``"beforeend"`` (inside,
+        after its content) and ``"afterend"``. HTML inserted at the same place is written out in the order it was
+        inserted.
+
+        The HTML is only written out by :meth:`serialize`, it is not parsed into nodes of this tree (parse the
+        serialized HTML into a new tree to query it).
+        """
+        assert type(html) == str, "The HTML must be a string"
+        assert where in ("beforebegin", "afterbegin", "beforeend", "afterend"), \
+            "Where must be 'beforebegin', 'afterbegin', 'beforeend' or 'afterend'"
+        assert type(node) != HTMLClosingTagNode, "Insert next to the opening tag node instead of its closing tag"
+        self.__locate(node)
+        if where == "beforebegin":
+            index = node.cursor_start.index
+        elif where == "afterend":
+            index = self.__node_end(node)
+        else:
+            assert type(node) == HTMLOpeningTagNode, "Only opening tag nodes have content to insert into"
+            index = node.cursor_end.index + 1 if where == "afterbegin" else self.__element_end(node)
+        self.__rewrites.insert(index, html)
+
+    def serialize(self, node: object=None) -> str:
+        """
+        Return the HTML of the whole tree (or only of ``node``) with the changes made by the rewrite methods
+        (:meth:`set_attribute`, :meth:`remove_attribute`, :meth:`remove_node`, :meth:`replace_node` and
+        :meth:`insert_html`). The slices of the stream that were not changed are joined with the rewritten spans in
+        one go, so only the changed tags are ever rendered.
+
+        The nodes themselves still read the stream they were parsed from, e.g. :attr:`HTMLOpeningTagNode.inner_html`
+        is the inner HTML as parsed. Parse the serialized HTML into a new tree to get nodes of the rewritten HTML.
+
+        ::
+
+            htmltree = htmllib.HTMLTree("<img src='a.png'><p>Hi</p>")
+            htmltree.set_attribute(htmltree.find_first_tag_by_name("img", self_closing=True), "src", "/cdn/a.png")
+            htmltree.insert_html(htmltree.find_first_tag_by_name("p"), "<p>Bye</p>")
+
+            # Stdout output: <img src="/cdn/a.png"><p>Hi</p><p>Bye</p>
+            print(htmltree.serialize())
+        """
+        stream = self.__html_stream
+        if node is None: return self.__rewrites.splice(stream, 0, len(stream))
+        assert type(node) != HTMLClosingTagNode, "Serialize the opening tag node instead of its closing tag"
+        self.__locate(node)
+        return self.__rewrites.splice(stream, node.cursor_start.index, self.__node_end(node), outer=False)
+
+    def _memoized(self, key: tuple, compute: Callable) -> object:
+        """
+        **For internal use only**
+
+        Get the result of the query under ``key`` from the query cache, computing (and caching) it on a miss. See
+        :func:`memoized_query`.
+        """
+        result = self.__query_cache.get(key)
+        if result is MISSING:
+            result = compute()
+            self.__query_cache.put(key, result)
+        return result
+
+    def cache_info(self) -> CacheInfo:
+        """
+        The hits, misses, max size and current size of the cache of query results, which is dropped (but keeps its
+        counts) whenever the tree is edited.
+
+        ::
+
+            htmltree = htmllib.HTMLTree("<p class='a'>1</p><p class='a'>2</p>")
+            htmltree.search_tags_by_class("a")
+            htmltree.search_tags_by_class("a")
+
+            # Stdout output: CacheInfo(hits=1, misses=1, maxsize=256, currsize=1)
+            print(htmltree.cache_info())
+        """
+        return self.__query_cache.info()
+
+    def cache_clear(self) -> None:
+        """
+        Drop the cached query results and reset the counts of :meth:`cache_info`.
+        """
+        self.__query_cache.clear()
+
+    @memoized_query
+    def select(self, css: str) -> list:
+        """
+        Return the list of element (opening and self closing tag) nodes that match the CSS selector ``css``, in document
+        order. Compiled selectors are cached (see :func:`compile_selector`) and the search indexes are used to narrow
+        down the nodes that could match.
+
+        ::
+
+            htmltree = htmllib.HTMLTree("<ul><li>a</li><li class='x'>b</li></ul><li class='x'>c</li>")
+
+            # Stdout output: ['b']
+            print([node.inner_html for node in htmltree.select("ul > li.x")])
+        """
+        return compile_selector(css).select(self)
+
+    @memoized_query
+    def select_one(self, css: str) -> HTMLOpeningTagNode | HTMLSelfClosingTagNode | None:
+        """
+        Return the first element node that matches the CSS selector ``css``, or ``None`` if none do.
+        """
+        return compile_selector(css).select_one(self)
+
+    @memoized_query
+    def query_many(self, queries: dict) -> dict:
+        """
+        Run many CSS selector queries (given by name) in one pass over the element nodes, instead of one search per
+        query, and return the list of nodes each one matched by the same names (see :func:`select_many`).
+
+        ::
+
+            htmltree = htmllib.HTMLTree("<title>Hi</title><a href='/a'>a</a><meta charset='utf-8'>")
+            results = htmltree.query_many({"title": "title", "links": "a[href]", "meta": "meta[charset]"})
+
+            # Stdout output: ['/a']
+            print([node.attributes["href"] for node in results["links"]])
+        """
+        assert type(queries) == dict, "You need to provide the queries as a dict of {<name>: <selector>, ...}"
+        return select_many(self, queries)
+
+    def __iter_tags(self, self_closing: bool, predicate: Callable, kind: str=None, key: object=None) -> Iterator:
+        """
+        **For internal use only**
+
+        Lazily yield the opening (or self closing) tag nodes that ``predicate`` returns true for, in document order.
+        When the index of ``kind`` has already been built the nodes under ``key`` in it are yielded instead.
+        """
+        if self.__pending is not None:
+            return self.__iter_parsing(HTMLSelfClosingTagNode if self_closing else HTMLOpeningTagNode, predicate)
+        index = self.__indexes.get((kind, self_closing)) if kind is not None else None
+        if index is not None: return iter(index.get(key, ()))
         nodes = self.self_closing_tag_nodes if self_closing else self.opening_tag_nodes
-        nodes = [node for node in nodes if node.tag_name == name]
-        return nodes
+        return (node for node in nodes if predicate(node))
 
-    def search_tags_by_attrs(self, attrs: dict, *, self_closing: bool=False) -> list:
+    @staticmethod
+    def __limited(nodes: Iterator, limit: int) -> list:
         """
-        Search through opening tags node list (or self closing if specified) and return a list of nodes that match the
-        tag attributes provided (non-strict matching, order does not matter).
+        **For internal use only**
+
+        Take the first ``limit`` nodes (all of them if ``None``), without going through the rest.
+        """
+        assert limit is None or (type(limit) == int and limit >= 0), "The limit must be a non-negative int (or None)"
+        return list(islice(nodes, limit))
+
+    def iter_tags_by_name(self, name: str, *, self_closing: bool=False) -> Iterator:
+        """
+        Lazily yield the opening tag nodes (or self closing if specified) that match the tag name provided, so the
+        search can be stopped at any point without going through the rest of the nodes.
+        """
+        assert type(name) == str, "You need to provide the tag name as a string"
+        return self.__iter_tags(self_closing, lambda node: node.tag_name == name, "name", name)
+
+    def iter_tags_by_attrs(self, attrs: dict, *, self_closing: bool=False) -> Iterator:
+        """
+        Lazily yield the opening tag nodes (or self closing if specified) that match the tag attributes provided
+        (non-strict matching, order does not matter).
         """
         assert type(attrs) == dict, "You need to provide the attributes as a dict (can be non-strict order)"
-        nodes = self.self_closing_tag_nodes if self_closing else self.opening_tag_nodes
-        matched = [node for node in nodes if attrs == node.attributes]
-        return matched
+        return self.__iter_tags(self_closing, lambda node: attrs == node.attributes)
 
-    def search_tags_by_exact_attrs(self, attrs: dict, *, self_closing: bool=False) -> list:
+    def iter_tags_by_exact_attrs(self, attrs: dict, *, self_closing: bool=False) -> Iterator:
         """
-        Search through opening tags node list (or self closing if specified) and return a list of nodes that match the
-        tag attributes provided (strict matching, order does matter).
+        Lazily yield the opening tag nodes (or self closing if specified) that match the tag attributes provided (strict
+        matching, order does matter).
         """
         assert type(attrs) == dict, "You need to provide the attributes as a dict (must be strict order)"
-        nodes = self.self_closing_tag_nodes if self_closing else self.opening_tag_nodes
-        matched = []
         attrs = list(attrs.items())
+        return self.__iter_tags(self_closing,
+                                lambda node: node.attributes is not None and list(node.attributes.items()) == attrs)
 
-        for node in nodes:
-            match_count = 0
-            try:
-                if node.attributes is None: continue
-                for index, attr in enumerate(node.attributes.items()):
-                    if attr[0] != attrs[index][0] or attr[1] != attrs[index][1]: break
-                    match_count += 1
-            except IndexError:
-                continue
-            if match_count == len(node.attributes) and len(attrs) == len(node.attributes): matched.append(node)
+    def iter_tags_by_attr(self, attr: tuple, *, self_closing: bool=False) -> Iterator:
+        """
+        Lazily yield the opening tag nodes (or self closing if specified) that contain the provided attr (<key>,
+        <value>) pair.
+        """
+        assert attr != () and type(attr) is tuple, "You need to provide a valid tuple ('<attr_key>', '<attr_value>')"
+        return self.__iter_tags(self_closing, lambda node: node.attributes is not None and
+                                attr[0] in node.attributes and node.attributes[attr[0]] == attr[1], "attr", attr)
+
+    def iter_tags_by_attrs_keys(self, attrs_keys: list, *, self_closing: bool=False) -> Iterator:
+        """
+        Lazily yield the opening tag nodes (or self closing if specified) that match the tag attributes keys provided
+        (non-strict matching, order does not matter).
+        """
+        assert attrs_keys != [] and type(attrs_keys) is list, "You must provide a valid keys list [<key>, <key>, ...]"
+        def matches(node: HTMLOpeningTagNode) -> bool:
+            if node.attributes is None or len(attrs_keys) != len(node.attributes): return False
+            return all(key in attrs_keys for key in node.attributes)
+
+        return self.__iter_tags(self_closing, matches)
+
+    def iter_tags_by_exact_attrs_keys(self, attrs_keys: list, *, self_closing: bool=False) -> Iterator:
+        """
+        Lazily yield the opening tag nodes (or self closing if specified) that match the tag attributes keys provided
+        (strict matching, order does matter).
+        """
+        assert attrs_keys != [] and type(attrs_keys) is list, "You must provide a valid keys list [<key>, <key>, ...]"
+        return self.__iter_tags(self_closing,
+                                lambda node: node.attributes is not None and list(node.attributes) == attrs_keys)
+
+    def iter_tags_by_attr_key(self, attr_key: str, *, self_closing: bool=False) -> Iterator:
+        """
+        Lazily yield the opening tag nodes (or self closing if specified) that contain the provided attr key.
+        """
+        assert attr_key != () and type(attr_key) is str, "You need to provide a valid str <attr_key>)"
+        return self.__iter_tags(self_closing, lambda node: node.attributes is not None and attr_key in node.attributes,
+                                "key", attr_key)
+
+    def iter_tags_by_id(self, tag_id: str, *, self_closing: bool=False) -> Iterator:
+        """
+        Lazily yield the opening tag nodes (or self closing if specified) that contain the provided ID value. This is a
+        shortcut method to ``self.iter_tags_by_attr``.
+        """
+        assert type(tag_id) == str, "You need to provide the ID as a string"
+        return self.iter_tags_by_attr(("id", tag_id), self_closing=self_closing)
+
+    def iter_tags_by_class(self, tag_class: str | list, *, self_closing: bool=False) -> Iterator:
+        """
+        Lazily yield the opening tag nodes (or self closing if specified) that have all of the provided classes, see
+        :meth:`search_tags_by_class`.
+        """
+        if ("class", self_closing) in self.__indexes:
+            return iter(self.search_tags_by_class(tag_class, self_closing=self_closing))
+        tokens = set(self.__class_tokens(tag_class))
+
+        def matches(node: HTMLOpeningTagNode) -> bool:
+            if not tokens or node.attributes is None or "class" not in node.attributes: return False
+            return tokens.issubset(_CLASS_TOKEN.findall(node.attributes["class"]))
+
+        return self.__iter_tags(self_closing, matches)
+
+    @staticmethod
+    def __class_tokens(tag_class: str | list) -> list:
+        """
+        **For internal use only**
+
+        The class names asked for by ``tag_class``, a whitespace separated string or a list of class names.
+        """
+        assert type(tag_class) == str or type(tag_class) == list or type(tag_class) == tuple,                         \
+            "You need to provide the class as a string (or a list of classes)"
+        return _CLASS_TOKEN.findall(tag_class) if type(tag_class) == str else tag_class
+
+    def find_first_tag_by_name(self, name: str, *, self_closing: bool=False) -> HTMLNode | None:
+        """
+        Return the first node :meth:`iter_tags_by_name` yields, without going on searching after it.
+
+        :param name: The tag name to look for
+        :type name: str
+
+        :param self_closing: Search the self closing tag nodes instead of the opening tag nodes
+        :type self_closing: bool, optional
+
+        :return: The first matching node, or ``None`` if there are none
+        :rtype: HTMLOpeningTagNode, HTMLSelfClosingTagNode, None
+        """
+        return next(self.iter_tags_by_name(name, self_closing=self_closing), None)
+
+    def find_first_tag_by_attrs(self, attrs: dict, *, self_closing: bool=False) -> HTMLNode | None:
+        """
+        Return the first node :meth:`iter_tags_by_attrs` yields, without going on searching after it.
+
+        :param attrs: The attributes to look for (non-strict matching, order does not matter)
+        :type attrs: dict
+
+        :param self_closing: Search the self closing tag nodes instead of the opening tag nodes
+        :type self_closing: bool, optional
+
+        :return: The first matching node, or ``None`` if there are none
+        :rtype: HTMLOpeningTagNode, HTMLSelfClosingTagNode, None
+        """
+        return next(self.iter_tags_by_attrs(attrs, self_closing=self_closing), None)
+
+    def find_first_tag_by_exact_attrs(self, attrs: dict, *, self_closing: bool=False) -> HTMLNode | None:
+        """
+        Return the first node :meth:`iter_tags_by_exact_attrs` yields, without going on searching after it.
+
+        :param attrs: The attributes to look for (strict matching, order does matter)
+        :type attrs: dict
+
+        :param self_closing: Search the self closing tag nodes instead of the opening tag nodes
+        :type self_closing: bool, optional
+
+        :return: The first matching node, or ``None`` if there are none
+        :rtype: HTMLOpeningTagNode, HTMLSelfClosingTagNode, None
+        """
+        return next(self.iter_tags_by_exact_attrs(attrs, self_closing=self_closing), None)
+
+    def find_first_tag_by_attr(self, attr: tuple, *, self_closing: bool=False) -> HTMLNode | None:
+        """
+        Return the first node :meth:`iter_tags_by_attr` yields, without going on searching after it.
 
-        return matched
+        :param attr: The ``(<key>, <value>)`` pair to look for
+        :type attr: tuple
+
+        :param self_closing: Search the self closing tag nodes instead of the opening tag nodes
+        :type self_closing: bool, optional
+
+        :return: The first matching node, or ``None`` if there are none
+        :rtype: HTMLOpeningTagNode, HTMLSelfClosingTagNode, None
+        """
+        return next(self.iter_tags_by_attr(attr, self_closing=self_closing), None)
 
-    def search_tags_by_attr(self, attr: tuple, *, self_closing: bool=False) -> list:
+    def find_first_tag_by_attrs_keys(self, attrs_keys: list, *, self_closing: bool=False) -> HTMLNode | None:
+        """
+        Return the first node :meth:`iter_tags_by_attrs_keys` yields, without going on searching after it.
+
+        :param attrs_keys: The attribute keys to look for (non-strict matching, order does not matter)
+        :type attrs_keys: list
+
+        :param self_closing: Search the self closing tag nodes instead of the opening tag nodes
+        :type self_closing: bool, optional
+
+        :return: The first matching node, or ``None`` if there are none
+        :rtype: HTMLOpeningTagNode, HTMLSelfClosingTagNode, None
+        """
+        return next(self.iter_tags_by_attrs_keys(attrs_keys, self_closing=self_closing), None)
+
+    def find_first_tag_by_exact_attrs_keys(self, attrs_keys: list, *, self_closing: bool=False) -> HTMLNode | None:
+        """
+        Return the first node :meth:`iter_tags_by_exact_attrs_keys` yields, without going on searching after it.
+
+        :param attrs_keys: The attribute keys to look for (strict matching, order does matter)
+        :type attrs_keys: list
+
+        :param self_closing: Search the self closing tag nodes instead of the opening tag nodes
+        :type self_closing: bool, optional
+
+        :return: The first matching node, or ``None`` if there are none
+        :rtype: HTMLOpeningTagNode, HTMLSelfClosingTagNode, None
+        """
+        return next(self.iter_tags_by_exact_attrs_keys(attrs_keys, self_closing=self_closing), None)
+
+    def find_first_tag_by_attr_key(self, attr_key: str, *, self_closing: bool=False) -> HTMLNode | None:
+        """
+        Return the first node :meth:`iter_tags_by_attr_key` yields, without going on searching after it.
+
+        :param attr_key: The attribute key to look for
+        :type attr_key: str
+
+        :param self_closing: Search the self closing tag nodes instead of the opening tag nodes
+        :type self_closing: bool, optional
+
+        :return: The first matching node, or ``None`` if there are none
+        :rtype: HTMLOpeningTagNode, HTMLSelfClosingTagNode, None
+        """
+        return next(self.iter_tags_by_attr_key(attr_key, self_closing=self_closing), None)
+
+    def find_first_tag_by_id(self, tag_id: str, *, self_closing: bool=False) -> HTMLNode | None:
+        """
+        Return the first node :meth:`iter_tags_by_id` yields, without going on searching after it.
+
+        :param tag_id: The ID value to look for
+        :type tag_id: str
+
+        :param self_closing: Search the self closing tag nodes instead of the opening tag nodes
+        :type self_closing: bool, optional
+
+        :return: The first matching node, or ``None`` if there are none
+        :rtype: HTMLOpeningTagNode, HTMLSelfClosingTagNode, None
+        """
+        return next(self.iter_tags_by_id(tag_id, self_closing=self_closing), None)
+
+    def find_first_tag_by_class(self, tag_class: str | list, *, self_closing: bool=False) -> HTMLNode | None:
+        """
+        Return the first node :meth:`iter_tags_by_class` yields, without going on searching after it.
+
+        :param tag_class: The classes the tag must all have, as a class attribute value or a list
+        :type tag_class: str, list
+
+        :param self_closing: Search the self closing tag nodes instead of the opening tag nodes
+        :type self_closing: bool, optional
+
+        :return: The first matching node, or ``None`` if there are none
+        :rtype: HTMLOpeningTagNode, HTMLSelfClosingTagNode, None
+        """
+        return next(self.iter_tags_by_class(tag_class, self_closing=self_closing), None)
+
+    def iter_text(self, node: HTMLOpeningTagNode=None, separator: str="", *, collapse_whitespace: bool=False,
+                  decode_entities: bool=None) -> Iterator[str]:
+        """
+        Lazily yield the text of the whole stream (or only inside ``node``) in pieces, see :meth:`get_text`. In lazy
+        mode the stream is only parsed as the text is read.
+        """
+        decode_entities = self.__parser_obj.decode_entities if decode_entities is None else decode_entities
+        stream = self.__html_stream
+        if node is None:
+            nodes, start, end = self.__iter_all_nodes(), 0, len(stream)
+        else:
+            assert type(node) == HTMLOpeningTagNode, "You can only get the text inside an opening tag node"
+            start, end = node.cursor_end.index + 1, self.__element_end(node)
+            nodes = self.nodes_list
+            first = _bisect_index(nodes, start, lambda node: node.cursor_start.index)
+            nodes = nodes[first : _bisect_index(nodes, end, lambda node: node.cursor_start.index, first)]
+        if self.__rewrites:  # The replaced spans are left out, ahead of any node at the same index.
+            nodes = merge(self.__rewrites.iter_replaced(start, end), nodes, key=lambda node: node.cursor_start.index)
+        return _iter_text(stream, nodes, start, end, separator=separator, collapse_whitespace=collapse_whitespace,
+                          decode_entities=decode_entities)
+
+    @memoized_query
+    def get_text(self, node: HTMLOpeningTagNode=None, separator: str="", *, collapse_whitespace: bool=False,
+                 decode_entities: bool=None) -> str:
+        """
+        Return the text of the whole stream (or only inside ``node``), the spans of the stream between the tags joined
+        together. The content of ``<script>`` and ``<style>`` elements is left out.
+
+        Given a ``separator`` it is put between the text of each span, ``collapse_whitespace`` collapses each run of
+        whitespace into a single space and strips the ends (or each span, with a separator). Character references are
+        decoded if the tree was created with ``decode_entities``, unless asked otherwise.
+
+        The text of an element that was never closed runs to where its parent ends. Trees parsed with ``keep`` do not
+        know where the tags that were dropped are, so their text includes them.
+
+        ::
+
+            htmltree = htmllib.HTMLTree("<p>Fish &amp;\n <b>Chips</b></p><script>track()</script>")
+
+            # Stdout output: Fish & Chips
+            print(htmltree.get_text(collapse_whitespace=True, decode_entities=True))
+        """
+        return "".join(self.iter_text(node, separator, collapse_whitespace=collapse_whitespace,
+                                      decode_entities=decode_entities))
+
+    def write_text(self, file_obj: object, node: HTMLOpeningTagNode=None, separator: str="", *,
+                   collapse_whitespace: bool=False, decode_entities: bool=None) -> None:
+        """
+        Write the text of the whole stream (or only inside ``node``) to the text file-like ``file_obj`` piece by piece,
+        instead of joining it all into one string first, see :meth:`get_text`.
+        """
+        for piece in self.iter_text(node, separator, collapse_whitespace=collapse_whitespace,
+                                    decode_entities=decode_entities):
+            file_obj.write(piece)
+
+    @memoized_query
+    def search_tags_by_name(self, name: str, *, self_closing: bool=False, limit: int=None) -> list:
+        """
+        Search through opening tags node list (or self closing if specified) and return a list of nodes that match the
+        tag name provided. Given a ``limit``, each ``search_tags_by_*`` method stops searching once it has found that
+        many nodes.
+        """
+        if limit is not None: return self.__limited(self.iter_tags_by_name(name, self_closing=self_closing), limit)
+        assert type(name) == str, "You need to provide the tag name as a string"
+        return list(self.__index("name", self_closing).get(name, ()))
+
+    @memoized_query
+    def search_tags_by_attrs(self, attrs: dict, *, self_closing: bool=False, limit: int=None) -> list:
+        """
+        Search through opening tags node list (or self closing if specified) and return a list of nodes that match the
+        tag attributes provided (non-strict matching, order does not matter).
+        """
+        return self.__limited(self.iter_tags_by_attrs(attrs, self_closing=self_closing), limit)
+
+    @memoized_query
+    def search_tags_by_exact_attrs(self, attrs: dict, *, self_closing: bool=False, limit: int=None) -> list:
+        """
+        Search through opening tags node list (or self closing if specified) and return a list of nodes that match the
+        tag attributes provided (strict matching, order does matter).
+        """
+        return self.__limited(self.iter_tags_by_exact_attrs(attrs, self_closing=self_closing), limit)
+
+    @memoized_query
+    def search_tags_by_attr(self, attr: tuple, *, self_closing: bool=False, limit: int=None) -> list:
         """
         Search through opening tags node list (or self closing if specified) and return a list of nodes that contain
         the provided attr (<key>, <value>) pair.
         """
+        if limit is not None: return self.__limited(self.iter_tags_by_attr(attr, self_closing=self_closing), limit)
         assert attr != () and type(attr) is tuple, "You need to provide a valid tuple ('<attr_key>', '<attr_value>')"
-        nodes = self.self_closing_tag_nodes if self_closing else self.opening_tag_nodes
-        matched = [n for n in nodes if n.attributes is not None and attr[0] in n.attributes and                       \
-                   n.attributes[attr[0]] == attr[1]]
-        return matched
+        return list(self.__index("attr", self_closing).get(attr, ()))
 
-    def search_tags_by_attrs_keys(self, attrs_keys: list, *, self_closing: bool=False) -> list:
+    @memoized_query
+    def search_tags_by_attrs_keys(self, attrs_keys: list, *, self_closing: bool=False, limit: int=None) -> list:
         """
         Search through opening tags node list (or self closing if specified) and return a list of nodes that match the
         tag attributes keys provided (non-strict matching, order does not matter).
         """
-        assert attrs_keys != [] and type(attrs_keys) is list, "You must provide a valid keys list [<key>, <key>, ...]"
-        nodes = self.self_closing_tag_nodes if self_closing else self.opening_tag_nodes
-        matched = []
-        for node in nodes:
-            if node.attributes is None: continue
-            match_count = 0
-            for attr_key in node.attributes.keys():
-                if attr_key not in attrs_keys: break
-                match_count += 1
-            if match_count == len(node.attributes) and len(attrs_keys) == len(node.attributes): matched.append(node)
-
-        return matched
+        return self.__limited(self.iter_tags_by_attrs_keys(attrs_keys, self_closing=self_closing), limit)
 
-    def search_tags_by_exact_attrs_keys(self, attrs_keys: list, *, self_closing: bool=False) -> list:
+    @memoized_query
+    def search_tags_by_exact_attrs_keys(self, attrs_keys: list, *, self_closing: bool=False, limit: int=None) -> list:
         """
         Search through opening tags node list (or self closing if specified) and return a list of nodes that match the
         tag attributes keys provided (strict matching, order does matter).
         """
-        assert attrs_keys != [] and type(attrs_keys) is list, "You must provide a valid keys list [<key>, <key>, ...]"
-        nodes = self.self_closing_tag_nodes if self_closing else self.opening_tag_nodes
-        matched = []
-
-        for node in nodes:
-            match_count = 0
-            try:
-                if node.attributes is None: continue
-                for index, attr_key in enumerate(node.attributes.keys()):
-                    if attr_key != attrs_keys[index]: break
-                    match_count += 1
-            except IndexError:
-                continue
-            if match_count == len(node.attributes) and len(attrs_keys) == len(node.attributes): matched.append(node)
-
-        return matched
+        return self.__limited(self.iter_tags_by_exact_attrs_keys(attrs_keys, self_closing=self_closing), limit)
 
-    def search_tags_by_attr_key(self, attr_key: str, *, self_closing: bool=False) -> list:
+    @memoized_query
+    def search_tags_by_attr_key(self, attr_key: str, *, self_closing: bool=False, limit: int=None) -> list:
         """
         Search through opening tags node list (or self closing if specified) and return a list of nodes that contain
         the provided attr key.
         """
+        if limit is not None:
+            return self.__limited(self.iter_tags_by_attr_key(attr_key, self_closing=self_closing), limit)
         assert attr_key != () and type(attr_key) is str, "You need to provide a valid str <attr_key>)"
-        nodes = self.self_closing_tag_nodes if self_closing else self.opening_tag_nodes
-        matched = [n for n in nodes if n.attributes is not None and attr_key in n.attributes]
-        return matched
+        return list(self.__index("key", self_closing).get(attr_key, ()))
 
-    def search_tags_by_id(self, tag_id: str, *, self_closing: bool=False) -> list:
+    @memoized_query
+    def search_tags_by_id(self, tag_id: str, *, self_closing: bool=False, limit: int=None) -> list:
         """
         Search through opening tags node list (or self closing if specified) and return a list of nodes that contain
         the provided ID value. This is a shortcut method to ``self.search_tags_by_attr``.
         """
         assert type(tag_id) == str, "You need to provide the ID as a string"
-        return self.search_tags_by_attr(("id", tag_id), self_closing=self_closing)
+        return self.search_tags_by_attr(("id", tag_id), self_closing=self_closing, limit=limit)
 
-    def search_tags_by_class(self, tag_class: str, *, self_closing: bool=False) -> list:
+    @memoized_query
+    def search_tags_by_class(self, tag_class: str | list, *, self_closing: bool=False, limit: int=None) -> list:
         """
-        Search through opening tags node list (or self closing if specified) and return a list of nodes that contain
-        the provided class value. This is a shortcut method to ``self.search_tags_by_attr``.
+        Search through opening tags node list (or self closing if specified) and return a list of nodes that have the
+        provided class among the whitespace separated classes in their ``class`` attribute. Several classes can be given
+        as a list (or a whitespace separated string) to only match the nodes that have all of them.
+
+        ::
+
+            htmltree = htmllib.HTMLTree("<p class='main wide'>a</p><p class='main'>b</p>")
+
+            # Stdout output: ['a']
+            print([node.inner_html for node in htmltree.search_tags_by_class(["wide", "main"])])
         """
-        assert type(tag_class) == str, "You need to provide the class as a string"
-        return self.search_tags_by_attr(("class", tag_class), self_closing=self_closing)
+        if limit is not None:
+            return self.__limited(self.iter_tags_by_class(tag_class, self_closing=self_closing), limit)
+        tokens = self.__class_tokens(tag_class)
+        if not tokens: return []
+        index = self.__index("class", self_closing)
+        postings = sorted((index.get(token, ()) for token in tokens), key=len)
+        if len(postings) == 1: return list(postings[0])
+        others = [{id(node) for node in posting} for posting in postings[1:]]  # Intersect with the shortest posting.
+        return [node for node in postings[0] if all(id(node) in other for other in others)]
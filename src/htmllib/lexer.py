@@ -8,8 +8,13 @@ Internal module used to generate a list of verbose tokens to be handed to the pa
 
 from __future__ import annotations
 
+import re
+
+from array import array
+from bisect import bisect_left
 from enum import Enum, auto
-from dataclasses import dataclass
+from codecs import getincrementaldecoder
+from typing import IO, Callable, Iterable, Iterator
 
 
 class TokenTypes(Enum):
@@ -28,47 +33,283 @@ class TokenTypes(Enum):
     EOF = auto()
 
 
-@dataclass
+_OUTSIDE_TAG_CHARS = re.compile(r"[<>]")
+_INSIDE_TAG_CHARS = re.compile(r"[<>!/=\"'A-Za-z0-9]")
+_ID_END = re.compile(r"[ >=</]")
+_DOUBLE_QUOTE_END = re.compile(r"[\"\n]")
+_SINGLE_QUOTE_END = re.compile(r"['\n]")
+
+RAW_TEXT_TAGS = ("script", "style", "textarea")  # Elements whose content is never tokenized, only their closing tag.
+_RAW_TEXT_ENDS = {name: re.compile(rf"</{name}(?=[\s/>]|$)", re.IGNORECASE) for name in RAW_TEXT_TAGS}
+_RAW_TEXT_TAIL = max(len(f"</{name}") for name in RAW_TEXT_TAGS)
+
+
+class LineIndex:
+    """
+    An index of the position of every newline in a stream of HTML code, used to resolve the line and column of a raw
+    char index on demand with a binary search. The index is only built (in a single pass) the first time a line or
+    column is actually requested.
+
+    :param stream: The (decoded) stream of HTML code to index
+    :type stream: str
+    """
+    __slots__ = ("stream", "__offsets")
+
+    def __init__(self, stream: str) -> None:
+        self.stream = stream
+        self.__offsets = None
+
+    def reset(self, stream: str) -> None:
+        """
+        Point the index at a new (edited) stream, the newline offsets will be rebuilt the next time they are needed.
+        """
+        self.stream = stream
+        self.__offsets = None
+
+    @property
+    def offsets(self) -> array:
+        """
+        The sorted index of every newline char in the stream.
+        """
+        if self.__offsets is None:
+            offsets = array("q")
+            index = self.stream.find("\n")
+            while index != -1:
+                offsets.append(index)
+                index = self.stream.find("\n", index + 1)
+            self.__offsets = offsets
+        return self.__offsets
+
+    def line_col(self, index: int) -> tuple:
+        """
+        Resolve a char index in the stream to its ``(line, col)`` pair, both starting at 1.
+        """
+        offsets = self.offsets
+        line = bisect_left(offsets, index)
+        return line + 1, index - (offsets[line - 1] if line else -1)
+
+
 class Cursor:
     """
     Represents the position of the char pointer in the stream of HTML code used for tracking the exact position, line
     and column.
+
+    Only the index is stored by the lexer, the line and column are resolved from a shared :class:`LineIndex` the first
+    time they are read (unless they were given explicitly).
     """
-    index: int
-    line: int
-    col: int
+    __slots__ = ("index", "lines", "__line", "__col")
+
+    def __init__(self, index: int, line: int=None, col: int=None, *, lines: LineIndex=None) -> None:
+        self.index = index
+        self.lines = lines
+        self.__line = line
+        self.__col = col
+
+    @property
+    def line(self) -> int:
+        if self.__line is None and self.lines is not None: return self.lines.line_col(self.index)[0]
+        return self.__line
+
+    @line.setter
+    def line(self, line: int) -> None:
+        self.__line = line
+
+    @property
+    def col(self) -> int:
+        if self.__col is None and self.lines is not None: return self.lines.line_col(self.index)[1]
+        return self.__col
+
+    @col.setter
+    def col(self, col: int) -> None:
+        self.__col = col
 
     def increment(self, chars: int=1) -> None:
         """
         To be called when moving on to the next character in the stream list.
         """
-        self.col += chars
+        self.line, self.col = self.line, self.col + chars
 
     def new_line(self, lines :int=1) -> None:
         """
         To be called whenever the current character is a newline character ('\n').
         """
-        self.line += lines
-        self.col = 1
+        self.line, self.col = self.line + lines, 1
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__: return NotImplemented
+        return (self.index, self.line, self.col) == (other.index, other.line, other.col)
+
+    def __repr__(self) -> str:
+        return f"Cursor(index={self.index}, line={self.line}, col={self.col})"
 
 
-@dataclass
 class Token:
     """
     Represents a tokenized piece of code. To be only generated from the lex process.
+
+    The extra content of ``!`` tokens (doctypes and comments) lexed from a whole stream is kept as a span of the stream
+    right after the ``!``, and is only sliced out when :attr:`extra` is read.
+    """
+    __slots__ = ("type", "value", "cursor", "extra_len", "__extra")
+
+    def __init__(self, type: TokenTypes, value: str, cursor: Cursor, extra: str=None, *, extra_len: int=None) -> None:
+        self.type = type
+        self.value = value
+        self.cursor = cursor
+        self.extra_len = extra_len if extra is None else len(extra)
+        self.__extra = extra  # Extra content, e.g. doctype and comments.
+
+    @property
+    def extra(self) -> str:
+        if self.__extra is None and self.extra_len is not None:
+            start = self.cursor.index + 1
+            return self.cursor.lines.stream[start : start + self.extra_len]
+        return self.__extra
+
+    @extra.setter
+    def extra(self, extra: str) -> None:
+        self.__extra, self.extra_len = extra, None if extra is None else len(extra)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__: return NotImplemented
+        return (self.type, self.value, self.cursor, self.extra) == (other.type, other.value, other.cursor, other.extra)
+
+    def __repr__(self) -> str:
+        return f"Token(type={self.type!r}, value={self.value!r}, cursor={self.cursor!r}, extra={self.extra!r})"
+
+
+def _bisect_index(items: list, index: int, key: Callable, lo: int=0) -> int:
+    """
+    **For internal use only**
+
+    Return the position of the first item in the (sorted by stream index) ``items`` list whose ``key(item)`` index is
+    not less than ``index``.
+    """
+    hi = len(items)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if key(items[mid]) < index: lo = mid + 1
+        else: hi = mid
+    return lo
+
+
+_TOKEN_TYPES_BY_VALUE = {token_type.value: token_type for token_type in TokenTypes}
+
+
+class TokenView:
+    """
+    A thin view over a single row of a :class:`TokenTable`, exposing the same ``type``, ``value``, ``cursor`` and
+    ``extra`` attributes as a :class:`Token`. Values are only sliced out of the stream when they are read.
+    """
+    __slots__ = ("table", "position")
+
+    def __init__(self, table: TokenTable, position: int) -> None:
+        self.table = table
+        self.position = position
+
+    @property
+    def type(self) -> TokenTypes:
+        return _TOKEN_TYPES_BY_VALUE[self.table.types[self.position]]
+
+    @property
+    def value(self) -> str:
+        table, position = self.table, self.position
+        token_type, start = self.type, table.starts[position]
+        if token_type is TokenTypes.ID: return table.stream[start : table.ends[position]]
+        if token_type is TokenTypes.QUOTE: return table.stream[start + 1 : table.ends[position]]
+        if token_type is TokenTypes.EXCLAMATION: return "!"
+        if token_type is TokenTypes.EOF: return "EOF"
+        if token_type is TokenTypes.CONTENT: return table.stream[start : table.ends[position]]
+        return table.stream[start]
+
+    @property
+    def cursor(self) -> Cursor:
+        return self.table.cursor(self.position)
+
+    @property
+    def extra(self) -> str:
+        if self.type is not TokenTypes.EXCLAMATION: return None
+        return self.table.stream[self.table.starts[self.position] + 1 : self.table.ends[self.position]]
+
+    @property
+    def extra_len(self) -> int:
+        if self.type is not TokenTypes.EXCLAMATION: return None
+        return self.table.ends[self.position] - self.table.starts[self.position] - 1
+
+    def to_token(self) -> Token:
+        """
+        Materialize this view into a full :class:`Token`.
+        """
+        return Token(self.type, self.value, self.cursor, self.extra)
+
+    def __repr__(self) -> str:
+        return f"TokenView(type={self.type}, value={self.value!r}, cursor={self.cursor}, extra={self.extra!r})"
+
+
+class TokenTable:
     """
-    type: TokenTypes
-    value: str
-    cursor: Cursor
-    extra: str = None  # Extra content, e.g. doctype and comments.
+    A compact, columnar alternative to a list of :class:`Token` objects. Each token is stored as a row of three
+    arrays (its type, start index and end index) and everything else is derived from the stream on access through a
+    :class:`TokenView`, so a token costs 17 bytes instead of a ``Token``, a ``Cursor`` and its strings.
+
+    :param stream: The (decoded) stream of HTML code the offsets point into
+    :type stream: str
+
+    :param lines: The line index to resolve cursors with, a new one is made for ``stream`` if not given
+    :type lines: LineIndex, optional
+
+    -------------
+    Example Usage
+    -------------
+
+    ::
+
+        table = Lexer(code).lex_table()
+
+        print(len(table), table[1].value, table[1].cursor.line)
+    """
+    __slots__ = ("stream", "lines", "types", "starts", "ends")
+
+    def __init__(self, stream: str, lines: LineIndex=None) -> None:
+        self.stream = stream
+        self.lines = lines if lines is not None else LineIndex(stream)
+        self.types = array("B")
+        self.starts = array("q")
+        self.ends = array("q")
+
+    def append(self, token_type: TokenTypes, start: int, end: int) -> None:
+        """
+        Add a token row to the end of the table.
+        """
+        self.types.append(token_type.value)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def cursor(self, position: int) -> Cursor:
+        """
+        The cursor of the token at ``position``, its line and column are only resolved when read.
+        """
+        return Cursor(self.starts[position], lines=self.lines)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, position: int) -> TokenView:
+        if position < 0: position += len(self.types)
+        if not 0 <= position < len(self.types): raise IndexError("TokenTable index out of range")
+        return TokenView(self, position)
+
+    def __iter__(self) -> Iterator[TokenView]:
+        return (TokenView(self, position) for position in range(len(self.types)))
 
 
 class Lexer:
     """
     Represents the lex process/ states.
 
-    :param html_stream: A stream of raw HTML code to tokenize/ lex
-    :type html_stream: bytes, str
+    :param html_stream: A stream of raw HTML code to tokenize/ lex, or a file-like object/ iterable of chunks to
+        tokenize lazily with :meth:`iter_tokens`
+    :type html_stream: bytes, str, file-like, iterable
 
     -------------
     Example Usage
@@ -86,6 +327,11 @@ class Lexer:
         # Optional, this just prints out all of the generated tokens in a pretty looking way.
         pretty_print_tokens(tokens)
 
+        # Or stream the tokens straight out of a (possibly huge) file without ever holding all of it in memory.
+        with open("huge.html", "rb") as file_obj:
+            for token in Lexer(file_obj).iter_tokens():
+                ...
+
     ----
     Note
     ----
@@ -96,41 +342,71 @@ class Lexer:
 
     * Index may not appear accurate when compared to text editors, but it is for the sake of list indexing the HTML.
 
+    * The stream is not walked char by char, the lexer jumps between significant chars using precompiled regexes and
+    slices identifiers/ quoted values straight out of the stream, a cursor is only created when a token is emitted.
+
+    * When lexing from a file-like object or an iterable of chunks, :attr:`stream_raw` is ``None`` as the stream is
+    never held in memory as a whole.
+
     """
-    def __init__(self, html_stream: str | bytes) -> None:
-        assert type(html_stream) == bytes or type(html_stream) == str, "HTML Stream must be bytes string or string"
-        self.__html_stream = html_stream.decode("utf-8") if type(html_stream) == bytes else html_stream
-        self.__stream_proc = list(html_stream)
-        self.__cursor = Cursor(None, 1, 1)  # For index, use the lexer's index at a later stage in lex.
+    def __init__(self, html_stream: str | bytes | IO | Iterable) -> None:
+        assert type(html_stream) == bytes or type(html_stream) == str or hasattr(html_stream, "read") or \
+            hasattr(html_stream, "__iter__"), "HTML Stream must be bytes string, string, file-like or iterable"
+        self.__chunks = None
+        if type(html_stream) == bytes or type(html_stream) == str:
+            self.__html_stream = html_stream.decode("utf-8") if type(html_stream) == bytes else html_stream
+        else:
+            self.__html_stream = None
+            self.__chunks = html_stream
+        self.__lines = LineIndex(self.__html_stream) if self.__html_stream is not None else None
+        self.__stream_list = None  # The stream split into a list, only made if :attr:`stream` is read.
+        self.__cursor = Cursor(0, 1, 1)  # Only used to count lines as chunks go by, a whole stream uses a line index.
         self.__index = 0
+        self.__resume = 0
         self.__tokens = list()
         self.__inside_angle_bracket = False
+        self.__tag_name = None  # Name of the opening tag being lexed, '<' while waiting for the name.
+        self.__last_type = None  # Type of the last token lexed inside of a tag.
+        self.__raw_text_end = None  # Closing tag pattern to skip to, when inside of a raw text element.
 
     @property
     def stream_raw(self) -> str:
         """
-        The original (decoded) stream of HTML code.
+        The original (decoded) stream of HTML code, ``None`` when lexing from a file-like object/ iterable of chunks.
         """
         return self.__html_stream
 
     @property
     def stream(self) -> list(str):
         """
-        The original (decoded) stream split into a list.
+        The original (decoded) stream split into a list, made the first time it is read (and again after an edit).
+        Not available when lexing from a file-like object/ iterable of chunks. :attr:`stream_raw` is indexed the same
+        way without making the list.
+        """
+        assert self.__html_stream is not None, "The stream of a file-like object/ iterable is never held as a whole"
+        if self.__stream_list is None: self.__stream_list = list(self.__html_stream)
+        return self.__stream_list
+
+    @property
+    def lines(self) -> LineIndex:
+        """
+        The line index shared by the cursors of every token lexed from :attr:`stream_raw`, ``None`` when lexing from a
+        file-like object/ iterable of chunks (the cursors of those tokens have their line and column counted eagerly).
         """
-        return self.__stream_proc
+        return self.__lines
 
     @property
     def cursor(self) -> Cursor:
         """
-        The main cursor to use during tokenization. Used in cursor snapshots.
+        The position the lexer has reached in the stream.
         """
+        if self.__lines is not None: return Cursor(self.__index, lines=self.__lines)
         return self.__cursor
 
     @property
     def index(self) -> int:
         """
-        The current char index in the stream list.
+        The current char index in the stream.
         """
         return self.__index
 
@@ -141,84 +417,226 @@ class Lexer:
         """
         return self.__tokens
 
-    def __index_up(self) -> int:
+    def get_char(self, index: int) -> char:
         """
-        **For internal use only**
+        Returns the character at the specified index. Not available when lexing from a file-like object/ iterable of
+        chunks.
+        """
+        assert self.__html_stream is not None, "The stream of a file-like object/ iterable is never held as a whole"
+        return self.__html_stream[index]
 
-        Return current index for the Lexer object & increment it's value.
+    def snapshot_cursor(self, cursor: Cursor) -> Cursor:
         """
-        current = self.__index
-        self.__index += 1
-        return current
+        Snapshot a cursor at it's current position. Useful for the :meth:``self.lex``.
+        """
+        return Cursor(cursor.index, cursor.line, cursor.col)
 
-    def __index_down(self) -> int:
+    def __cursor_at(self, stream: str, index: int, base: int=0) -> Cursor:
         """
         **For internal use only**
 
-        Return the current index for the Lexer object & decrement it's value.
-        """
-        current = self.__index
-        self.__index -= 1
-        return current
+        Move the lexer's cursor forward to ``index`` and return a snapshot of it. Lines are counted over the skipped
+        slice in one go rather than per char, so this must only ever be called with increasing indexes. This is only
+        needed when lexing chunks, as there is no whole stream to build a :class:`LineIndex` from.
 
-    def get_char(self, index: int) -> char:
+        :param stream: The stream (or chunk buffer) ``index`` points into
+        :type stream: str
+
+        :param base: The index of ``stream[0]`` in the whole stream, used when lexing chunks
+        :type base: int, optional
         """
-        Returns the character at the specified index.
+        cursor = self.__cursor
+        last = cursor.index - base
+        newlines = stream.count("\n", last, index)
+        if newlines:
+            cursor.line += newlines
+            cursor.col = index - stream.rfind("\n", last, index)
+        else:
+            cursor.col += index - last
+        cursor.index = base + index
+        return Cursor(base + index, cursor.line, cursor.col)
+
+    def __make_token(self, stream: str, token_type: TokenTypes, start: int, end: int, cursor: Cursor) -> Token:
         """
-        return self.stream[index]
+        **For internal use only**
 
-    def __eat_id(self, until: list=[" ", ">", "=", "<", "/"]) -> None:
+        Build a :class:`Token` from a ``(type, start, end)`` tuple generated by :meth:`_scan`.
+        """
+        if token_type is TokenTypes.ID: return Token(token_type, stream[start:end], cursor)
+        if token_type is TokenTypes.QUOTE: return Token(token_type, stream[start + 1:end], cursor)
+        if token_type is TokenTypes.EXCLAMATION:
+            if cursor.lines is not None: return Token(token_type, "!", cursor, extra_len=end - start - 1)
+            return Token(token_type, "!", cursor, stream[start + 1:end])  # Chunks are dropped, so slice it out now.
+        if token_type is TokenTypes.CONTENT: return Token(token_type, stream[start:end], cursor)
+        return Token(token_type, stream[start], cursor)
+
+    def _scan(self, stream: str, pos: int=0, *, final: bool=True) -> Iterator[tuple]:
         """
         **For internal use only**
 
-        Eat chars and return them as a string whilst incrementing the lexers main index.
+        Scan ``stream`` from ``pos`` and yield a ``(type, start, end)`` tuple for every token found. ``start`` is the
+        index of the token in the stream and ``end`` is the end of its value (or of its extra content for ``!`` tokens),
+        so the token's strings can be sliced out of the stream in one step.
 
-        :param until: The character to stop at
-        :type until: str, optional
+        Comments run to the first ``-->``, ``<![CDATA[`` sections to the first ``]]>`` and any other ``<!...>`` (e.g.
+        a doctype declaration) to the first ``>``, each found with a single search.
 
-        :return: ``identifier``, the string that was produced from consuming the valid lexemes
-        :rtype: str
+        :param final: Whether ``stream`` runs to the end of the HTML, if not the scan stops in front of any token that
+            could carry on into the next chunk and the index to resume from is left in ``self.__resume``
+        :type final: bool, optional
+        """
+        stream_len = len(stream)
+
+        while pos < stream_len or (final and self.__raw_text_end is not None):
+            # Inside of a raw text element (e.g. ``<script>``), everything up to its closing tag is one content span.
+            if self.__raw_text_end is not None:
+                match = self.__raw_text_end.search(stream, pos)
+                if match is not None and (final or match.end() < stream_len):
+                    end = match.start()
+                elif final:
+                    end = stream_len
+                else:  # The closing tag may be split between chunks, keep the tail of the buffer for the next scan.
+                    end = max(pos, stream_len - _RAW_TEXT_TAIL)
+                    if end > pos: yield TokenTypes.CONTENT, pos, end
+                    pos = end
+                    break
+                self.__raw_text_end = None
+                yield TokenTypes.CONTENT, pos, end  # Always yielded (even when empty) to mark a raw text element.
+                pos = end
+                continue
+
+            # Outside of a tag everything is content, so jump straight to the next angle bracket.
+            if self.__inside_angle_bracket is False:
+                match = _OUTSIDE_TAG_CHARS.search(stream, pos)
+                if match is None:
+                    pos = stream_len
+                    break
+                pos = match.start()
+                if stream[pos] == "<":
+                    self.__inside_angle_bracket = True
+                    self.__tag_name = self.__last_type = TokenTypes.ANGLE_BRACKET_L
+                    yield TokenTypes.ANGLE_BRACKET_L, pos, pos + 1
+                else:
+                    yield TokenTypes.ANGLE_BRACKET_R, pos, pos + 1
+                pos += 1
+                continue
+
+            # Inside of a tag, skip whitespace and non-supported lexemes until the next significant char.
+            match = _INSIDE_TAG_CHARS.search(stream, pos)
+            if match is None:
+                pos = stream_len
+                break
+            pos = match.start()
+            char = stream[pos]
+
+            if char == "<":
+                self.__tag_name = self.__last_type = TokenTypes.ANGLE_BRACKET_L
+                yield TokenTypes.ANGLE_BRACKET_L, pos, pos + 1
+                pos += 1
+                continue
+            elif char == ">":
+                # The opening tag of a raw text element (not self closed), skip straight to its closing tag next.
+                if self.__tag_name in _RAW_TEXT_ENDS and self.__last_type is not TokenTypes.CLOSING_SLASH:
+                    self.__raw_text_end = _RAW_TEXT_ENDS[self.__tag_name]
+                self.__inside_angle_bracket = False
+                self.__tag_name = self.__last_type = None
+                yield TokenTypes.ANGLE_BRACKET_R, pos, pos + 1
+                pos += 1
+                continue
+            elif char == "!":  # Catches doctype stuff and comments, the extra content is everything up to the end '>'.
+                if not final and stream_len - pos <= len("![CDATA["): break  # Not enough to tell which it is yet.
+                if stream.startswith("--", pos + 1): terminator = "-->"
+                elif stream.startswith("[CDATA[", pos + 1): terminator = "]]>"
+                else: terminator = ">"
+                end = stream.find(terminator, pos + 1)
+                if end == -1:
+                    if not final: break
+                    end = stream_len
+                else:
+                    end += len(terminator) - 1  # Stop in front of the '>' so that it is still lexed as a token.
+                token_type = TokenTypes.EXCLAMATION
+            elif char == "/":
+                token_type, end = TokenTypes.CLOSING_SLASH, pos + 1
+            elif char == "=":
+                token_type, end = TokenTypes.ASSIGNMENT, pos + 1
+            elif char == "\"" or char == "'":  # Quoted strings end at the matching quote or at a newline.
+                match = (_DOUBLE_QUOTE_END if char == "\"" else _SINGLE_QUOTE_END).search(stream, pos + 1)
+                if match is None and not final: break
+                end = match.start() if match is not None else stream_len
+                token_type = TokenTypes.QUOTE
+            else:  # All identifiers [aA-zZ, 0-9].
+                match = _ID_END.search(stream, pos)
+                if match is None and not final: break
+                end = match.start() if match is not None else stream_len
+                token_type = TokenTypes.ID
+                if self.__tag_name is TokenTypes.ANGLE_BRACKET_L:  # The first ID straight after a '<' is the tag name.
+                    self.__tag_name = stream[pos:end].split(None, 1)[0].lower()
+
+            if self.__tag_name is TokenTypes.ANGLE_BRACKET_L: self.__tag_name = None  # Not an opening tag.
+            self.__last_type = token_type
+            yield token_type, pos, end
+            pos = end + 1 if token_type is TokenTypes.QUOTE else end
+
+        self.__resume = min(pos, stream_len)
+
+    def __iter_chunks(self, chunk_size: int) -> Iterator[str]:
         """
-        identifier = str()
-        char = self.get_char(self.index - 1)
-        while char not in until and self.index < len(self.stream):  # Check index avoid out of range.
-            identifier += char
-            if char == "\n": self.cursor.new_line()
-            else: self.cursor.increment()
-            char = self.get_char(self.__index_up())
-        if char in until: self.__index_down()
-        if self.index == len(self.stream): identifier += char  # Avoid out of index but add char if it is at EOF.
-        return identifier
-
-    def __eat_quotes(self, *, which: str="\"") -> None:
-        """        
         **For internal use only**
 
-        Eats quoted strings.
-
-        :return: ``quoted``, the string that was produced from eating the chars inside of quotes
-        :rtype: str
+        Read the file-like object/ iterable the lexer was given and yield it as decoded string chunks.
         """
-        quoted = str()
-        char = self.get_char(self.__index_up())  # Char past the first `"`, the start of quoted str.
-        while char not in [which, "\n"] and self.index < len(self.stream):
-            quoted += char
-            self.cursor.increment()
-            char = self.get_char(self.__index_up())
-        if char == which:
-            self.cursor.increment()
-        if self.index == len(self.stream): quoted += char  # Avoid out of index but add char if it is at EOF.
-        return quoted
-
-    def snapshot_cursor(self, cursor: Cursor) -> Cursor:
+        decoder = getincrementaldecoder("utf-8")()
+        if hasattr(self.__chunks, "read"):
+            chunks = iter(lambda: self.__chunks.read(chunk_size), "")
+        else:
+            chunks = iter(self.__chunks)
+
+        for chunk in chunks:
+            if not chunk: break  # A binary file-like object hits EOF with b"", which is not the sentinel above.
+            yield decoder.decode(chunk) if type(chunk) == bytes else chunk
+        yield decoder.decode(b"", True)
+
+    def iter_tokens(self, *, chunk_size: int=65536) -> Iterator[Token]:
         """
-        Snapshot a cursor at it's current position. Useful for the :meth:``self.lex``.
+        Lazily generate tokens one at a time, without appending them to :attr:``self.tokens``.
+
+        When the lexer was given a file-like object/ iterable of chunks the stream is read ``chunk_size`` chars at a
+        time, and only the unfinished token at the end of each chunk (an ID, quoted value or ``<!...>`` that runs on
+        into the next chunk) is carried over, so memory stays flat regardless of the size of the document. For the same
+        reason, the content of a raw text element may be split between a few consecutive ``CONTENT`` tokens.
+
+        :param chunk_size: The amount of data to read from a file-like object at a time
+        :type chunk_size: int, optional
+
+        :return: A generator of tokens, ending with an ``EOF`` token
+        :rtype: Iterator[Token]
         """
-        return Cursor(cursor.index, cursor.line, cursor.col)
+        make_token, cursor_at = self.__make_token, self.__cursor_at
+
+        if self.__chunks is None:
+            stream, lines = self.__html_stream, self.__lines
+            for token_type, start, end in self._scan(stream, self.__index):
+                yield make_token(stream, token_type, start, end, Cursor(start, lines=lines))
+            self.__index = self.__resume
+            yield Token(TokenTypes.EOF, "EOF", Cursor(len(stream), lines=lines))
+            return
+
+        buffer, base = "", self.__index
+        for chunk in self.__iter_chunks(chunk_size):
+            buffer += chunk
+            for token_type, start, end in self._scan(buffer, final=False):
+                yield make_token(buffer, token_type, start, end, cursor_at(buffer, start, base))
+            cursor_at(buffer, self.__resume, base)  # Count lines in the part of the buffer being dropped.
+            buffer, base = buffer[self.__resume:], base + self.__resume
+
+        for token_type, start, end in self._scan(buffer):
+            yield make_token(buffer, token_type, start, end, cursor_at(buffer, start, base))
+        self.__index = base + len(buffer)
+        yield Token(TokenTypes.EOF, "EOF", self.__cursor_at(buffer, len(buffer), base))
 
     def lex(self, *, debug: bool=False) -> list(Token):
         """
-        Generates tokens from :attr:``self.stream`` to be appended to :attr:``self.tokens``.
+        Generates tokens from :attr:``self.stream_raw`` to be appended to :attr:``self.tokens``.
 
         :param debug: Do not raise, just print errors
         :type debug: bool, optional
@@ -228,64 +646,80 @@ class Lexer:
         :return: :attr:``self.tokens``
         :rtype: list
         """
-        while self.index < len(self.stream):
-            # Only increment the index when it is less than the stream len to avoid out of index error for stream list.
-            char = self.get_char(self.__index_up()) if self.index < len(self.stream) else self.get_char(self.index)
-            self.cursor.index = self.index - 1  # At every run of lex, set the lexer's cursor index to match the lexer.
-            cursor = self.snapshot_cursor(self.cursor)
-
-            # This first if is to avoid including content in a tag as the IDs inside the angled brackets of a tag for -
-            # example: '<html lang="en">' would have ``html``, ``lang`` and ``en`` tokenized as IDs whereas
-            # '<title>Document</title>' would only have ``title`` (in both the opening and closing tag interior) tokenized
-            # as IDs and will ignore the text ``Document`` which is inside the body of the tag.
-            #
-            # This check works by making sure that the current lexeme is not in the tag body but the tag interior, but at
-            # the same time still running cases for "<", ">" and "\n" to avoid breaking the lex process incase one is found
-            # in the tag's body.
-            # 
-            # TL;DR: ignore content in tag body, only tokenize IDs in the tag's interior (tag params).
-            if char not in ["<", ">", "\n"] and self.__inside_angle_bracket is False: self.cursor.increment()
-            elif char == " ": self.cursor.increment()
-            elif char == "\t": self.cursor.increment()
-            elif char == "\n": self.cursor.new_line()
-            elif char == "<":
-                self.__inside_angle_bracket = True
-                self.tokens.append(Token(TokenTypes.ANGLE_BRACKET_L, "<", cursor))
-                self.cursor.increment()
-            elif char == ">":
-                self.__inside_angle_bracket = False
-                self.tokens.append(Token(TokenTypes.ANGLE_BRACKET_R, ">", cursor))
-                self.cursor.increment()
-            elif char == "!":  # Catches doctype stuff and comments and stores them in token extra param for later.
-                self.cursor.increment()
-                self.__index_up()
-                extra = self.__eat_id([">"])
-                self.tokens.append(Token(TokenTypes.EXCLAMATION, "!", cursor, extra))
-            elif char == "/":
-                self.tokens.append(Token(TokenTypes.CLOSING_SLASH, "/", cursor))
-                self.cursor.increment()
-            elif char == "=":
-                self.tokens.append(Token(TokenTypes.ASSIGNMENT, "=", cursor))
-                self.cursor.increment()
-            elif char == "\"":
-                self.cursor.increment()
-                quoted = self.__eat_quotes()
-                self.tokens.append(Token(TokenTypes.QUOTE, quoted, cursor))
-            elif char == "'":
-                self.cursor.increment()
-                quoted = self.__eat_quotes(which="'")
-                self.tokens.append(Token(TokenTypes.QUOTE, quoted, cursor))
-            elif ord(char) >= ord('A') and ord(char) <= ord('Z') or \
-                ord(char) >= ord('a') and ord(char) <= ord('z') or \
-                ord(char) >= ord("0") and ord(char) <= ord("9"):  # All identifiers [aA-zZ, 0-9].
-                identifier = self.__eat_id()
-                self.tokens.append(Token(TokenTypes.ID, identifier, cursor))
-            else: self.cursor.increment()
-
-        self.tokens.append(Token(TokenTypes.EOF, "EOF", Cursor(len(self.stream_raw),
-                                                               self.cursor.line, self.cursor.col)))
+        self.tokens.extend(self.iter_tokens())
         return self.tokens
 
+    def _edit(self, offset: int, removed_len: int, inserted_text: str) -> tuple:
+        """
+        **For internal use only**
+
+        Replace ``removed_len`` chars at ``offset`` in :attr:`stream_raw` with ``inserted_text`` and update
+        :attr:`tokens` to match, without lexing the whole stream again.
+
+        Lexing restarts just after the last ``>`` token before the edit (the lexer is always outside of a tag there,
+        unless the ``>`` opened a raw text element) and stops at the first such ``>`` token past the edit that lines up
+        with one of the old stream, as from there on the old tokens are still valid. Those only have their cursor
+        indexes shifted by the size difference.
+
+        :return: ``(first, discarded, relexed)``, the position in :attr:`tokens` where the old ``discarded`` tokens
+            were replaced with the ``relexed`` ones
+        :rtype: tuple
+        """
+        assert self.__chunks is None and self.tokens, "Only a stream that has been fully lexed can be edited"
+        tokens, lines = self.tokens, self.__lines
+        stream = self.__html_stream[:offset] + inserted_text + self.__html_stream[offset + removed_len:]
+        delta, edit_end = len(inserted_text) - removed_len, offset + len(inserted_text)
+
+        first = _bisect_index(tokens, offset, lambda token: token.cursor.index)
+        while first > 0 and (tokens[first - 1].type is not TokenTypes.ANGLE_BRACKET_R or
+                             tokens[first].type is TokenTypes.CONTENT): first -= 1
+        start = tokens[first - 1].cursor.index + 1 if first > 0 else 0
+
+        self.__html_stream = stream
+        self.__stream_list = None
+        self.__inside_angle_bracket = False
+        self.__tag_name = self.__last_type = self.__raw_text_end = None
+        lines.reset(stream)
+
+        relexed, last = [], len(tokens)
+        for token_type, token_start, token_end in self._scan(stream, start):
+            cursor = Cursor(token_start, lines=lines)
+            relexed.append(self.__make_token(stream, token_type, token_start, token_end, cursor))
+            if token_type is not TokenTypes.ANGLE_BRACKET_R or token_start < edit_end or \
+                self.__raw_text_end is not None: continue
+            old = _bisect_index(tokens, token_start - delta, lambda token: token.cursor.index, first)
+            if old < len(tokens) and tokens[old].type is TokenTypes.ANGLE_BRACKET_R and \
+                tokens[old].cursor.index == token_start - delta and \
+                tokens[old + 1].type is not TokenTypes.CONTENT:  # Re-synchronized with the old stream of tokens.
+                last = old + 1
+                break
+        else:
+            relexed.append(Token(TokenTypes.EOF, "EOF", Cursor(len(stream), lines=lines)))
+
+        for token in tokens[last:]: token.cursor.index += delta
+        discarded = tokens[first:last]
+        tokens[first:last] = relexed
+        self.__index = len(stream)
+        return first, discarded, relexed
+
+    def lex_table(self) -> TokenTable:
+        """
+        Generates tokens from :attr:``self.stream_raw`` into a compact :class:`TokenTable` instead of a list of
+        :class:`Token` objects. Nothing is appended to :attr:``self.tokens``.
+
+        :return: The table of generated tokens, ending with an ``EOF`` token
+        :rtype: TokenTable
+        """
+        assert self.__html_stream is not None, "A token table can not be built from a file-like object/ iterable"
+        stream = self.__html_stream
+        table = TokenTable(stream, self.__lines)
+        append = table.append
+        for token_type, start, end in self._scan(stream, self.__index):
+            append(token_type, start, end)
+        self.__index = self.__resume
+        append(TokenTypes.EOF, len(stream), len(stream))
+        return table
+
 
 def pretty_print_tokens(tokens: list, *, index=None) -> None:
     """
@@ -297,9 +731,10 @@ def pretty_print_tokens(tokens: list, *, index=None) -> None:
     :param index: The index of a specific token to pretty print, defaults to None
     :type index: int, optional
 
-    :raises TypeError: Raised if a list is not given as ``tokens`` param
+    :raises TypeError: Raised if a list (or token table) is not given as ``tokens`` param
     """
-    if type(tokens) != list: raise TypeError("Param ``tokens`` must be of type ``list``")
+    if type(tokens) != list and type(tokens) != TokenTable:
+        raise TypeError("Param ``tokens`` must be of type ``list`` or ``TokenTable``")
     for i, token in enumerate(tokens):
         if index is not None: i = index
         print(
@@ -0,0 +1,121 @@
+"""
+=====================
+HTMLLIB Query Caching
+=====================
+
+A size bounded least recently used cache, used by :class:`HTMLTree` to memoize the results of its queries until the
+tree changes.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    """
+    The statistics of a :class:`LRUCache`, the same as those of ``functools.lru_cache``.
+    """
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+MISSING = object()  # Returned by :meth:`LRUCache.get` for keys that are not cached.
+
+
+class LRUCache:
+    """
+    A mapping that only keeps the ``maxsize`` most recently used entries, counting the hits and misses of each lookup.
+
+    :param maxsize: The most entries to keep, or ``None`` for no bound
+    :type maxsize: int, optional
+    """
+    def __init__(self, maxsize: int=256) -> None:
+        assert maxsize is None or (type(maxsize) == int and maxsize >= 0), \
+            "The max size must be a non-negative int (or None)"
+        self.__maxsize = maxsize
+        self.__entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: object) -> object:
+        """
+        The value cached for ``key`` (marking it as the most recently used), or :data:`MISSING`.
+        """
+        value = self.__entries.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.__entries.move_to_end(key)
+        return value
+
+    def put(self, key: object, value: object) -> None:
+        """
+        Cache ``value`` for ``key``, evicting the least recently used entry if the cache is full.
+        """
+        if self.__maxsize == 0: return
+        self.__entries[key] = value
+        self.__entries.move_to_end(key)
+        if self.__maxsize is not None and len(self.__entries) > self.__maxsize: self.__entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """
+        Drop every entry, keeping the statistics.
+        """
+        self.__entries.clear()
+
+    def clear(self) -> None:
+        """
+        Drop every entry and reset the statistics.
+        """
+        self.__entries.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """
+        The statistics of the cache.
+        """
+        return CacheInfo(self.hits, self.misses, self.__maxsize, len(self.__entries))
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+def _freeze(value: object) -> object:
+    """
+    **For internal use only**
+
+    A hashable stand in for a query argument, dicts and lists are turned into tuples (tagged with their type).
+    """
+    if type(value) == dict: return dict, tuple(value.items())
+    if type(value) == list: return list, tuple(value)
+    return value
+
+
+def memoized_query(method: Callable) -> Callable:
+    """
+    Decorate a query method of :class:`HTMLTree` to cache its results by its arguments in the tree's query cache (see
+    :meth:`HTMLTree._memoized`). Lists (and dicts of lists) are copied before they are returned, so changing a result
+    does not change the cached one. Calls with arguments that can not be hashed are not cached.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def memoized(self, *args, **kwargs) -> object:
+        try:
+            key = (name, tuple(_freeze(arg) for arg in args), tuple(sorted((key, _freeze(value))
+                                                                         for key, value in kwargs.items())))
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+        result = self._memoized(key, lambda: method(self, *args, **kwargs))
+        if type(result) == list: return list(result)
+        if type(result) == dict: return {name: list(nodes) for name, nodes in result.items()}
+        return result
+
+    return memoized
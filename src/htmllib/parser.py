@@ -8,21 +8,130 @@ Take generated tokens list, run validation checks and convert into nodes that re
 
 from __future__ import annotations
 
-from .lexer import Cursor, TokenTypes, Lexer, Token
-
-from dataclasses import dataclass
-
-
-@dataclass
+from .lexer import Cursor, TokenTypes, Lexer, Token, TokenTable, _bisect_index
+from .entities import decode_entities
+from .text import iter_text
+
+import re
+import sys
+
+from dataclasses import dataclass, field
+from enum import Enum, auto
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Union
+
+
+_DOCTYPE = re.compile(r"\s*doctype", re.IGNORECASE)
+
+# Elements that never have any content or a closing tag, these are always parsed as self closing tags.
+VOID_ELEMENTS = frozenset(("area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param",
+                           "source", "track", "wbr"))
+
+# Elements whose closing tag may be left out, mapped to the opening tags that close them when they are still open.
+_CLOSES_P = frozenset(("address", "article", "aside", "blockquote", "details", "dialog", "dd", "div", "dl", "dt",
+                       "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+                       "header", "hgroup", "hr", "li", "main", "menu", "nav", "ol", "p", "pre", "section", "table",
+                       "ul"))
+IMPLIED_END_TAGS = {
+    "p": _CLOSES_P,
+    "li": frozenset(("li",)),
+    "dt": frozenset(("dt", "dd")),
+    "dd": frozenset(("dt", "dd")),
+    "option": frozenset(("option", "optgroup")),
+    "tr": frozenset(("tr",)),
+    "td": frozenset(("td", "th", "tr")),
+    "th": frozenset(("td", "th", "tr")),
+}
+
+
+@dataclass(init=False, repr=False, eq=False)
 class HTMLOpeningTagNode:
     """
-    Represents an opening HTML tag.
+    Represents an opening HTML tag. The inner HTML is sliced out of the stream from the end of this tag to the start of
+    its closing tag each time it is read, so no copies of it are held and it always matches the current stream. The
+    fields set while pairing and building a tree can only be given by keyword.
     """
     tag_name: str
     attributes: dict
-    inner_html: str
     cursor_start: Cursor
     cursor_end: Cursor
+    closing_tag: HTMLClosingTagNode = None  # Set when paired.
+    parent: HTMLOpeningTagNode = None  # Only set when building a tree.
+    children: list = None  # Only set when building a tree.
+
+    def __init__(self, tag_name: str, attributes: dict, cursor_start: Cursor, cursor_end: Cursor, *,
+                 closing_tag: HTMLClosingTagNode=None, parent: HTMLOpeningTagNode=None, children: list=None) -> None:
+        self.tag_name = tag_name
+        self.attributes = attributes
+        self.cursor_start = cursor_start
+        self.cursor_end = cursor_end
+        self.closing_tag = closing_tag
+        self.parent = parent
+        self.children = children
+
+    @property
+    def inner_html(self) -> str:
+        """
+        The raw HTML between this tag and its closing tag, ``None`` if it was never closed or the node is not backed by
+        a stream (e.g. when it was made by hand rather than parsed).
+        """
+        if self.closing_tag is None or self.cursor_end is None or self.cursor_end.lines is None: return None
+        return self.cursor_end.lines.stream[self.cursor_end.index + 1 : self.closing_tag.cursor_start.index]
+
+    def text(self, separator: str="", *, collapse_whitespace: bool=False, decode_entities: bool=False) -> str:
+        """
+        The text inside this element without any tags, or the content of ``<script>``/ ``<style>`` elements, see
+        :func:`iter_text` for the options. The text of an element that was never closed runs to where its parent ends
+        (see :func:`_element_end`).
+
+        The nodes inside the element are found through its ``children``, so this is only for the nodes of a tree built
+        with ``build_tree``. :meth:`HTMLTree.get_text` gets the text of any opening tag node.
+        """
+        assert self.children is not None, "Only the nodes of a built tree know their children, see HTMLTree.get_text"
+        stream = self.cursor_end.lines.stream
+        end = _element_end(self, lambda node: node.parent, len(stream))
+        return "".join(iter_text(stream, self._descendants(), self.cursor_end.index + 1, end, separator=separator,
+                                 collapse_whitespace=collapse_whitespace, decode_entities=decode_entities))
+
+    def _descendants(self) -> Iterator:
+        """
+        **For internal use only**
+
+        Yield every node inside this element of a built tree in document order, along with the (not implied) closing
+        tags of the elements inside it.
+        """
+        stack = [(iter(self.children), None)]
+        while stack:
+            child = next(stack[-1][0], None)
+            if child is None:
+                closing_tag = stack.pop()[1]
+                if closing_tag is not None and not closing_tag.implied: yield closing_tag
+                continue
+            yield child
+            if type(child) == HTMLOpeningTagNode: stack.append((iter(child.children), child.closing_tag))
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__: return NotImplemented
+        return (self.tag_name, self.attributes, self.inner_html, self.cursor_start, self.cursor_end) == \
+               (other.tag_name, other.attributes, other.inner_html, other.cursor_start, other.cursor_end)
+
+    def __repr__(self) -> str:
+        return f"HTMLOpeningTagNode(tag_name={self.tag_name!r}, attributes={self.attributes!r}, " \
+               f"inner_html={self.inner_html!r}, cursor_start={self.cursor_start!r}, cursor_end={self.cursor_end!r})"
+
+
+def _element_end(node: HTMLOpeningTagNode, parent_of: Callable, stream_len: int) -> int:
+    """
+    **For internal use only**
+
+    The index in the stream the content of the element ``node`` ends at, the start of its closing tag (or of the tag
+    that implied it). An element that was never closed ends where its parent does, as given by ``parent_of`` (see
+    :class:`_ElementStack`), or at the end of the stream (``stream_len``) at the top level.
+    """
+    element = node
+    while element is not None and element.closing_tag is None: element = parent_of(element)
+    if element is None: return stream_len
+    return max(element.closing_tag.cursor_start.index, node.cursor_end.index + 1)
 
 
 @dataclass
@@ -34,41 +143,284 @@ class HTMLSelfClosingTagNode:
     attributes: dict
     cursor_start: Cursor
     cursor_end: Cursor
+    parent: HTMLOpeningTagNode = field(default=None, repr=False, compare=False)  # Only set when building a tree.
 
 
 @dataclass
 class HTMLClosingTagNode:
     """
-    Represents a closing HTML tag.
+    Represents a closing HTML tag. When a tag is closed by implication (e.g. a ``<p>`` followed by a ``<div>``) its
+    closing tag node is ``implied``, with both cursors at the start of the tag that closed it, and is only referenced
+    by the opening tag node as its ``closing_tag``.
     """
     tag_name: str
     cursor_start: Cursor
     cursor_end: Cursor
+    implied: bool = field(default=False, repr=False)
 
 
-@dataclass
+@dataclass(init=False, repr=False, eq=False)
 class HTMLDoctypeOrCommNode:
     """
-    Represents other HTML tags such as comments and doctype declarations.
+    Represents other HTML tags such as comments and doctype declarations. The raw text is read through the ``!`` token
+    it was parsed from, so it is only sliced out of the stream when it is used. The raw text itself can be given in
+    place of the token (or as ``text_raw``), as it was before nodes kept their tokens, and ``parent`` can only be given
+    by keyword.
     """
-    text_raw: str
+    token: Token
     cursor_start: Cursor
     cursor_end: Cursor
+    parent: HTMLOpeningTagNode = None  # Only set when building a tree.
+
+    def __init__(self, token: Token | str=None, cursor_start: Cursor=None, cursor_end: Cursor=None, *,
+                 parent: HTMLOpeningTagNode=None, text_raw: str=None) -> None:
+        assert (token is None) != (text_raw is None), "Give either the token or the raw text (text_raw) of the node"
+        if token is None: token = text_raw
+        if type(token) == str:  # The raw text, held by a token that is not backed by a stream.
+            cursor = Cursor(cursor_start.index + 1) if cursor_start is not None else None
+            token = Token(TokenTypes.EXCLAMATION, "!", cursor, extra=token)
+        self.token = token
+        self.cursor_start = cursor_start
+        self.cursor_end = cursor_end
+        self.parent = parent
+
+    @property
+    def text_raw(self) -> str:
+        """
+        The raw text of the comment or doctype declaration, everything between the ``<!`` and the closing ``>``.
+        """
+        return self.token.extra
+
+    @property
+    def is_doctype(self) -> bool:
+        """
+        Whether this node is a doctype declaration, checked in place on the stream without slicing the text out.
+        """
+        token = self.token
+        if token.cursor is None or token.cursor.lines is None: return _DOCTYPE.match(token.extra) is not None
+        start = token.cursor.index + 1
+        return _DOCTYPE.match(token.cursor.lines.stream, start, start + token.extra_len) is not None
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__: return NotImplemented
+        return (self.text_raw, self.cursor_start, self.cursor_end) == \
+               (other.text_raw, other.cursor_start, other.cursor_end)
+
+    def __repr__(self) -> str:
+        return f"HTMLDoctypeOrCommNode(text_raw={self.text_raw!r}, cursor_start={self.cursor_start!r}, " \
+               f"cursor_end={self.cursor_end!r})"
 
 
 class NonValidTagIDError(Exception): ...
 class NeverEndedTagError(Exception): ...
 
 
-@dataclass
+class ErrorCodes(Enum):
+    """
+    All of the errors the parser can find, as enum values.
+    """
+    NON_VALID_TAG_ID = auto()
+    NEVER_ENDED_TAG = auto()
+
+
+_ERRORS = {  # The exception class and message template of each error code.
+    ErrorCodes.NON_VALID_TAG_ID: (NonValidTagIDError, "Invalid tag name/ ID '{}'"),
+    ErrorCodes.NEVER_ENDED_TAG: (NeverEndedTagError, "Tag was never ended using a '>' bracket"),
+}
+
+
+class ErrorPolicy(Enum):
+    """
+    What the parser does with the errors it finds.
+
+    ::
+        - COLLECT     =>   Add an error node for each error (up to ``max_errors`` of them, if given)
+        - COUNT       =>   Only count the errors, no error nodes are made
+        - FAIL_FAST   =>   Raise the exception of the first error found
+    """
+    COLLECT = auto()
+    COUNT = auto()
+    FAIL_FAST = auto()
+
+
+@dataclass(init=False)
 class HTMLErrorNode:
     """
-    Represents an erroneous HTML tag (if validation rules fail during parse for valid tags).
+    Represents an erroneous HTML tag (if validation rules fail during parse for valid tags). Only the error code and
+    the value of the token at fault are kept, the message and exception are made from them when they are first read.
+    ``parent`` can only be given by keyword.
     """
-    message: str
+    code: ErrorCodes
+    value: str
     cursor_start: Cursor
     cursor_end: Cursor
-    exception: Exception
+    parent: HTMLOpeningTagNode = field(default=None, repr=False, compare=False)  # Only set when building a tree.
+    _exception: Exception = field(default=None, repr=False, compare=False)
+
+    def __init__(self, code: ErrorCodes, value: str, cursor_start: Cursor, cursor_end: Cursor, *,
+                 parent: HTMLOpeningTagNode=None) -> None:
+        assert type(code) == ErrorCodes, "The error must be given as an ErrorCodes code (no longer as a message)"
+        self.code = code
+        self.value = value
+        self.cursor_start = cursor_start
+        self.cursor_end = cursor_end
+        self.parent = parent
+        self._exception = None
+
+    @property
+    def message(self) -> str:
+        """
+        A message as to what error was encountered.
+        """
+        return _ERRORS[self.code][1].format(self.value)
+
+    @property
+    def exception(self) -> Exception:
+        """
+        The exception for the error (the same instance every time it is read).
+        """
+        if self._exception is None: self._exception = _ERRORS[self.code][0](self.message)
+        return self._exception
+
+
+# Any of the nodes the parser makes.
+HTMLNode = Union[HTMLDoctypeOrCommNode, HTMLOpeningTagNode, HTMLClosingTagNode, HTMLSelfClosingTagNode, HTMLErrorNode]
+
+
+class _TokenWindow:
+    """
+    **For internal use only**
+
+    Stands in for the list of tokens when the parser is fused with the lexer. Tokens are pulled from the lexer one at
+    a time as the parser moves forward and only the current one is kept, so it can only be indexed at the current
+    position or the one after it.
+    """
+    __slots__ = ("__tokens", "__position", "__token")
+
+    def __init__(self, tokens: Iterator[Token]) -> None:
+        self.__tokens = tokens
+        self.__position = 0
+        self.__token = next(tokens)
+
+    def __getitem__(self, index: int) -> Token:
+        if index == self.__position: return self.__token
+        if index != self.__position + 1:
+            raise IndexError("Only the current token and the one after it can be read from a token window")
+        self.__token = next(self.__tokens)
+        self.__position = index
+        return self.__token
+
+
+class _ElementStack:
+    """
+    **For internal use only**
+
+    The stack of open elements the element tree is linked from, fed every node in document order. It is kept apart
+    from the stack tags are paired with (see :meth:`Parser._pair_nodes`), closing an element here also closes every
+    element still open inside it, so each element ends inside of its parent even when its own closing tag comes after
+    (e.g. ``<b>`` in ``<i><b></i></b>``) or it is never closed at all. The pairs, and so ``inner_html``, are the same
+    with and without a tree.
+
+    The count of open elements per name tells straight away if there is one to close at all, so stray closing tags are
+    ignored without scanning the stack and every node is pushed and popped at most once.
+    """
+    def __init__(self) -> None:
+        self.__stack = []
+        self.__counts = {}  # Number of opening tag nodes on the stack by tag name.
+
+    def parent_of(self, node: object) -> HTMLOpeningTagNode | None:
+        """
+        Take in the next ``node`` and return the element it is inside of, ``None`` at the top level (and for closing
+        tags, which are not part of the tree).
+        """
+        stack, counts = self.__stack, self.__counts
+        if type(node) == HTMLClosingTagNode:
+            if not counts.get(node.tag_name): return None  # Nothing open to close.
+            while True:
+                element = stack.pop()
+                counts[element.tag_name] -= 1
+                if element.tag_name == node.tag_name: return None
+
+        if type(node) == HTMLOpeningTagNode:
+            name = node.tag_name.lower()
+            while stack and name in IMPLIED_END_TAGS.get(stack[-1].tag_name.lower(), ()):
+                counts[stack.pop().tag_name] -= 1
+        parent = stack[-1] if stack else None
+        if type(node) == HTMLOpeningTagNode:
+            stack.append(node)
+            counts[node.tag_name] = counts.get(node.tag_name, 0) + 1
+        return parent
+
+
+class _PairingStack:
+    """
+    **For internal use only**
+
+    The stack of opening tag nodes still open while pairing (see :meth:`Parser._pair_nodes`). A closing tag pairs with
+    the innermost open element of the same name even when others are still open inside it, those stay open unless
+    their end may be implied. The open elements of each name are kept apart, so a closing tag finds its match (or that
+    there is none) without scanning the stack. Elements closed inside others are only dropped from the stack once they
+    reach the top, an element is open while it has no ``closing_tag``.
+
+    :param nodes: The opening tag nodes already open, outermost first
+    :type nodes: Iterable, optional
+    """
+    def __init__(self, nodes: Iterable=()) -> None:
+        self.__stack = []
+        self.__positions = {}  # Positions in the stack of the open elements by tag name, innermost last.
+        self.__implied_names = set()  # Tag names of open elements whose end may be implied.
+        for node in nodes: self.__push(node)
+
+    def __iter__(self) -> Iterator[HTMLOpeningTagNode]:
+        return (node for node in self.__stack if node.closing_tag is None)
+
+    def __push(self, node: HTMLOpeningTagNode) -> None:
+        """
+        **For internal use only**
+
+        Push ``node`` as the innermost open element.
+        """
+        name = node.tag_name
+        positions = self.__positions.get(name)
+        if positions is None: positions = self.__positions[name] = []
+        positions.append(len(self.__stack))
+        self.__stack.append(node)
+        if name.lower() in IMPLIED_END_TAGS: self.__implied_names.add(name)
+
+    def __top(self) -> HTMLOpeningTagNode | None:
+        """
+        **For internal use only**
+
+        The innermost open element, dropping the closed ones above it.
+        """
+        stack = self.__stack
+        while stack and stack[-1].closing_tag is not None: stack.pop()
+        return stack[-1] if stack else None
+
+    def open(self, node: HTMLOpeningTagNode) -> None:
+        """
+        Close the innermost open elements that ``node`` ends by implication, then push it.
+        """
+        name, top = node.tag_name.lower(), self.__top()
+        while top is not None and name in IMPLIED_END_TAGS.get(top.tag_name.lower(), ()):
+            self.__positions[top.tag_name].pop()
+            Parser._close_implied(top, node.cursor_start)
+            top = self.__top()
+        self.__push(node)
+
+    def close(self, node: HTMLClosingTagNode) -> None:
+        """
+        Pair ``node`` with the innermost open element of the same name, if any, closing the elements inside of it whose
+        end may be implied.
+        """
+        positions = self.__positions.get(node.tag_name)
+        if not positions: return  # Nothing open to close.
+        position = positions.pop()
+        self.__stack[position].closing_tag = node
+        for name in self.__implied_names:  # Closing a parent also closes the ones that may be left open.
+            positions = self.__positions[name]
+            while positions and positions[-1] > position:
+                Parser._close_implied(self.__stack[positions.pop()], node.cursor_start)
 
 
 class Parser:
@@ -79,6 +431,30 @@ class Parser:
     :param html_stream: A stream of raw HTML code to parse
     :type html_stream: bytes, str
 
+    :param compact_tokens: Lex into a compact :class:`TokenTable` instead of a list of tokens to save memory
+    :type compact_tokens: bool, optional
+
+    :param build_tree: Link the nodes into an element tree while parsing (see :attr:`root_nodes`)
+    :type build_tree: bool, optional
+
+    :param fused: Pull tokens from the lexer one at a time while parsing instead of lexing the whole stream first, so
+        the tokens are never all held at once (see :meth:`iter_nodes`)
+    :type fused: bool, optional
+
+    :param error_policy: What to do with the errors found while parsing, see :class:`ErrorPolicy`
+    :type error_policy: ErrorPolicy, optional
+
+    :param max_errors: The most error nodes to collect, any errors after that are only counted
+    :type max_errors: int, optional
+
+    :param keep: Only keep the tag nodes asked for, by tag name and/ or predicate called with each tag node (see
+        :meth:`iter_nodes`), all other nodes are dropped as soon as they are parsed
+    :type keep: str, Callable, Iterable[str | Callable], optional
+
+    :param decode_entities: Decode the character references (e.g. ``&amp;``) in attribute values, see
+        :func:`decode_entities`
+    :type decode_entities: bool, optional
+
     -------------
     Example Usage
     -------------
@@ -95,13 +471,34 @@ class Parser:
         pretty.pprint(parser._parse_tokens_to_node_list())
 
     """
-    def __init__(self, html_stream: str | bytes) -> None:
+    def __init__(self, html_stream: str | bytes, *, compact_tokens: bool=False, build_tree: bool=False,
+                 fused: bool=False, error_policy: ErrorPolicy=ErrorPolicy.COLLECT, max_errors: int=None,
+                 keep: str | Callable | Iterable[str | Callable]=None, decode_entities: bool=False) -> None:
         assert type(html_stream) == bytes or type(html_stream) == str, "HTML Stream must be bytes string or string"
+        assert not (compact_tokens and fused), "A fused parser does not keep any tokens to make compact"
+        assert type(error_policy) == ErrorPolicy, "The error policy must be one of ErrorPolicy"
+        assert max_errors is None or max_errors >= 0, "The max number of errors can not be negative"
+        assert keep is None or not build_tree, "A tree can not be built from only some of the nodes"
         self.__html_stream = html_stream.decode("utf-8") if type(html_stream) == bytes else html_stream
         self.__lexer = Lexer(self.__html_stream)
-        self.__lexed = self.__lexer.lex()
+        if fused or (keep is not None and not compact_tokens):  # Only some nodes are kept, there is no need for tokens.
+            self.__lexed = _TokenWindow(self.__lexer.iter_tokens())
+        else:
+            self.__lexed = self.__lexer.lex_table() if compact_tokens else self.__lexer.lex()
         self.__index = 0
         self.__tags_list = []
+        self.__root_nodes = [] if build_tree else None
+        self.__open_elements = _ElementStack()  # The elements the next node is inside of, when building a tree.
+        self.__error_policy = error_policy
+        self.__max_errors = 0 if error_policy is ErrorPolicy.COUNT else max_errors
+        self.__error_count = 0
+        self.__keep_names, self.__keep_predicates = None, ()
+        if keep is not None:
+            keep = (keep,) if type(keep) == str or callable(keep) else tuple(keep)
+            assert all(type(item) == str or callable(item) for item in keep), "Only keep tag names or predicates"
+            self.__keep_names = frozenset(item.lower() for item in keep if type(item) == str)
+            self.__keep_predicates = tuple(item for item in keep if callable(item))
+        self.__decode_entities = decode_entities
 
     @property
     def html_raw(self) -> str:
@@ -118,9 +515,10 @@ class Parser:
         return self.__lexer
 
     @property
-    def lexed(self) -> list:
+    def lexed(self) -> list | TokenTable | _TokenWindow:
         """
-        The list of tokens generated by lexing the HTML code stream passed to the parser.
+        The list of tokens generated by lexing the HTML code stream passed to the parser (a :class:`TokenTable` when
+        the parser was created with ``compact_tokens``, or a window over just the current token when ``fused``).
         """
         return self.__lexed
 
@@ -131,6 +529,28 @@ class Parser:
         """
         return self.__tags_list
 
+    @property
+    def root_nodes(self) -> list:
+        """
+        The top level nodes of the element tree, each opening tag node links to its ``parent``, ``children`` and
+        ``closing_tag``. Only built when the parser was created with ``build_tree``, else ``None``.
+        """
+        return self.__root_nodes
+
+    @property
+    def error_count(self) -> int:
+        """
+        The number of errors found while parsing, including any that were not collected as error nodes.
+        """
+        return self.__error_count
+
+    @property
+    def decode_entities(self) -> bool:
+        """
+        Whether the character references in attribute values are decoded.
+        """
+        return self.__decode_entities
+
     @property
     def curr_token(self) -> Token:
         """
@@ -145,7 +565,7 @@ class Parser:
         
         Return current token in the list and then move to the next one.
         """
-        self.__index += 1 if self.__index < len(self.lexed) - 1 else 0
+        if self.lexed[self.__index].type is not TokenTypes.EOF: self.__index += 1  # The EOF token is always last.
         return self.lexed[self.__index]
 
     def _parse_tokens_to_node_list(self, *, debug: bool=False) -> list:
@@ -170,7 +590,92 @@ class Parser:
         :return: ``self.__tags_list``, the list where nodes were stored after the node parse process is complete.
         :rtype: list
         """
-        while self.curr_token.type is not TokenTypes.EOF:
+        if self.__keep_names is not None:  # Dropped nodes still have to be paired, a batch at a time as parsed.
+            stack, nodes = _PairingStack(), self.__parse_tokens()
+            for batch in iter(lambda: list(islice(nodes, 1024)), []):
+                self._pair_nodes(batch, stack)
+                self.__tags_list.extend(node for node in batch if self.__keeps(node))
+            return self.__tags_list
+
+        if self.__root_nodes is None:
+            self.__tags_list.extend(self.__parse_tokens())
+        else:
+            for node in self.__parse_tokens():
+                self.__tags_list.append(node)
+                self.__link_node(node)
+        self._generate_nodes_content()  # Generate content for each node corrosponding with ending tag.
+
+        return self.__tags_list
+
+    def _restore_nodes(self, nodes: list, root_nodes: list, error_count: int) -> list:
+        """
+        **For internal use only**
+
+        Take ``nodes`` that were already parsed from :attr:`html_raw` (e.g. loaded from a cache) in place of parsing
+        the tokens, along with the top level nodes of their tree (if building one) and the number of errors found.
+        """
+        self.__tags_list, self.__error_count = nodes, error_count
+        if self.__root_nodes is not None: self.__root_nodes = root_nodes
+        return nodes
+
+    def iter_nodes(self) -> Iterator:
+        """
+        Lazily parse nodes one at a time. Each node is also appended to :attr:`tag_nodes_list` and paired (or linked
+        into the element tree) as soon as it is parsed, so an opening tag node gets its ``closing_tag`` once that has
+        been yielded too.
+
+        With a ``fused`` parser the tokens are lexed as they are needed, so the first nodes are yielded before the rest
+        of the stream has been lexed.
+
+        When the parser was given tags to ``keep``, only the opening and self closing tag nodes whose tag name (case
+        insensitive) is one of those or that any of the predicates return true for are yielded, along with closing tag
+        nodes for the tag names given. Every tag is still paired, so ``inner_html`` is the same as without ``keep``.
+
+        ::
+
+            parser = Parser("<ul><li>a</li><li>b</li></ul>", fused=True)
+
+            for node in parser.iter_nodes():
+                print(node)
+        """
+        stack = _PairingStack()
+        for node in self.__parse_tokens():
+            self._pair_nodes((node,), stack)
+            if self.__root_nodes is not None: self.__link_node(node)
+            if self.__keep_names is not None and not self.__keeps(node): continue
+            self.__tags_list.append(node)
+            yield node
+
+    def __keeps(self, node: object) -> bool:
+        """
+        **For internal use only**
+
+        Whether ``node`` is one of the nodes the parser was asked to ``keep``.
+        """
+        if type(node) == HTMLClosingTagNode: return node.tag_name.lower() in self.__keep_names
+        if type(node) != HTMLOpeningTagNode and type(node) != HTMLSelfClosingTagNode: return False
+        return node.tag_name.lower() in self.__keep_names or any(keep(node) for keep in self.__keep_predicates)
+
+    def __error(self, code: ErrorCodes, value: str, cursor_start: Cursor, cursor_end: Cursor) -> HTMLErrorNode:
+        """
+        **For internal use only**
+
+        Count an error and return its error node, or ``None`` when the error policy says it should not be collected.
+        """
+        self.__error_count += 1
+        if self.__error_policy is ErrorPolicy.FAIL_FAST:
+            raise HTMLErrorNode(code, value, cursor_start, cursor_end).exception
+        if self.__max_errors is not None and self.__error_count > self.__max_errors: return None
+        return HTMLErrorNode(code, value, cursor_start, cursor_end)
+
+    def __parse_tokens(self, stop: int=sys.maxsize) -> Iterator:
+        """
+        **For internal use only**
+
+        Parse tokens from the current token up until the ``stop`` index (or the ``EOF`` token) and yield the nodes. The
+        parser is always outside of any tag after a ``>`` token, so ``stop`` may be the index after any ``>`` token.
+        """
+        while self.curr_token.type is not TokenTypes.EOF and self.__index < stop:
             # Opened tag.
             if self.curr_token.type is TokenTypes.ANGLE_BRACKET_L:
                 start_cursor = self.curr_token.cursor
@@ -178,86 +683,78 @@ class Parser:
                 if self.__next_token.type not in [TokenTypes.ID,
                                                   TokenTypes.EXCLAMATION,
                                                   TokenTypes.CLOSING_SLASH]: # ERROR NODE: non-valid tag.
-                    tag = HTMLErrorNode(message=f"Invalid tag name/ ID '{self.curr_token.value}'",
-                                        cursor_start=start_cursor,
-                                        cursor_end=self.curr_token.cursor,
-                                        exception=NonValidTagIDError(f"Invalid tag name/ ID '{self.curr_token.value}'"))
-                    self.__tags_list.append(tag)
+                    tag = self.__error(ErrorCodes.NON_VALID_TAG_ID, self.curr_token.value, start_cursor,
+                                       self.curr_token.cursor)
+                    if tag is not None: yield tag
                     continue
 
                 tag = HTMLOpeningTagNode(tag_name=self.curr_token.value,
                                          attributes=None,
-                                         inner_html=None,  # To be generated at a later stage.
                                          cursor_start=start_cursor,
                                          cursor_end=None)
 
                 # Process and validate closing tags.
                 if self.curr_token.type is TokenTypes.CLOSING_SLASH:
-                    end = Cursor(self.curr_token.cursor.index, self.curr_token.cursor.line, self.curr_token.cursor.col)
-                    tok = Token(self.curr_token.type, self.curr_token.value, self.curr_token.cursor)
+                    end, value = self.curr_token.cursor, self.curr_token.value
                     if self.__next_token.type is not TokenTypes.ID: # ERROR NODE: no id for closing tag.
-                        tag = HTMLErrorNode(message=f"Invalid tag name/ ID '{tok.value}'",
-                                            cursor_start=start_cursor,
-                                            cursor_end=end,
-                                            exception=NonValidTagIDError(f"Invalid tag name/ ID '{tok.value}'"))
-                        self.__tags_list.append(tag)
+                        tag = self.__error(ErrorCodes.NON_VALID_TAG_ID, value, start_cursor, end)
+                        if tag is not None: yield tag
                         continue
                     tag = HTMLClosingTagNode(tag_name=self.curr_token.value,
                                              cursor_start=start_cursor,
                                              cursor_end=None)
                 elif self.curr_token.type is TokenTypes.EXCLAMATION:
-                    tag = HTMLDoctypeOrCommNode(text_raw=self.curr_token.extra,
+                    tag = HTMLDoctypeOrCommNode(token=self.curr_token,
                                                 cursor_start=start_cursor,
                                                 cursor_end=None)
 
                 # Process and validate attrs if it is an open tag, not a closing tag.
                 if self.__next_token.type is TokenTypes.ID: 
-                    attrs = {}
+                    attrs, decode = {}, self.__decode_entities
+                    if self.__keep_names is not None and not self.__keep_predicates and \
+                        tag.tag_name.lower() not in self.__keep_names: attrs = None  # Dropped, skip building attrs.
                     while ...:
                         if self.curr_token.type is not TokenTypes.ID: break
                         key = self.curr_token.value
                         if self.__next_token.type is not TokenTypes.ASSIGNMENT: break
                         if self.__next_token.type is not TokenTypes.QUOTE: break
                         value = self.curr_token.value
-                        attrs[key] = value
+                        if decode and "&" in value: value = decode_entities(value, attribute=True)
+                        if attrs is not None: attrs[key] = value
                         self.__next_token
                     tag.attributes = attrs
 
                 # Process and validate the end brace of any tag.
                 if self.curr_token.type is TokenTypes.CLOSING_SLASH: # Convert to selfclosing if ends w '/>'.
                     if self.__next_token.type is not TokenTypes.ANGLE_BRACKET_R:  # ERROR NODE: not closed w '>'.
-                        tag = HTMLErrorNode(message="Tag was never ended using a '>' bracket",
-                                            cursor_start=start_cursor,
-                                            cursor_end=self.curr_token.cursor,
-                                            exception=NeverEndedTagError("Tag was never ended using a '>' bracket"))
-                        self.__tags_list.append(tag)
+                        tag = self.__error(ErrorCodes.NEVER_ENDED_TAG, None, start_cursor, self.curr_token.cursor)
+                        if tag is not None: yield tag
                         continue
                     tag = HTMLSelfClosingTagNode(tag_name=tag.tag_name,
                                                  attributes=tag.attributes,
                                                  cursor_start=tag.cursor_start,
                                                  cursor_end=None)
                 elif self.curr_token.type is not TokenTypes.ANGLE_BRACKET_R:  # ERROR NODE: not closed w '>'.
-                    tag = HTMLErrorNode(message="Tag was never ended using a '>' bracket",
-                                        cursor_start=start_cursor,
-                                        cursor_end=self.curr_token.cursor,
-                                        exception=NeverEndedTagError("Tag was never ended using a '>' bracket"))
-                    self.__tags_list.append(tag)
+                    tag = self.__error(ErrorCodes.NEVER_ENDED_TAG, None, start_cursor, self.curr_token.cursor)
+                    if tag is not None: yield tag
                     continue
 
+                if type(tag) == HTMLOpeningTagNode and tag.tag_name.lower() in VOID_ELEMENTS:  # E.g. '<br>'.
+                    tag = HTMLSelfClosingTagNode(tag_name=tag.tag_name,
+                                                 attributes=tag.attributes,
+                                                 cursor_start=tag.cursor_start,
+                                                 cursor_end=None)
+
                 tag.cursor_end = self.curr_token.cursor
-                self.__tags_list.append(tag)
+                yield tag
 
             else:  # Not starting with '<' so not a tag. Continue to next token.
                 self.__next_token
 
-        self._generate_nodes_content()  # Generate content for each node corrosponding with ending tag.
-
-        return self.__tags_list
-
     def _generate_nodes_content(self) -> None:
         """
-        Match open and closing tags as pairs and return their inner HTML using string slices on the original raw HTML
-        that was passed to the parser.
+        Match open and closing tags as pairs, so that their inner HTML can be sliced out of the raw HTML that was passed
+        to the parser when it is read.
 
         Stack checking for accurate pairing ::
 
@@ -276,21 +773,122 @@ class Parser:
                 # pop the last item on the stack and pair it with the current closing tag node.
                 # Repeat until all pairs are found.
 
-        In the above diagram, the value (2) would not be paired and would be ignored as it is not valid HTML.
+        In the above diagram, the value (2) would not be paired and would be ignored as it is not valid HTML. That is
+        unless the tag's closing tag may be left out (see ``IMPLIED_END_TAGS``) such as ``<p>`` or ``<li>``, these are
+        closed by implication and popped as soon as a tag that ends them is opened or one of their parents is closed, so
+        they never pile up on the stack. The open elements of each name are also kept apart (see
+        :class:`_PairingStack`), so a closing tag finds its match without walking back through the stack, and one with
+        no match costs nothing.
+
+        Tags are paired the same way when building a tree, the tree is linked apart from the pairs (see
+        :class:`_ElementStack`).
         """
-        node_pairs = []  # Store matching valid pairs (tuples)
-        stack = []  # A stack to store opening tags.
+        self._pair_nodes(self.__tags_list)  # Anything left on the stack was never closed.
 
+    def __link_node(self, node: object) -> None:
+        """
+        **For internal use only**
+
+        Link ``node`` into the element tree under the innermost element it is inside of (see :class:`_ElementStack`),
+        closing tags are not part of the tree.
+        """
+        parent = self.__open_elements.parent_of(node)
+        if type(node) == HTMLClosingTagNode: return
+        node.parent = parent
+        (parent.children if parent is not None else self.__root_nodes).append(node)
+        if type(node) == HTMLOpeningTagNode: node.children = []
+
+    def __relink_nodes(self) -> None:
+        """
+        **For internal use only**
+
+        Throw away the pairs and the element tree and pair and link all of the nodes again, in one pass each.
+        """
+        self.__root_nodes, self.__open_elements = [], _ElementStack()
         for node in self.__tags_list:
-            if type(node) == HTMLOpeningTagNode:
-                stack.append(node)
-            elif type(node) == HTMLClosingTagNode:
-                for index, _ in enumerate(stack):
-                    if index < len(stack): index += 1  # Add 1 to the index, avoid mismatches due to -0 index.
-                    else: break  # Save a trailing cycle on each operation.
-                    if stack[-index].tag_name == node.tag_name:
-                        node_pairs.append((stack.pop(-index), node))
-                        break  # Exit after the first matching pair have been found on stack, avoid mismatches.
-
-        for pair in node_pairs:
-            pair[0].inner_html = self.html_raw[pair[0].cursor_end.index + 1 : pair[1].cursor_start.index]
+            if type(node) == HTMLOpeningTagNode: node.closing_tag = None
+        self._pair_nodes(self.__tags_list)
+        for node in self.__tags_list:
+            self.__link_node(node)
+
+    @staticmethod
+    def _close_implied(node: HTMLOpeningTagNode, cursor: Cursor) -> None:
+        """
+        Close ``node`` by implication just in front of the tag starting at ``cursor``.
+        """
+        node.closing_tag = HTMLClosingTagNode(tag_name=node.tag_name, cursor_start=cursor, cursor_end=cursor,
+                                              implied=True)
+
+    @staticmethod
+    def _pair_nodes(nodes: Iterable, stack: _PairingStack=None) -> _PairingStack:
+        """
+        Run the stack pairing described in :meth:`_generate_nodes_content` over ``nodes``, setting the ``closing_tag``
+        of every opening tag node that gets paired.
+
+        :param stack: The opening tag nodes still open before ``nodes``, pairing carries on from this stack
+        :type stack: _PairingStack, optional
+
+        :return: ``stack``, with the opening tag nodes still open after ``nodes``
+        :rtype: _PairingStack
+        """
+        if stack is None: stack = _PairingStack()
+        for node in nodes:
+            if type(node) == HTMLOpeningTagNode: stack.open(node)
+            elif type(node) == HTMLClosingTagNode: stack.close(node)
+        return stack
+
+    def _apply_edit(self, offset: int, removed_len: int, inserted_text: str) -> None:
+        """
+        Replace ``removed_len`` chars at ``offset`` in :attr:`html_raw` with ``inserted_text`` and update
+        :attr:`tag_nodes_list` to match. Only the tokens around the edit are lexed and parsed again (see
+        :meth:`Lexer._edit`), the nodes after it keep their objects and have their cursors shifted along with the
+        tokens they share them with.
+
+        Pairing is run again from the stack of tags still open in front of the edit, and only carries on past the
+        edited region when the stack it ends with differs from the one the old nodes had at that point. When building
+        a tree the whole tree is linked again instead, as that is already a single linear pass.
+        """
+        assert type(self.lexed) == list, "A parser using compact tokens or fused with the lexer can not be edited"
+        assert self.__error_policy is ErrorPolicy.COLLECT and self.__max_errors is None, \
+            "Only a parser collecting all of its errors can be edited"
+        assert self.__keep_names is None, "A parser only keeping some of the nodes can not be edited"
+        nodes = self.__tags_list
+        first, discarded, relexed = self.__lexer._edit(offset, removed_len, inserted_text)
+        self.__html_stream = self.__lexer.stream_raw
+        restart = self.lexed[first - 1].cursor.index + 1 if first > 0 else 0
+
+        # Nodes starting in the re-lexed region are the ones built from the discarded tokens.
+        discarded_cursors = {id(token.cursor) for token in discarded}
+        start = _bisect_index(nodes, restart, lambda node: node.cursor_start.index)
+        end = start
+        while end < len(nodes) and id(nodes[end].cursor_start) in discarded_cursors: end += 1
+        old_nodes = nodes[start:end]
+        self.__index = first
+        new_nodes = list(self.__parse_tokens(first + len(relexed)))
+        nodes[start:end] = new_nodes
+        self.__error_count -= sum(1 for node in old_nodes if type(node) == HTMLErrorNode)
+
+        if self.__root_nodes is not None:
+            self.__relink_nodes()
+            return
+
+        def after_edit(node: HTMLClosingTagNode) -> bool:  # Whether a closing tag is one of the untouched nodes after.
+            return node is not None and node.cursor_start.index >= restart and \
+                id(node.cursor_start) not in discarded_cursors
+
+        stack = [node for node in nodes[:start] if type(node) == HTMLOpeningTagNode and
+                 (node.closing_tag is None or node.closing_tag.cursor_start.index >= restart)]
+        expected_stack = [node for node in stack + old_nodes if type(node) == HTMLOpeningTagNode and
+                          (node.closing_tag is None or after_edit(node.closing_tag))]
+        old_closing_tags = [(node, node.closing_tag) for node in stack]
+        for node in stack: node.closing_tag = None
+
+        stack = self._pair_nodes(new_nodes, _PairingStack(stack))
+        if [id(node) for node in stack] == [id(node) for node in expected_stack]:  # Same stack, same pairs after.
+            for node, closing_tag in old_closing_tags:
+                if node.closing_tag is None and after_edit(closing_tag): node.closing_tag = closing_tag
+        else:
+            trailing = nodes[start + len(new_nodes):]
+            for node in trailing:
+                if type(node) == HTMLOpeningTagNode: node.closing_tag = None
+            self._pair_nodes(trailing, stack)
@@ -0,0 +1,132 @@
+"""
+======================
+HTMLLIB Tree Rewriting
+======================
+
+Keep track of the changes made to a parsed tree as replacements of spans of the stream it was parsed from, so the HTML
+can be written back out by joining the untouched slices of the stream with the rewritten spans in one go. Only the tags
+that were changed are rendered again.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from itertools import count
+from typing import Iterator, NamedTuple
+
+from .lexer import Cursor
+from .parser import HTMLSelfClosingTagNode
+
+
+class ReplacedSpan(NamedTuple):
+    """
+    Stands in for the nodes of a replaced span of the stream, e.g. to leave it out of :func:`iter_text`.
+    """
+    cursor_start: Cursor
+    cursor_end: Cursor
+
+
+def _quote(value: str, escape_ampersands: bool) -> str:
+    """
+    **For internal use only**
+
+    Quote an attribute value, with ``"`` unless it has any of them in it (and no ``'``).
+    """
+    assert type(value) == str, "Attribute values must be strings"
+    if escape_ampersands: value = value.replace("&", "&amp;")
+    if '"' not in value: return f'"{value}"'
+    if "'" not in value: return f"'{value}'"
+    return '"' + value.replace('"', "&quot;") + '"'
+
+
+def render_tag(node: object, stream: str, *, escape_ampersands: bool=False) -> str:
+    """
+    Render the HTML of an opening (or self closing) tag ``node`` parsed from ``stream``, from its current tag name and
+    attributes. A self closing tag keeps the ``/>`` it was written with, if any.
+
+    :param escape_ampersands: Escape each ``&`` in the attribute values, for values that were decoded while parsing
+    :type escape_ampersands: bool, optional
+    """
+    attributes = "".join(f" {key}={_quote(value, escape_ampersands)}"
+                         for key, value in (node.attributes or {}).items())
+    closed = type(node) == HTMLSelfClosingTagNode and \
+        stream[node.cursor_start.index : node.cursor_end.index].rstrip().endswith("/")
+    return f"<{node.tag_name}{attributes}{'/>' if closed else '>'}"
+
+
+class Rewrites:
+    """
+    The spans of a stream that were replaced, as sorted ``(start, end, order, text)`` entries that never overlap. An
+    insertion is an empty span, the insertions at the same index are kept in the order they were made.
+
+    -------------
+    Example Usage
+    -------------
+
+    ::
+
+        rewrites = Rewrites()
+        rewrites.replace(0, 3, "<b>")
+        rewrites.insert(4, "!")
+
+        # Stdout output: <b>a!</i>
+        print(rewrites.splice("<i>a</i>", 0, 8))
+    """
+    def __init__(self) -> None:
+        self.__entries = []
+        self.__order = count()
+
+    def replace(self, start: int, end: int, text: str) -> None:
+        """
+        Replace ``stream[start:end]`` with ``text``. Any rewrites inside the span are dropped, along with the
+        insertions strictly inside it. A replaced span it only partly overlaps is merged into it (keeping its text).
+        """
+        entries = self.__entries
+        first, before, after = bisect_left(entries, (start, start + 1)), "", ""
+        previous = bisect_left(entries, (start,)) - 1
+        if previous >= 0 and entries[previous][1] > start:  # Starts inside an earlier replaced span.
+            first, start, before = previous, entries[previous][0], entries[previous][3]
+        last = first
+        while last < len(entries) and entries[last][0] < end:
+            if entries[last][1] > end: end, after = entries[last][1], entries[last][3]  # Ends inside this one.
+            last += 1
+        entries[first:last] = [(start, end, next(self.__order), before + text + after)]
+
+    def insert(self, index: int, text: str) -> None:
+        """
+        Insert ``text`` at ``index`` of the stream, after anything already inserted there.
+        """
+        entries = self.__entries
+        previous = bisect_left(entries, (index,)) - 1
+        assert previous < 0 or entries[previous][1] <= index, "Can not insert inside a span that has been replaced"
+        insort(entries, (index, index, next(self.__order), text))
+
+    def splice(self, stream: str, start: int, end: int, *, outer: bool=True) -> str:
+        """
+        The HTML of ``stream[start:end]`` with the rewrites made to it, joined together once. Insertions right at
+        ``start`` or ``end`` are left out unless ``outer``.
+        """
+        entries = self.__entries
+        first = bisect_left(entries, (start,) if outer else (start, start + 1))
+        last = bisect_left(entries, (end, end + 1) if outer else (end,))
+        pieces, position = [], start
+        for entry_start, entry_end, _, text in entries[first:last]:
+            pieces.append(stream[position:entry_start])
+            pieces.append(text)
+            position = entry_end
+        pieces.append(stream[position:end])
+        return "".join(pieces)
+
+    def iter_replaced(self, start: int, end: int) -> Iterator[ReplacedSpan]:
+        """
+        Yield the (not empty) replaced spans inside ``stream[start:end]`` in order.
+        """
+        entries = self.__entries
+        for entry_start, entry_end, _, _ in entries[bisect_left(entries, (start,)) : bisect_left(entries, (end,))]:
+            if entry_start < entry_end <= end: yield ReplacedSpan(Cursor(entry_start), Cursor(entry_end - 1))
+
+    def __bool__(self) -> bool:
+        return bool(self.__entries)
+
+    def __len__(self) -> int:
+        return len(self.__entries)
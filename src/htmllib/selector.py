@@ -0,0 +1,334 @@
+"""
+=====================
+HTMLLIB CSS Selectors
+=====================
+
+Compile CSS selectors into matchers that find nodes in an :class:`HTMLTree`. Supported are type (``p``, ``*``), id
+(``#main``), class (``.wide``) and attribute (``[k]``, ``[k=v]``, ``[k^=v]``, ``[k$=v]``, ``[k*=v]``) selectors,
+``:nth-child(an+b)``, the descendant (``div p``) and child (``div > p``) combinators and selector lists (``h1, h2``).
+
+Type selectors are case insensitive, as in HTML, while attribute names are matched as they were written in the HTML
+just like the search methods of :class:`HTMLTree`.
+"""
+
+from __future__ import annotations
+
+import re
+
+from dataclasses import dataclass
+from functools import lru_cache
+from heapq import merge
+from typing import Iterator
+
+
+_CLASS_TOKEN = re.compile(r"[^\t\n\f\r ]+")  # Class names are separated by ASCII whitespace.
+
+_IDENT = re.compile(r"-?[^\W\d][-\w]*")
+_TYPE = re.compile(r"\*|-?[^\W\d][-\w]*")
+_ATTRIBUTE = re.compile(r"\[\s*(-?[^\W\d][-\w]*)\s*(?:([\^$*]?=)\s*(?:\"([^\"]*)\"|'([^']*)'|([-\w]+))\s*)?\]")
+_NTH_CHILD = re.compile(r":nth-child\(\s*([^)]*?)\s*\)", re.IGNORECASE)
+_AN_PLUS_B = re.compile(r"([+-]?\d*)n(?:\s*([+-])\s*(\d+))?|([+-]?\d+)", re.IGNORECASE)
+_COMBINATOR = re.compile(r"\s*([>,])\s*|\s+")
+
+
+class SelectorSyntaxError(ValueError): ...
+
+
+@dataclass
+class _Compound:
+    """
+    **For internal use only**
+
+    The simple selectors that must all match one element, e.g. ``p.wide[title]``.
+    """
+    tag: str = None  # Lower case, ``None`` for any.
+    id: str = None
+    classes: tuple = ()
+    attributes: tuple = ()  # Of (name, operator, value), the operator and value are ``None`` for ``[k]``.
+    nth_child: tuple = ()  # Of (a, b), for ``:nth-child(an+b)``.
+
+    def candidates(self, htmltree: object) -> list:
+        """
+        The element nodes of ``htmltree`` that may match, narrowed down with its indexes, in document order.
+        """
+        if self.id is not None: return htmltree._index_lookup("attr", ("id", self.id))
+        if self.classes: return min((htmltree._index_lookup("class", name) for name in self.classes), key=len)
+        if self.tag is not None: return htmltree._index_lookup("tag", self.tag)
+        return htmltree._element_nodes()
+
+    def matches(self, node: object, positions: dict) -> bool:
+        """
+        Whether the element ``node`` matches, ``positions`` maps the ``id()`` of each element to its position among the
+        elements with the same parent (only needed for ``:nth-child``).
+        """
+        if self.tag is not None and node.tag_name.lower() != self.tag: return False
+        attributes = node.attributes if node.attributes is not None else {}
+        if self.id is not None and attributes.get("id") != self.id: return False
+        if self.classes:
+            if "class" not in attributes: return False
+            tokens = _CLASS_TOKEN.findall(attributes["class"])
+            if not all(name in tokens for name in self.classes): return False
+
+        for name, operator, value in self.attributes:
+            if name not in attributes: return False
+            if operator is None: continue
+            found = attributes[name]
+            if operator == "=":
+                if found != value: return False
+            elif not value: return False  # '^=', '$=' and '*=' never match an empty string.
+            elif operator == "^=":
+                if not found.startswith(value): return False
+            elif operator == "$=":
+                if not found.endswith(value): return False
+            elif value not in found: return False
+
+        for a, b in self.nth_child:
+            position = positions[id(node)]
+            if a == 0:
+                if position != b: return False
+            elif (position - b) % a != 0 or (position - b) // a < 0: return False
+        return True
+
+
+@dataclass
+class _Complex:
+    """
+    **For internal use only**
+
+    A chain of compound selectors joined by combinators, stored from right to left: ``compounds[0]`` matches the
+    elements that are selected and ``combinators[i]`` (``" "`` or ``">"``) joins ``compounds[i]`` to
+    ``compounds[i + 1]``.
+    """
+    compounds: tuple
+    combinators: tuple
+
+    def iter_select(self, htmltree: object) -> Iterator:
+        """
+        Lazily yield the matching element nodes of ``htmltree`` in document order.
+        """
+        subject = self.compounds[0]
+        parents, positions = htmltree._element_structure() if self.structural else ({}, {})
+        for node in subject.candidates(htmltree):
+            if subject.matches(node, positions) and self.__matches_from(node, 1, parents, positions): yield node
+
+    @property
+    def structural(self) -> bool:
+        """
+        Whether matching needs the parents (or positions) of the elements.
+        """
+        return len(self.compounds) > 1 or any(compound.nth_child for compound in self.compounds)
+
+    def matches(self, node: object, parents: dict, positions: dict) -> bool:
+        """
+        Whether the element ``node`` matches, see :meth:`HTMLTree._element_structure` for ``parents`` and
+        ``positions``.
+        """
+        return self.compounds[0].matches(node, positions) and self.__matches_from(node, 1, parents, positions)
+
+    def __matches_from(self, node: object, step: int, parents: dict, positions: dict) -> bool:
+        """
+        **For internal use only**
+
+        Whether the ancestors of ``node`` match the compounds from ``step`` onwards.
+        """
+        if step == len(self.compounds): return True
+        compound, parent = self.compounds[step], parents.get(id(node))
+        if self.combinators[step - 1] == ">":
+            return parent is not None and compound.matches(parent, positions) and \
+                self.__matches_from(parent, step + 1, parents, positions)
+        while parent is not None:
+            if compound.matches(parent, positions) and self.__matches_from(parent, step + 1, parents, positions):
+                return True
+            parent = parents.get(id(parent))
+        return False
+
+
+class Selector:
+    """
+    A compiled CSS selector (list), get one with :func:`compile_selector`.
+
+    :param css: The selector it was compiled from
+    :type css: str
+
+    -------------
+    Example Usage
+    -------------
+
+    ::
+
+        selector = htmllib.compile_selector("ul.menu > li:nth-child(odd) a[href^='https://']")
+
+        for htmltree in trees:
+            print([node.attributes["href"] for node in selector.select(htmltree)])
+    """
+    def __init__(self, css: str) -> None:
+        assert type(css) == str, "You need to provide the selector as a string"
+        self.__css = css
+        self.__groups = _parse_selector(css)
+
+    @property
+    def css(self) -> str:
+        """
+        The selector this was compiled from.
+        """
+        return self.__css
+
+    def select(self, htmltree: object) -> list:
+        """
+        Return the list of element (opening and self closing tag) nodes of ``htmltree`` that match, in document order.
+        """
+        if len(self.__groups) == 1: return list(self.__groups[0].iter_select(htmltree))
+        matched = {}
+        for node in merge(*(group.iter_select(htmltree) for group in self.__groups),
+                          key=lambda node: node.cursor_start.index):
+            matched.setdefault(id(node), node)
+        return list(matched.values())
+
+    def select_one(self, htmltree: object) -> object:
+        """
+        Return the first element node of ``htmltree`` that matches, or ``None`` if none do.
+        """
+        first = None
+        for group in self.__groups:
+            node = next(group.iter_select(htmltree), None)
+            if node is not None and (first is None or node.cursor_start.index < first.cursor_start.index): first = node
+        return first
+
+    @property
+    def _groups(self) -> tuple:
+        """
+        **For internal use only**
+
+        The compiled selectors of the list, one for each comma separated selector.
+        """
+        return self.__groups
+
+    def __repr__(self) -> str:
+        return f"Selector({self.__css!r})"
+
+
+@lru_cache(maxsize=256)
+def compile_selector(css: str) -> Selector:
+    """
+    Compile ``css`` into a :class:`Selector`. The most recently used selectors are cached, so they are only ever
+    parsed once, raises :class:`SelectorSyntaxError` for selectors that are not valid (or not supported).
+    """
+    return Selector(css)
+
+
+def select_many(htmltree: object, queries: dict) -> dict:
+    """
+    Match every selector in ``queries`` (CSS selector strings or compiled :class:`Selector` objects, by name) against
+    the element nodes of ``htmltree`` in a single pass, returning the list of nodes matched by each, by name.
+
+    The selectors are bucketed by the id, class or tag name their elements must have, so each node is only checked
+    against the selectors that could match it instead of against every one of them.
+    """
+    by_id, by_class, by_tag, anywhere = {}, {}, {}, []
+    results, structural = {}, False
+    for name, query in queries.items():
+        selector = query if type(query) == Selector else compile_selector(query)
+        results[name] = []
+        for group in selector._groups:
+            subject, entry = group.compounds[0], (results[name], group)
+            structural = structural or group.structural
+            if subject.id is not None: by_id.setdefault(subject.id, []).append(entry)
+            elif subject.classes: by_class.setdefault(subject.classes[0], []).append(entry)
+            elif subject.tag is not None: by_tag.setdefault(subject.tag, []).append(entry)
+            else: anywhere.append(entry)
+
+    parents, positions = htmltree._element_structure() if structural else ({}, {})
+    for node in htmltree._element_nodes():
+        entries = [*by_tag.get(node.tag_name.lower(), ()), *anywhere]
+        attributes = node.attributes
+        if attributes:
+            if by_id and "id" in attributes: entries.extend(by_id.get(attributes["id"], ()))
+            if by_class and "class" in attributes:
+                for token in dict.fromkeys(_CLASS_TOKEN.findall(attributes["class"])):
+                    entries.extend(by_class.get(token, ()))
+        for matched, group in entries:
+            # A node may match more than one selector of a list, it is only added once.
+            if (not matched or matched[-1] is not node) and group.matches(node, parents, positions):
+                matched.append(node)
+    return results
+
+
+def _parse_selector(css: str) -> tuple:
+    """
+    **For internal use only**
+
+    Parse a selector list into a tuple of :class:`_Complex` selectors.
+    """
+    groups, compounds, combinators = [], [], []
+    pos, end = len(css) - len(css.lstrip()), len(css.rstrip())
+
+    while True:
+        compound, pos = _parse_compound(css, pos)
+        compounds.append(compound)
+        if pos >= end:
+            groups.append(_Complex(tuple(reversed(compounds)), tuple(reversed(combinators))))
+            return tuple(groups)
+        match = _COMBINATOR.match(css, pos)
+        if match is None: raise SelectorSyntaxError(f"Unexpected {css[pos]!r} at {pos} in selector {css!r}")
+        pos = match.end()
+        if match.group(1) == ",":
+            groups.append(_Complex(tuple(reversed(compounds)), tuple(reversed(combinators))))
+            compounds, combinators = [], []
+        else:
+            combinators.append(match.group(1) or " ")
+
+
+def _parse_compound(css: str, pos: int) -> tuple:
+    """
+    **For internal use only**
+
+    Parse the compound selector starting at ``pos``, returning it and the index after it.
+    """
+    tag, tag_id, classes, attributes, nth_child, start = None, None, [], [], [], pos
+    match = _TYPE.match(css, pos)
+    if match is not None:
+        tag = None if match.group() == "*" else match.group().lower()
+        pos = match.end()
+
+    while pos < len(css):
+        char = css[pos]
+        if char == "#" or char == ".":
+            match = _IDENT.match(css, pos + 1)
+            if match is None: break
+            if char == ".": classes.append(match.group())
+            elif tag_id is None: tag_id = match.group()
+            else: attributes.append(("id", "=", match.group()))  # E.g. '#a#b', which can never match.
+        elif char == "[":
+            match = _ATTRIBUTE.match(css, pos)
+            if match is None: break
+            value = next((group for group in match.group(3, 4, 5) if group is not None), None)
+            attributes.append((match.group(1), match.group(2), value))
+        elif char == ":":
+            match = _NTH_CHILD.match(css, pos)
+            if match is None: break
+            nth_child.append(_parse_an_plus_b(match.group(1), css))
+        else:
+            break
+        pos = match.end()
+
+    if pos == start or (pos < len(css) and css[pos] in "#.[:"):
+        raise SelectorSyntaxError(f"Expected a valid selector at {pos} in selector {css!r}")
+    return _Compound(tag, tag_id, tuple(classes), tuple(attributes), tuple(nth_child)), pos
+
+
+def _parse_an_plus_b(argument: str, css: str) -> tuple:
+    """
+    **For internal use only**
+
+    Parse the argument of ``:nth-child()`` into its (a, b) pair, e.g. ``odd`` is (2, 1) and ``-n+3`` is (-1, 3).
+    """
+    argument = argument.lower()
+    if argument == "odd": return 2, 1
+    if argument == "even": return 2, 0
+    match = _AN_PLUS_B.fullmatch(argument)
+    if match is None: raise SelectorSyntaxError(f"Not a valid :nth-child() argument {argument!r} in selector {css!r}")
+    if match.group(4) is not None: return 0, int(match.group(4))
+    a = match.group(1)
+    a = 1 if a in ("", "+") else -1 if a == "-" else int(a)
+    b = int(match.group(3)) if match.group(3) is not None else 0
+    return a, -b if match.group(2) == "-" else b
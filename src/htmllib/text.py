@@ -0,0 +1,88 @@
+"""
+=======================
+HTMLLIB Text Extraction
+=======================
+
+Pull the text out of parsed HTML by walking the spans of the stream between the nodes that were already parsed, so no
+part of the stream is lexed or parsed again. The bodies of ``<script>`` and ``<style>`` elements are skipped.
+"""
+
+from __future__ import annotations
+
+import re
+
+from typing import Iterable, Iterator
+
+from .entities import decode_entities as _decode
+
+
+# Elements whose content is never shown as text.
+SKIPPED_ELEMENTS = frozenset(("script", "style"))
+
+_WHITESPACE = re.compile(r"[\t\n\f\r ]+")
+
+
+def _text_spans(stream: str, nodes: Iterable, start: int, end: int) -> Iterator[str]:
+    """
+    **For internal use only**
+
+    Yield the pieces of ``stream[start:end]`` that are not inside any of ``nodes`` (in document order), leaving out
+    the content of the skipped elements.
+    """
+    position, skip = start, False
+    for node in nodes:
+        node_start = node.cursor_start.index
+        if node_start > position and not skip: yield stream[position:node_start]
+        position = max(position, node.cursor_end.index + 1)
+        # Only opening tag nodes have a closing tag, the content after a skipped one is raw text up to its closing tag.
+        skip = hasattr(node, "closing_tag") and node.tag_name.lower() in SKIPPED_ELEMENTS
+    if end > position and not skip: yield stream[position:end]
+
+
+def _collapse(pieces: Iterable[str]) -> Iterator[str]:
+    """
+    **For internal use only**
+
+    Collapse each run of whitespace across all of ``pieces`` into a single space and strip it from both ends.
+    """
+    pending_space, started = False, False
+    for piece in pieces:
+        piece = _WHITESPACE.sub(" ", piece)
+        if piece.startswith(" "): piece, pending_space = piece[1:], True
+        if not piece: continue
+        if pending_space and started: yield " "  # Only yielded between two pieces of text, so the ends are stripped.
+        pending_space, started = piece.endswith(" "), True
+        yield piece[:-1] if pending_space else piece
+
+
+def iter_text(stream: str, nodes: Iterable, start: int, end: int, *, separator: str="",
+              collapse_whitespace: bool=False, decode_entities: bool=False) -> Iterator[str]:
+    """
+    Lazily yield the text of ``stream[start:end]`` in pieces, taking ``nodes`` to be all the nodes parsed from that
+    part of the stream in document order (e.g. a slice of :attr:`HTMLTree.nodes_list`).
+
+    :param separator: Put between each piece of text (the text between two tags), when given with
+        ``collapse_whitespace`` each piece is stripped and the empty ones are left out
+    :type separator: str, optional
+
+    :param collapse_whitespace: Collapse runs of whitespace into a single space and strip the whitespace at the ends
+    :type collapse_whitespace: bool, optional
+
+    :param decode_entities: Decode the character references in the text, see :func:`decode_entities`
+    :type decode_entities: bool, optional
+    """
+    assert type(separator) == str, "The separator must be a string"
+    pieces = _text_spans(stream, nodes, start, end)
+    if decode_entities: pieces = map(_decode, pieces)
+    if collapse_whitespace and separator: pieces = (_WHITESPACE.sub(" ", piece).strip(" ") for piece in pieces)
+    elif collapse_whitespace: pieces = _collapse(pieces)
+    if not separator:
+        yield from pieces
+        return
+
+    first = True
+    for piece in pieces:
+        if not piece: continue
+        if not first: yield separator
+        first = False
+        yield piece
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+
+
+"""
+=============================
+HTMLLIB Batch Parsing Testing
+=============================
+
+Unit tests for the ``parse_many`` function in htmlib.batch module.
+"""
+
+
+from __future__ import annotations
+
+from src import htmllib
+
+from unittest import TestCase
+
+
+def paragraphs(htmltree: htmllib.HTMLTree) -> list:
+    return [node.inner_html for node in htmltree.search_tags_by_name("p")]
+
+
+class TestBatchMethods(TestCase):
+    def setUp(self) -> None:
+        self.documents = [f"<!-- {index} --><div id='{index}'><p>{index}</p><br><></div>" for index in range(20)]
+
+    def test_parse_many_records(self) -> None:
+        results = list(htmllib.parse_many(self.documents, workers=2, chunksize=3))
+        self.assertEqual(len(results), 20)
+        document, result = self.documents[7], results[7]
+        self.assertIsInstance(result, htmllib.ParsedDocument)
+        self.assertEqual(result.error_count, 1)
+        self.assertEqual([record.kind for record in result.nodes],
+                         [htmllib.HTMLDoctypeOrCommNode, htmllib.HTMLOpeningTagNode, htmllib.HTMLOpeningTagNode,
+                          htmllib.HTMLClosingTagNode, htmllib.HTMLSelfClosingTagNode, htmllib.HTMLErrorNode,
+                          htmllib.HTMLClosingTagNode])
+        comment, div, p = result.nodes[:3]
+        self.assertEqual(comment.text, "-- 7 --")
+        self.assertEqual(div.attributes, {"id": "7"})
+        self.assertEqual(document[div.end + 1 : div.inner_end], "<p>7</p><br><>")
+        self.assertEqual(document[p.end + 1 : p.inner_end], "7")
+        self.assertEqual(result.nodes[5].error, htmllib.ErrorCodes.NON_VALID_TAG_ID)
+        self.assertEqual(result, htmllib.to_records(htmllib.HTMLTree(document)))
+
+    def test_parse_many_query(self) -> None:
+        expected = [[str(index)] for index in range(20)]
+        self.assertEqual(list(htmllib.parse_many(self.documents, workers=2, query=paragraphs, keep="p")), expected)
+        self.assertEqual(list(htmllib.parse_many(self.documents, workers=0, query=paragraphs)), expected)
+        unordered = list(htmllib.parse_many(self.documents, workers=2, chunksize=1, ordered=False, query=paragraphs))
+        self.assertEqual(sorted(unordered), list(enumerate(expected)))
+        self.assertEqual(list(htmllib.parse_many([], workers=2)), [])
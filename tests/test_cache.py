@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+
+"""
+===========================
+HTMLLIB Parse Cache Testing
+===========================
+
+Unit tests for the ``ParseCache`` class in htmlib.cache module.
+"""
+
+
+from __future__ import annotations
+
+import os
+
+from src import htmllib
+
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+
+DEFAULTS = {"build_tree": False, "error_policy": htmllib.ErrorPolicy.COLLECT, "max_errors": None, "keep": None,
+            "decode_entities": False}
+
+
+def tree_shape(nodes: list) -> list:
+    return [(node.tag_name, tree_shape(node.children)) if type(node) == htmllib.HTMLOpeningTagNode else node
+            for node in nodes]
+
+
+class TestParseCacheMethods(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.cache = htmllib.ParseCache(self.temp_dir.name)
+        with open("tests/data/basic.html", "r") as file_obj:
+            self.html = file_obj.read() + "<!-- end --><ul><li>one<li>two</ul><p>unclosed<div></div><></\n>"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def assertSameTree(self, cached: htmllib.HTMLTree, fresh: htmllib.HTMLTree) -> None:
+        self.assertEqual(cached.nodes_list, fresh.nodes_list)
+        self.assertEqual(cached.error_count, fresh.error_count)
+        self.assertEqual(cached.doctypes_raw, fresh.doctypes_raw)
+        self.assertEqual([node.text_raw for node in cached.doctype_or_comment_nodes],
+                         [node.text_raw for node in fresh.doctype_or_comment_nodes])
+        self.assertEqual([node.inner_html for node in cached.opening_tag_nodes],
+                         [node.inner_html for node in fresh.opening_tag_nodes])
+        self.assertEqual([(node.cursor_start.line, node.cursor_end.col) for node in cached.nodes_list],
+                         [(node.cursor_start.line, node.cursor_end.col) for node in fresh.nodes_list])
+        if fresh.root_nodes is not None: self.assertEqual(tree_shape(cached.root_nodes), tree_shape(fresh.root_nodes))
+
+    def test_parse_cache_hit(self) -> None:
+        for options in ({}, {"build_tree": True}, {"keep": ["li", "P"]},
+                        {"keep": "div", "error_policy": htmllib.ErrorPolicy.COUNT}):
+            fresh = self.cache.parse(self.html, **options)
+            misses = self.cache.misses
+            cached = self.cache.parse(self.html.encode("utf-8"), **options)
+            self.assertEqual(self.cache.misses, misses)
+            self.assertSameTree(cached, fresh)
+            self.assertSameTree(cached, htmllib.HTMLTree(self.html, **options))
+        self.assertEqual((self.cache.hits, self.cache.misses), (4, 4))
+
+        self.cache.parse(self.html, fused=True)  # Same nodes as not fused, so the same entry.
+        self.cache.parse(self.html, max_errors=1)
+        self.cache.parse(self.html + " ")
+        self.assertEqual((self.cache.hits, self.cache.misses), (5, 6))
+
+    def test_parse_cache_query_cache_size(self) -> None:
+        for size in (0, 2, 0):  # Parsed, then loaded from the same entry.
+            htmltree = self.cache.parse(self.html, query_cache_size=size)
+            htmltree.search_tags_by_name("li")
+            htmltree.search_tags_by_name("p")
+            htmltree.search_tags_by_name("div")
+            self.assertEqual((htmltree.cache_info().maxsize, htmltree.cache_info().currsize), (size, size))
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 1))
+
+    def test_parse_cache_corrupt_entry(self) -> None:
+        self.cache.parse(self.html)
+        path = os.path.join(self.cache.directory, self.cache.key(self.html, DEFAULTS) + ".htmlc")
+        with open(path, "wb") as file_obj:
+            file_obj.write(b"not a cache entry")
+        self.assertSameTree(self.cache.parse(self.html), htmllib.HTMLTree(self.html))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+        self.assertEqual(self.cache.parse(self.html).error_count, 2)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_parse_cache_eviction(self) -> None:
+        documents = [f"<div id='{index}'>{'<p>text</p>' * 50}</div>" for index in range(4)]
+        self.cache.parse(documents[0])
+        entry_size = sum(entry.stat().st_size for entry in os.scandir(self.cache.directory))
+        self.cache.clear()
+
+        cache = htmllib.ParseCache(self.cache.directory, max_bytes=entry_size * 2 + entry_size // 2)
+        for document in documents[:2]: cache.parse(document)
+        os.utime(os.path.join(cache.directory, cache.key(documents[1], DEFAULTS) + ".htmlc"), (0, 0))
+        cache.parse(documents[0])  # Now more recently used than the second document.
+        cache.parse(documents[2])
+        self.assertEqual(len(os.listdir(cache.directory)), 2)
+        cache.parse(documents[0])
+        cache.parse(documents[2])
+        cache.parse(documents[1])
+        self.assertEqual((cache.hits, cache.misses), (3, 4))
+
+    def test_parse_cache_entry_removed_meanwhile(self) -> None:
+        self.cache.parse(self.html)
+        path = os.path.join(self.cache.directory, self.cache.key(self.html, DEFAULTS) + ".htmlc")
+        scandir = os.scandir
+
+        def scan_then_remove(directory: str) -> list:  # Another process removes the entry after it has been listed.
+            entries = list(scandir(directory))
+            os.remove(path)
+            return entries
+
+        with patch("os.scandir", scan_then_remove):
+            self.assertSameTree(self.cache.parse(self.html + " "), htmllib.HTMLTree(self.html + " "))
+        self.assertEqual(os.listdir(self.cache.directory), [self.cache.key(self.html + " ", DEFAULTS) + ".htmlc"])
+
+    def test_parse_cache_callable_keep(self) -> None:
+        with self.assertRaises(AssertionError):
+            self.cache.parse(self.html, keep=lambda node: True)
@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+
+
+"""
+===============================
+HTMLLIB Entity Decoding Testing
+===============================
+
+Unit tests for the ``decode_entities`` function in htmlib.entities module.
+"""
+
+
+from __future__ import annotations
+
+import html
+
+from src import htmllib
+
+from unittest import TestCase
+
+
+class TestEntitiesMethods(TestCase):
+    def test_decode_entities_fast_path(self) -> None:
+        value = "no references here"
+        self.assertIs(htmllib.decode_entities(value), value)
+        self.assertIs(htmllib.decode_entities(value, attribute=True), value)
+
+    def test_decode_entities_text(self) -> None:
+        for value in ["Fish &amp; Chips", "&#39;&#x27;&#X27;", "&lt;p&gt", "&copy2024", "&notit; &notin;", "&#128;",
+                      "&#0;&#xD800;&#1114112;&#1;", "&#x1F600;", "&nosuchentity; & &#; &#x;", "&NotNestedLessLess;"]:
+            self.assertEqual(htmllib.decode_entities(value), html.unescape(value))
+
+    def test_decode_entities_attribute(self) -> None:
+        self.assertEqual(htmllib.decode_entities("/search?q=1&copy=2&lang=en", attribute=True),
+                         "/search?q=1&copy=2&lang=en")
+        self.assertEqual(htmllib.decode_entities("&ampx &amp &copy; &copy.", attribute=True), "&ampx & © ©.")
+        self.assertEqual(htmllib.decode_entities("&#x27;&quot;", attribute=True), "'\"")
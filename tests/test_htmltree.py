@@ -53,13 +53,19 @@ class TestLexerMethods(TestCase):
         self.assertEqual(self.htmltree_simple.doctypes_raw[1], "Doctype html")
         self.assertEqual(self.htmltree_simple.doctype_raw, "Doctype html")
 
+        htmltree = htmllib.HTMLTree("<!-- <!DOCTYPE old> --><!doctype html><p>a</p><!-- a > b -->")
+        self.assertEqual(htmltree.doctypes_raw, ["doctype html"])
+        self.assertEqual([node.text_raw for node in htmltree.doctype_or_comment_nodes],
+                         ["-- <!DOCTYPE old> --", "doctype html", "-- a > b --"])
+        self.assertEqual(len(htmltree.error_nodes), 0)
+
     def test_htmltree_simple_nodes(self) -> None:
         self.assertNotEqual(self.htmltree_simple.nodes_list, [])
         self.assertEqual(len(self.htmltree_simple.nodes_list), 25)
         self.assertEqual(len(self.htmltree_simple.doctype_or_comment_nodes), 3)
-        self.assertEqual(len(self.htmltree_simple.opening_tag_nodes), 13)
+        self.assertEqual(len(self.htmltree_simple.opening_tag_nodes), 7)
         self.assertEqual(len(self.htmltree_simple.closing_tag_nodes), 7)
-        self.assertEqual(len(self.htmltree_simple.self_closing_tag_nodes), 1)
+        self.assertEqual(len(self.htmltree_simple.self_closing_tag_nodes), 7)  # The <meta> tags are void elements.
         self.assertEqual(len(self.htmltree_simple.error_nodes), 1)
 
         for node in self.htmltree_simple.doctype_or_comment_nodes:
@@ -101,115 +107,109 @@ class TestLexerMethods(TestCase):
         tags_meta = self.htmltree_simple.search_tags_by_attrs({
             "name": "viewport",
             "content": "width=device-width, initial-scale=1.0"
-        })
+        }, self_closing=True)
         tags_p = self.htmltree_simple.search_tags_by_attrs({"class": "second_best", "id": "2nd_p"})
         tags_img_sc = self.htmltree_simple.search_tags_by_attrs({"src": "null", "alt": "null null"}, self_closing=True)
         self.assertRaises(AssertionError, self.htmltree_simple.search_tags_by_attrs, {"Value to Use", "Set"})
         self.assertEqual(len(tags_meta), 3)
         self.assertEqual(len(tags_p), 1)
         self.assertEqual(len(tags_img_sc), 1)
-        self.assertIsInstance(tags_meta[0], htmllib.HTMLOpeningTagNode)
-        self.assertIsInstance(tags_meta[1], htmllib.HTMLOpeningTagNode)
+        self.assertIsInstance(tags_meta[0], htmllib.HTMLSelfClosingTagNode)
+        self.assertIsInstance(tags_meta[1], htmllib.HTMLSelfClosingTagNode)
         self.assertIsInstance(tags_p[0], htmllib.HTMLOpeningTagNode)
         self.assertIsInstance(tags_img_sc[0], htmllib.HTMLSelfClosingTagNode)
-        self.assertIsNone(tags_meta[0].inner_html)
-        self.assertIsNone(tags_meta[1].inner_html)
         self.assertEqual(tags_p[0].inner_html, " I am second best :( ")
 
     def test_htmltree_simple_search_tags_by_exact_attrs(self) -> None:
         tags_meta1 = self.htmltree_simple.search_tags_by_exact_attrs({
             "name": "viewport",
             "content": "width=device-width, initial-scale=1.0"
-        })
-        tags_meta2 = self.htmltree_simple.search_tags_by_exact_attrs({"content": "IE=edge", "http-equiv": "X-UA-Compatible"})
+        }, self_closing=True)
+        tags_meta2 = self.htmltree_simple.search_tags_by_exact_attrs({"content": "IE=edge", "http-equiv": "X-UA-Compatible"},
+                                                                     self_closing=True)
         tags_p = self.htmltree_simple.search_tags_by_exact_attrs({"id": "2nd_p", "class": "second_best"})
         tags_img_sc = self.htmltree_simple.search_tags_by_exact_attrs({"src": "null", "alt": "null null"}, self_closing=True)
         self.assertRaises(AssertionError, self.htmltree_simple.search_tags_by_exact_attrs, {"Value to Use", "Set"})
         self.assertEqual(len(tags_meta1), 2)
         self.assertEqual(len(tags_p), 1)
         self.assertEqual(len(tags_img_sc), 1)
-        self.assertIsInstance(tags_meta1[0], htmllib.HTMLOpeningTagNode)
-        self.assertIsInstance(tags_meta1[1], htmllib.HTMLOpeningTagNode)
+        self.assertIsInstance(tags_meta1[0], htmllib.HTMLSelfClosingTagNode)
+        self.assertIsInstance(tags_meta1[1], htmllib.HTMLSelfClosingTagNode)
         self.assertEqual(tags_meta2, [])
         self.assertIsInstance(tags_p[0], htmllib.HTMLOpeningTagNode)
         self.assertIsInstance(tags_img_sc[0], htmllib.HTMLSelfClosingTagNode)
-        self.assertIsNone(tags_meta1[0].inner_html)
-        self.assertIsNone(tags_meta1[1].inner_html)
         self.assertEqual(tags_p[0].inner_html, " I am second best :( ")
 
     def test_htmltree_simple_search_tags_by_attr(self) -> None:
         tags_lang = self.htmltree_simple.search_tags_by_attr(("lang", "en"))
-        tags_name = self.htmltree_simple.search_tags_by_attr(("name", "viewport"))
+        tags_lang_sc = self.htmltree_simple.search_tags_by_attr(("lang", "en"), self_closing=True)
+        tags_name = self.htmltree_simple.search_tags_by_attr(("name", "viewport"), self_closing=True)
         tags_could_not_find = self.htmltree_simple.search_tags_by_attr(("None", "None"))
         tags_alt_sc = self.htmltree_simple.search_tags_by_attr(("alt", "null null"), self_closing=True)
         self.assertRaises(AssertionError, self.htmltree_simple.search_tags_by_attr, {"Value to Use", "Set"})
-        self.assertEqual(len(tags_lang), 2)
+        self.assertEqual(len(tags_lang), 1)
+        self.assertEqual(len(tags_lang_sc), 1)
         self.assertEqual(len(tags_alt_sc), 1)
         self.assertEqual(tags_could_not_find, [])
         self.assertIsInstance(tags_lang[0], htmllib.HTMLOpeningTagNode)
-        self.assertIsInstance(tags_lang[1], htmllib.HTMLOpeningTagNode)
-        self.assertIsInstance(tags_name[0], htmllib.HTMLOpeningTagNode)
-        self.assertIsInstance(tags_name[1], htmllib.HTMLOpeningTagNode)
+        self.assertIsInstance(tags_lang_sc[0], htmllib.HTMLSelfClosingTagNode)
+        self.assertIsInstance(tags_name[0], htmllib.HTMLSelfClosingTagNode)
+        self.assertIsInstance(tags_name[1], htmllib.HTMLSelfClosingTagNode)
         self.assertIsInstance(tags_alt_sc[0], htmllib.HTMLSelfClosingTagNode)
         self.assertEqual(tags_lang[0].tag_name, "html")
-        self.assertEqual(tags_lang[1].tag_name, "meta")
+        self.assertEqual(tags_lang_sc[0].tag_name, "meta")
         self.assertEqual(tags_name[0].tag_name, "meta")
         self.assertEqual(tags_name[1].tag_name, "meta")
         self.assertEqual(tags_alt_sc[0].tag_name, "img")
 
     def test_htmltree_simple_search_tags_by_attrs_keys(self) -> None:
-        tags_meta = self.htmltree_simple.search_tags_by_attrs_keys(["name", "content"])
+        tags_meta = self.htmltree_simple.search_tags_by_attrs_keys(["name", "content"], self_closing=True)
         tags_p = self.htmltree_simple.search_tags_by_attrs_keys(["class", "id"])
         tags_img_sc = self.htmltree_simple.search_tags_by_attrs_keys(["src", "alt"], self_closing=True)
         self.assertRaises(AssertionError, self.htmltree_simple.search_tags_by_attrs_keys, "Value to Use Str")
         self.assertEqual(len(tags_meta), 4)
-        self.assertIsInstance(tags_meta[0], htmllib.HTMLOpeningTagNode)
-        self.assertIsInstance(tags_meta[1], htmllib.HTMLOpeningTagNode)
-        self.assertIsInstance(tags_meta[2], htmllib.HTMLOpeningTagNode)
-        self.assertIsInstance(tags_meta[3], htmllib.HTMLOpeningTagNode)
+        self.assertIsInstance(tags_meta[0], htmllib.HTMLSelfClosingTagNode)
+        self.assertIsInstance(tags_meta[1], htmllib.HTMLSelfClosingTagNode)
+        self.assertIsInstance(tags_meta[2], htmllib.HTMLSelfClosingTagNode)
+        self.assertIsInstance(tags_meta[3], htmllib.HTMLSelfClosingTagNode)
         self.assertIsInstance(tags_p[0], htmllib.HTMLOpeningTagNode)
         self.assertIsInstance(tags_img_sc[0], htmllib.HTMLSelfClosingTagNode)
-        self.assertIsNone(tags_meta[0].inner_html)
-        self.assertIsNone(tags_meta[1].inner_html)
-        self.assertIsNone(tags_meta[2].inner_html)
-        self.assertIsNone(tags_meta[3].inner_html)
         self.assertEqual(tags_p[0].inner_html, " I am second best :( ")
 
     def test_htmltree_simple_search_tags_by_exact_attrs_keys(self) -> None:
-        tags_meta1 = self.htmltree_simple.search_tags_by_exact_attrs_keys(["name", "content"])
+        tags_meta1 = self.htmltree_simple.search_tags_by_exact_attrs_keys(["name", "content"], self_closing=True)
         tags_p = self.htmltree_simple.search_tags_by_exact_attrs_keys(["class", "id"])
         tags_img_sc = self.htmltree_simple.search_tags_by_exact_attrs_keys(["src", "alt"], self_closing=True)
         self.assertRaises(AssertionError, self.htmltree_simple.search_tags_by_exact_attrs_keys, "Value to Use Str")
         self.assertEqual(len(tags_meta1), 3)
         self.assertEqual(len(tags_p), 0)
-        self.assertIsInstance(tags_meta1[0], htmllib.HTMLOpeningTagNode)
-        self.assertIsInstance(tags_meta1[1], htmllib.HTMLOpeningTagNode)
-        self.assertIsInstance(tags_meta1[2], htmllib.HTMLOpeningTagNode)
+        self.assertIsInstance(tags_meta1[0], htmllib.HTMLSelfClosingTagNode)
+        self.assertIsInstance(tags_meta1[1], htmllib.HTMLSelfClosingTagNode)
+        self.assertIsInstance(tags_meta1[2], htmllib.HTMLSelfClosingTagNode)
         self.assertEqual(tags_p, [])
         self.assertIsInstance(tags_img_sc[0], htmllib.HTMLSelfClosingTagNode)
-        self.assertIsNone(tags_meta1[0].inner_html)
-        self.assertIsNone(tags_meta1[1].inner_html)
-        self.assertIsNone(tags_meta1[2].inner_html)
 
     def test_htmltree_simple_search_tags_by_attr_key(self) -> None:
         tags_lang = self.htmltree_simple.search_tags_by_attr_key("lang")
-        tags_name = self.htmltree_simple.search_tags_by_attr_key("name")
+        tags_lang_sc = self.htmltree_simple.search_tags_by_attr_key("lang", self_closing=True)
+        tags_name = self.htmltree_simple.search_tags_by_attr_key("name", self_closing=True)
         tags_could_not_find = self.htmltree_simple.search_tags_by_attr_key("None")
         tags_alt_sc = self.htmltree_simple.search_tags_by_attr_key(("alt"), self_closing=True)
         self.assertRaises(AssertionError, self.htmltree_simple.search_tags_by_attr_key, ["Value to Use List"])
         self.assertEqual(tags_could_not_find, [])
-        self.assertEqual(len(tags_lang), 2)
+        self.assertEqual(len(tags_lang), 1)
+        self.assertEqual(len(tags_lang_sc), 1)
         self.assertEqual(len(tags_name), 4)
         self.assertEqual(len(tags_alt_sc), 1)
         self.assertIsInstance(tags_lang[0], htmllib.HTMLOpeningTagNode)
-        self.assertIsInstance(tags_lang[1], htmllib.HTMLOpeningTagNode)
-        self.assertIsInstance(tags_name[0], htmllib.HTMLOpeningTagNode)
-        self.assertIsInstance(tags_name[1], htmllib.HTMLOpeningTagNode)
-        self.assertIsInstance(tags_name[2], htmllib.HTMLOpeningTagNode)
-        self.assertIsInstance(tags_name[3], htmllib.HTMLOpeningTagNode)
+        self.assertIsInstance(tags_lang_sc[0], htmllib.HTMLSelfClosingTagNode)
+        self.assertIsInstance(tags_name[0], htmllib.HTMLSelfClosingTagNode)
+        self.assertIsInstance(tags_name[1], htmllib.HTMLSelfClosingTagNode)
+        self.assertIsInstance(tags_name[2], htmllib.HTMLSelfClosingTagNode)
+        self.assertIsInstance(tags_name[3], htmllib.HTMLSelfClosingTagNode)
         self.assertIsInstance(tags_alt_sc[0], htmllib.HTMLSelfClosingTagNode)
         self.assertEqual(tags_lang[0].tag_name, "html")
-        self.assertEqual(tags_lang[1].tag_name, "meta")
+        self.assertEqual(tags_lang_sc[0].tag_name, "meta")
         self.assertEqual(tags_name[0].tag_name, "meta")
         self.assertEqual(tags_name[1].tag_name, "meta")
         self.assertEqual(tags_name[0].tag_name, "meta")
@@ -231,3 +231,206 @@ class TestLexerMethods(TestCase):
         self.assertEqual(len(tags_class), 1)
         self.assertEqual(tags_class[0].tag_name, "p")
         self.assertEqual(tags_class[0].inner_html, " I am second best :( ")
+
+    def test_htmltree_keep(self) -> None:
+        htmltree = htmllib.HTMLTree(self.htmltree_simple.html_stream, keep="P")
+        self.assertEqual([node.tag_name for node in htmltree.nodes_list], ["p", "p", "p", "p"])
+        self.assertEqual(len(htmltree.closing_tag_nodes), 2)
+        self.assertEqual(htmltree.search_tags_by_id("2nd_p")[0].inner_html, " I am second best :( ")
+
+        keep = ["h1", lambda node: node.attributes is not None and "alt" in node.attributes]
+        htmltree = htmllib.HTMLTree(self.htmltree_simple.html_stream, keep=keep)
+        self.assertEqual([node.tag_name for node in htmltree.nodes_list], ["h1", "h1", "img"])
+        self.assertEqual(htmltree.search_tags_by_name("h1")[0].inner_html, "Hello, World!")
+        self.assertEqual(htmltree.doctypes_raw, [])
+        self.assertEqual(htmltree.error_count, 1)
+
+        htmltree = htmllib.HTMLTree("<div><p>a<div>b</div></div>", keep=["p"])  # '<div>' still ends the '<p>'.
+        self.assertEqual(htmltree.opening_tag_nodes[0].inner_html, "a")
+        self.assertIsNone(htmltree.opening_tag_nodes[0].attributes)
+        self.assertRaises(AssertionError, htmltree.apply_edit, 0, 0, "<p>")
+        self.assertRaises(AssertionError, htmllib.HTMLTree, "<p>", keep=["p"], build_tree=True)
+
+    def test_htmltree_apply_edit(self) -> None:
+        stream = self.htmltree_simple.html_stream
+        offset = stream.index("Hello, World!")
+        self.htmltree_simple.apply_edit(offset, len("Hello"), "<b>Goodbye</b>")
+        edited = stream[:offset] + "<b>Goodbye</b>" + stream[offset + len("Hello"):]
+        rebuilt = htmllib.HTMLTree(edited)
+        self.assertEqual(self.htmltree_simple.html_stream, edited)
+        self.assertEqual(len(self.htmltree_simple.nodes_list), len(rebuilt.nodes_list))
+        self.assertEqual(self.htmltree_simple.search_tags_by_name("h1")[0].inner_html, "<b>Goodbye</b>, World!")
+        self.assertEqual(self.htmltree_simple.search_tags_by_name("b")[0].inner_html, "Goodbye")
+        for node, rebuilt_node in zip(self.htmltree_simple.nodes_list, rebuilt.nodes_list):
+            self.assertEqual(type(node), type(rebuilt_node))
+            self.assertEqual(node.cursor_start, rebuilt_node.cursor_start)
+            self.assertEqual(node.cursor_end, rebuilt_node.cursor_end)
+        self.assertEqual(self.htmltree_simple.search_tags_by_id("2nd_p")[0].inner_html, " I am second best :( ")
+
+    def test_htmltree_apply_edit_repairs(self) -> None:
+        htmltree = htmllib.HTMLTree("<div><p>a</p><p>b</p></div>")
+        htmltree.apply_edit(len("<div><p>a"), len("</p>"), "")  # Remove the first closing '</p>'.
+        self.assertEqual(htmltree.html_stream, "<div><p>a<p>b</p></div>")
+        self.assertEqual([node.inner_html for node in htmltree.opening_tag_nodes], ["<p>a<p>b</p>", "a", "b"])
+        htmltree.apply_edit(0, 0, "<!DOCTYPE html>")
+        self.assertEqual(htmltree.doctype_raw, "DOCTYPE html")
+        self.assertEqual(htmltree.opening_tag_nodes[0].cursor_start.index, len("<!DOCTYPE html>"))
+        self.assertRaises(AssertionError, htmltree.apply_edit, 0, 1000, "")
+        htmltree.apply_edit(0, 0, "<>")
+        self.assertEqual(htmltree.error_count, len(htmltree.error_nodes))
+        self.assertEqual(htmllib.HTMLTree("<><>", max_errors=1).error_count, 2)
+
+    def test_htmltree_search_indexes(self) -> None:
+        stream = "<div id='a' class='x'><p id='b'>1</p><img src='i.png'/><p class='x'>2</p></div><br id='a'/>"
+        for htmltree in (htmllib.HTMLTree(stream), htmllib.HTMLTree(stream, build_indexes=True)):
+            self.assertEqual([node.inner_html for node in htmltree.search_tags_by_name("p")], ["1", "2"])
+            self.assertEqual([node.tag_name for node in htmltree.search_tags_by_class("x")], ["div", "p"])
+            self.assertEqual([node.tag_name for node in htmltree.search_tags_by_id("a")], ["div"])
+            self.assertEqual([node.tag_name for node in htmltree.search_tags_by_id("a", self_closing=True)], ["br"])
+            self.assertEqual(len(htmltree.search_tags_by_attr_key("id")), 2)
+            self.assertEqual(htmltree.search_tags_by_attr(("id", "c")), [])
+            htmltree.search_tags_by_name("p").clear()  # Results are copies, the index is left as it is.
+            self.assertEqual(len(htmltree.search_tags_by_name("p")), 2)
+
+            htmltree.apply_edit(len("<div id='a' class='x'><p id='"), 1, "c")
+            self.assertEqual(htmltree.search_tags_by_attr(("id", "b")), [])
+            self.assertEqual(htmltree.search_tags_by_attr(("id", "c"))[0].inner_html, "1")
+
+    def test_htmltree_search_by_class_tokens(self) -> None:
+        htmltree = htmllib.HTMLTree("<div class='main  wide'><p class='main'>a</p><p class='wide\tmain main'>b</p>"
+                                    "<p class='Main'>c</p><p class='mainwide'>d</p></div><hr class='wide'/>")
+        self.assertEqual([node.tag_name for node in htmltree.search_tags_by_class("main")], ["div", "p", "p"])
+        self.assertEqual([node.tag_name for node in htmltree.search_tags_by_class(["wide", "main"])], ["div", "p"])
+        self.assertEqual([node.inner_html for node in htmltree.search_tags_by_class(" main wide ")][1], "b")
+        self.assertEqual(htmltree.search_tags_by_class(["main", "missing"]), [])
+        self.assertEqual(htmltree.search_tags_by_class(""), [])
+        self.assertEqual(len(htmltree.search_tags_by_class("wide", self_closing=True)), 1)
+
+    def test_htmltree_iter_and_find_first(self) -> None:
+        htmltree = htmllib.HTMLTree("<p id='a' class='x'>1</p><p class='x y'>2</p><img class='x' src='i'/><p>3</p>")
+        found = htmltree.iter_tags_by_name("p")
+        self.assertEqual(next(found).inner_html, "1")
+        self.assertEqual([node.inner_html for node in found], ["2", "3"])
+        self.assertEqual([node.inner_html for node in htmltree.iter_tags_by_class("y x")], ["2"])
+        self.assertEqual(len(list(htmltree.iter_tags_by_attr_key("class", self_closing=True))), 1)
+        self.assertEqual(htmltree.find_first_tag_by_class("x").inner_html, "1")
+        self.assertEqual(htmltree.find_first_tag_by_exact_attrs_keys(["class"]).inner_html, "2")
+        self.assertIsNone(htmltree.find_first_tag_by_id("missing"))
+        self.assertEqual(htmltree.find_first_tag_by_attr(("src", "i"), self_closing=True).tag_name, "img")
+        self.assertEqual([node.inner_html for node in htmltree.search_tags_by_class("x", limit=1)], ["1"])
+        self.assertEqual(len(htmltree.search_tags_by_name("p", limit=2)), 2)
+        self.assertEqual(htmltree.search_tags_by_attr_key("id", limit=0), [])
+        self.assertRaises(AssertionError, htmltree.search_tags_by_name, "p", limit=-1)
+
+    def test_htmltree_lazy(self) -> None:
+        stream = "<!DOCTYPE html><title>T</title><p id='a'>1<p>2</p><div><p class='x'>3</p></div><><br/>"
+        htmltree = htmllib.HTMLTree(stream, lazy=True)
+        parsed = htmltree._HTMLTree__parser_obj.tag_nodes_list
+        self.assertEqual(parsed, [])  # Nothing is parsed up front.
+        self.assertEqual(htmltree.find_first_tag_by_name("title").inner_html, "T")
+        self.assertEqual(len(parsed), 3)  # Up to the closing '</title>'.
+        self.assertEqual(htmltree.find_first_tag_by_id("a").inner_html, "1")  # Closed by the next '<p>'.
+        self.assertEqual(len(parsed), 5)
+        self.assertEqual([node.inner_html for node in htmltree.iter_tags_by_class("x")], ["3"])
+        self.assertEqual(htmltree.doctype_raw, "DOCTYPE html")
+        self.assertEqual(htmltree.error_count, 1)
+        self.assertEqual(htmltree.nodes_list, htmllib.HTMLTree(stream).nodes_list)
+        self.assertEqual(len(htmltree.search_tags_by_name("p")), 3)
+        self.assertRaises(AssertionError, htmltree.apply_edit, 0, 0, "")
+
+        stream = "<p id='a'>1</p><><p class='x'>2</p>"
+        htmltree = htmllib.HTMLTree(stream, lazy=True, error_policy=htmllib.ErrorPolicy.FAIL_FAST)
+        self.assertEqual(htmltree.find_first_tag_by_id("a").inner_html, "1")  # Found before the error.
+        self.assertRaises(htmllib.NonValidTagIDError, htmltree.find_first_tag_by_class, "x")
+        self.assertRaises(htmllib.NonValidTagIDError, htmltree.find_first_tag_by_class, "x")  # Not a partial result.
+        self.assertRaises(htmllib.NonValidTagIDError, htmltree.search_tags_by_name, "p")
+        self.assertRaises(htmllib.NonValidTagIDError, lambda: htmltree.nodes_list)
+        self.assertRaises(htmllib.NonValidTagIDError, htmltree.get_text)
+
+    def test_htmltree_query_cache(self) -> None:
+        htmltree = htmllib.HTMLTree("<!DOCTYPE html><p class='x'>1</p><p class='x' id='a'>2</p>", query_cache_size=2)
+        found = htmltree.search_tags_by_class("x")
+        found.clear()  # Changing a result does not change the cached one.
+        self.assertEqual(len(htmltree.search_tags_by_class("x")), 2)
+        self.assertEqual(htmltree.search_tags_by_attrs({"id": "a"}), htmltree.search_tags_by_attrs({"id": "a"}))
+        self.assertEqual(htmltree.select("p.x")[1].inner_html, "2")
+        self.assertEqual(tuple(htmltree.cache_info()), (2, 3, 2, 2))
+        self.assertEqual(len(htmltree.search_tags_by_class("x")), 2)  # Dropped as the least recently used.
+        self.assertEqual(htmltree.cache_info().misses, 4)
+        self.assertIs(htmltree.doctype_raw, htmltree.doctype_raw)
+
+        htmltree.apply_edit(len("<!DOCTYPE html>"), 0, "<p class='x'>0</p>")
+        self.assertEqual(htmltree.cache_info().currsize, 0)
+        self.assertEqual([node.inner_html for node in htmltree.search_tags_by_class("x")], ["0", "1", "2"])
+        self.assertEqual(htmltree.get_text(), "012")
+        htmltree.cache_clear()
+        self.assertEqual(tuple(htmltree.cache_info()), (0, 0, 2, 0))
+
+    def test_htmltree_rewrite(self) -> None:
+        stream = "<div class='ad x'><img src='t.gif'/></div><p id='a'>Hi <b>there</b></p><script>track()</script>"
+        htmltree = htmllib.HTMLTree(stream, build_tree=True, build_indexes=True)
+        div, p, script = htmltree.root_nodes
+        self.assertEqual(htmltree.search_tags_by_class("x"), [div])  # Fill the query cache.
+
+        htmltree.set_attribute(p, "class", "x")
+        htmltree.remove_attribute(div, "class")
+        htmltree.remove_attribute(div, "missing")
+        self.assertEqual(htmltree.search_tags_by_class("x"), [p])
+        self.assertEqual(htmltree.search_tags_by_attr_key("class"), [p])
+        self.assertIsNone(div.attributes)
+
+        htmltree.remove_node(script)
+        htmltree.replace_node(p.children[0], "<i>you</i>")
+        self.assertEqual(htmltree.root_nodes, [div, p])
+        self.assertEqual(p.children, [])
+        self.assertEqual(htmltree.search_tags_by_name("b"), [])
+        self.assertEqual(len(htmltree.opening_tag_nodes), 2)
+        self.assertEqual(htmltree.select("p *"), [])
+        self.assertEqual(htmltree.get_text(), "Hi ")
+
+        htmltree.insert_html(div, "<!-- ad -->", "afterbegin")
+        htmltree.insert_html(p, "<hr>", "beforebegin")
+        htmltree.insert_html(p, "!", "beforeend")
+        self.assertEqual(htmltree.serialize(p), '<p id="a" class="x">Hi <i>you</i>!</p>')
+        self.assertEqual(htmltree.serialize(), "<div><!-- ad --><img src='t.gif'/></div><hr>" +
+                         htmltree.serialize(p))
+        self.assertEqual(htmltree.html_stream, stream)  # The nodes still read the stream they were parsed from.
+        self.assertRaises(AssertionError, htmltree.set_attribute, script, "a", "b")
+        self.assertRaises(AssertionError, htmltree.insert_html, p, "", "inside")
+        self.assertRaises(AssertionError, htmltree.apply_edit, 0, 0, "")
+
+        htmltree = htmllib.HTMLTree("<a href='/?a=1&amp;b=2'>x</a>", decode_entities=True)
+        htmltree.set_attribute(htmltree.nodes_list[0], "title", "&")
+        self.assertEqual(htmltree.serialize(), '<a href="/?a=1&amp;b=2" title="&amp;">x</a>')
+
+    def test_htmltree_rewrite_unclosed(self) -> None:
+        stream = '<div><span class="ad">x</div><p>after</p><footer>f</footer>'
+        rest = "<p>after</p><footer>f</footer>"
+        for build_tree in (False, True):
+            rewrites = [(lambda htmltree, span: htmltree.remove_node(span), "<div></div>" + rest),
+                        (lambda htmltree, span: htmltree.replace_node(span, "<i>y</i>"), "<div><i>y</i></div>" + rest),
+                        (lambda htmltree, span: htmltree.insert_html(span, "!", "beforeend"),
+                         '<div><span class="ad">x!</div>' + rest),
+                        (lambda htmltree, span: htmltree.insert_html(span, "!", "afterend"),
+                         '<div><span class="ad">x!</div>' + rest)]
+            for rewrite, expected in rewrites:
+                htmltree = htmllib.HTMLTree(stream, build_tree=build_tree)
+                span, = htmltree.search_tags_by_name("span")
+                self.assertEqual(htmltree.serialize(span), '<span class="ad">x')  # Ends with '<div>'.
+                rewrite(htmltree, span)
+                self.assertEqual(htmltree.serialize(), expected)
+                self.assertEqual([node.tag_name for node in htmltree.opening_tag_nodes][-2:], ["p", "footer"])
+
+    def test_htmltree_build_tree(self) -> None:
+        htmltree = htmllib.HTMLTree("<div><p>a</p><p>b</div>", build_tree=True)
+        self.assertIsNone(self.htmltree_simple.root_nodes)
+        div, = htmltree.root_nodes
+        self.assertEqual([node.inner_html for node in div.children], ["a", "b"])  # '</div>' implies '</p>'.
+        self.assertEqual(div.inner_html, "<p>a</p><p>b")
+
+        htmltree.apply_edit(len("<div><p>a</p><p>b"), 0, "</p><br/>")
+        div, = htmltree.root_nodes
+        self.assertEqual([node.tag_name for node in div.children], ["p", "p", "br"])
+        self.assertEqual(div.children[1].inner_html, "b")
+        self.assertIs(div.children[2].parent, div)
+        self.assertEqual(htmltree.nodes_list, htmllib.HTMLTree(htmltree.html_stream).nodes_list)
@@ -156,4 +156,172 @@ class TestLexerMethods(TestCase):
         self.assertEqual((self.lexed_cursors_pos[26].cursor.line, self.lexed_cursors_pos[26].cursor.col), (12, 22))
         self.assertEqual((self.lexed_cursors_pos[29].cursor.line, self.lexed_cursors_pos[29].cursor.col), (12, 28))
 
+    def test_cursors_resolved_lazily(self) -> None:
+        """
+        Cursors only hold an index, line and column are looked up in the lexer's shared line index when read.
+        """
+        lexer = htmllib.Lexer("<html>\n  <head>\n</html>")
+        tokens = lexer.lex()
+        self.assertIs(tokens[3].cursor.lines, lexer.lines)
+        self.assertEqual(lexer.lines.line_col(0), (1, 1))
+        self.assertEqual(lexer.lines.line_col(9), (2, 3))
+        self.assertEqual((tokens[3].cursor.index, tokens[3].cursor.line, tokens[3].cursor.col), (9, 2, 3))
+        self.assertEqual((tokens[-1].cursor.line, tokens[-1].cursor.col), (3, 8))
+
     #endregion (token cursror positions)
+
+    #region (streaming)
+
+    def test_iter_tokens_chunked(self) -> None:
+        """
+        Tokens streamed from small chunks must match the ones lexed from the whole stream, including positions.
+        """
+        stream = self.lexer_cursors_pos.stream_raw
+        chunks = [stream[i : i + 7] for i in range(0, len(stream), 7)]
+        streamed = list(htmllib.Lexer(chunks).iter_tokens())
+        self.assertIsNone(htmllib.Lexer(chunks).stream_raw)
+        self.assertEqual(len(streamed), len(self.lexed_cursors_pos))
+        for streamed_token, token in zip(streamed, self.lexed_cursors_pos):
+            self.assertEqual(streamed_token, token)
+
+        lexer = htmllib.Lexer(iter(chunks))
+        self.assertRaises(AssertionError, lambda: lexer.stream)
+        self.assertRaises(AssertionError, lexer.get_char, 0)
+        self.assertEqual(list(lexer.iter_tokens()), streamed)  # The chunks were not read by either of them.
+
+    def test_iter_tokens_file_like(self) -> None:
+        """
+        The ``<style>`` body in the test page is longer than a chunk so it is streamed as several content tokens.
+        """
+        with open("tests/data/basic.html", "rb") as file_obj:
+            streamed = list(htmllib.Lexer(file_obj).iter_tokens(chunk_size=16))
+        with open("tests/data/basic.html", "rb") as file_obj:
+            lexed = htmllib.Lexer(file_obj.read()).lex()
+        merged = []
+        for token in streamed:
+            if token.type is htmllib.TokenTypes.CONTENT and merged[-1].type is htmllib.TokenTypes.CONTENT:
+                merged[-1] = type(token)(token.type, merged[-1].value + token.value, merged[-1].cursor)
+            else:
+                merged.append(token)
+        self.assertGreater(len(streamed), len(merged))
+        self.assertEqual(merged, lexed)
+        self.assertEqual(streamed[-1].type, htmllib.TokenTypes.EOF)
+
+    #endregion (streaming)
+
+    #region (token table)
+
+    def test_lex_table(self) -> None:
+        """
+        Every row of a token table must read back the same as the matching token from :meth:`Lexer.lex`.
+        """
+        table = htmllib.Lexer(self.lexer_cursors_pos.stream_raw).lex_table()
+        self.assertIsInstance(table, htmllib.TokenTable)
+        self.assertEqual(len(table), len(self.lexed_cursors_pos))
+        for view, token in zip(table, self.lexed_cursors_pos):
+            self.assertEqual(view.type, token.type)
+            self.assertEqual(view.value, token.value)
+            self.assertEqual(view.cursor, token.cursor)
+            self.assertEqual(view.extra, token.extra)
+            self.assertEqual(view.to_token(), token)
+        self.assertEqual(table[-1].type, htmllib.TokenTypes.EOF)
+        self.assertRaises(IndexError, table.__getitem__, len(table))
+
+    #endregion (token table)
+
+    #region (scanner)
+
+    def test_scanner_unterminated_tags(self) -> None:
+        """
+        A tag or quoted value cut off by the end of the stream keeps what was scanned of it, and the ``EOF`` token is
+        one past the last char (the per char loop left its column one short).
+        """
+        for stream, values in [("<div", ["<", "div", "EOF"]), ("<div id='a", ["<", "div", "id", "=", "a", "EOF"]),
+                               ("<p>a<", ["<", "p", ">", "<", "EOF"])]:
+            tokens = htmllib.Lexer(stream).lex()
+            self.assertEqual([token.value for token in tokens], values)
+            self.assertEqual((tokens[-1].cursor.index, tokens[-1].cursor.col), (len(stream), len(stream) + 1))
+
+    def test_scanner_tag_internals(self) -> None:
+        """
+        Quoted values are sliced whole (even with a ``>`` in them), and whitespace around the tag name, ``=`` and ``/``
+        is skipped.
+        """
+        self.assertEqual([token.value for token in htmllib.Lexer("<div id=\"a>b\">").lex()],
+                         ["<", "div", "id", "=", "a>b", ">", "EOF"])
+        self.assertEqual([token.value for token in htmllib.Lexer("<a b='1'c=2>").lex()],
+                         ["<", "a", "b", "=", "1", "c", "=", "2", ">", "EOF"])
+        self.assertEqual([token.value for token in htmllib.Lexer("<img src = 'x' / >< p>").lex()],
+                         ["<", "img", "src", "=", "x", "/", ">", "<", "p", ">", "EOF"])
+
+    def test_scanner_terminators(self) -> None:
+        """
+        The ``-->`` ending a comment may share its dashes with the ``<!--``, raw text ends at its closing tag whatever
+        the case or whitespace before the ``>``, and only script, style and textarea are raw text.
+        """
+        self.assertEqual([token.extra for token in htmllib.Lexer("<!----><!-- a -- b --->").lex() if token.extra],
+                         ["----", "-- a -- b ---"])
+        self.assertEqual([token.value for token in htmllib.Lexer("<SCRIPT>x</script >y").lex()],
+                         ["<", "SCRIPT", ">", "x", "<", "/", "script", ">", "EOF"])
+        self.assertEqual([token.value for token in htmllib.Lexer("<title>a<b</title>").lex()],
+                         ["<", "title", ">", "<", "b", "<", "/", "title", ">", "EOF"])
+
+    def test_stream_list(self) -> None:
+        lexer = htmllib.Lexer("<p>a</p>")
+        self.assertIs(lexer.stream, lexer.stream)  # Made once, not on every access.
+        self.assertEqual(lexer.stream, list("<p>a</p>"))
+        lexer.lex()
+        lexer._edit(3, 1, "bc")
+        self.assertEqual(lexer.stream, list("<p>bc</p>"))
+
+    #endregion (scanner)
+
+    #region (raw text)
+
+    def test_raw_text_elements(self) -> None:
+        """
+        The content of script, style and textarea elements is one content token, nothing inside of it is tokenized.
+        """
+        tokens = htmllib.Lexer("<script type='a'>if (a < b && c > \"'\") {}</SCRIPT><p>").lex()
+        self.assertEqual([token.value for token in tokens],
+                         ["<", "script", "type", "=", "a", ">", "if (a < b && c > \"'\") {}",
+                          "<", "/", "SCRIPT", ">", "<", "p", ">", "EOF"])
+        self.assertEqual(tokens[6].type, htmllib.TokenTypes.CONTENT)
+        self.assertEqual(tokens[6].cursor.index, 17)
+
+        tokens = htmllib.Lexer("<style></style><textarea><b></textareas></textarea><script/><i>").lex()
+        self.assertEqual([token.value for token in tokens],
+                         ["<", "style", ">", "", "<", "/", "style", ">", "<", "textarea", ">", "<b></textareas>",
+                          "<", "/", "textarea", ">", "<", "script", "/", ">", "<", "i", ">", "EOF"])
+
+        tokens = htmllib.Lexer("<script>never closed <p>").lex()
+        self.assertEqual([token.value for token in tokens], ["<", "script", ">", "never closed <p>", "EOF"])
+
+        tokens = htmllib.Lexer("<textarea>").lex()
+        self.assertEqual([token.value for token in tokens], ["<", "textarea", ">", "", "EOF"])
+
+    #endregion (raw text)
+
+    #region Lexer Tests (comments & doctypes)
+
+    def test_comments_and_doctypes(self) -> None:
+        """
+        Comments end at ``-->``, CDATA sections at ``]]>`` and any other ``<!...>`` at the first ``>``.
+        """
+        tokens = htmllib.Lexer("<!DOCTYPE html><!-- <p> -> a > b --><![CDATA[x > y]]><!-->").lex()
+        self.assertEqual([token.value for token in tokens],
+                         ["<", "!", ">", "<", "!", ">", "<", "!", ">", "<", "!", ">", "EOF"])
+        self.assertEqual([token.extra for token in tokens if token.value == "!"],
+                         ["DOCTYPE html", "-- <p> -> a > b --", "[CDATA[x > y]]", "--"])
+        self.assertEqual(tokens[4].extra_len, 18)
+
+        tokens = htmllib.Lexer("<p><!-- never closed > <p>").lex()
+        self.assertEqual([token.value for token in tokens], ["<", "p", ">", "<", "!", "EOF"])
+        self.assertEqual(tokens[4].extra, "-- never closed > <p>")
+
+        chunks = ["<!", "-", "- a > b -", "-", "><!DOC", "TYPE html>"]
+        self.assertEqual([(token.value, token.extra) for token in htmllib.Lexer(iter(chunks)).iter_tokens()],
+                         [("<", None), ("!", "-- a > b --"), (">", None), ("<", None), ("!", "DOCTYPE html"),
+                          (">", None), ("EOF", None)])
+
+    #endregion (comments & doctypes)
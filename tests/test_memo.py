@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+
+
+"""
+=============================
+HTMLLIB Query Caching Testing
+=============================
+
+Unit tests for the htmlib.memo module.
+"""
+
+
+from __future__ import annotations
+
+from src.htmllib.memo import LRUCache, MISSING
+
+from unittest import TestCase
+
+
+class TestLRUCache(TestCase):
+    def test_lru_cache(self) -> None:
+        cache = LRUCache(2)
+        self.assertIs(cache.get("a"), MISSING)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # Now 'b' is the least recently used.
+        cache.put("c", 3)
+        self.assertIs(cache.get("b"), MISSING)
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        self.assertEqual(tuple(cache.info()), (3, 2, 2, 2))
+        cache.invalidate()
+        self.assertEqual(tuple(cache.info()), (3, 2, 2, 0))
+        cache.clear()
+        self.assertEqual(tuple(cache.info()), (0, 0, 2, 0))
+
+        cache = LRUCache(0)
+        cache.put("a", 1)
+        self.assertEqual(len(cache), 0)
+        self.assertRaises(AssertionError, LRUCache, -1)
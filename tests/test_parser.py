@@ -14,6 +14,7 @@ from __future__ import annotations
 
 from src import htmllib
 
+from time import perf_counter
 from unittest import TestCase
 
 
@@ -164,6 +165,37 @@ class TestParserMethods(TestCase):
         self.assertEqual(nodes[0].cursor_end.line, 1)
         self.assertEqual(nodes[0].cursor_end.col, 6)
 
+    def test_parser_decode_entities(self) -> None:
+        stream = "<a href='?a=1&amp;b=2&copy=3' title=\"&quot;Fish &amp; Chips&quot;\" id='plain'>&amp;</a>"
+        self.assertEqual(htmllib.Parser(stream)._parse_tokens_to_node_list()[0].attributes["href"],
+                         "?a=1&amp;b=2&copy=3")
+        for parser in (htmllib.Parser(stream, decode_entities=True), htmllib.Parser(stream, decode_entities=True,
+                                                                                      compact_tokens=True)):
+            tag = parser._parse_tokens_to_node_list()[0]
+            self.assertEqual(tag.attributes, {"href": "?a=1&b=2&copy=3", "title": "\"Fish & Chips\"", "id": "plain"})
+            self.assertEqual(tag.inner_html, "&amp;")  # Inner HTML is always left as it is in the stream.
+
+    def test_parser_error_policy(self) -> None:
+        stream = "<>< ><p></ ><div"
+        nodes = htmllib.Parser(stream)._parse_tokens_to_node_list()
+        self.assertEqual([node.code for node in nodes if type(node) == htmllib.HTMLErrorNode],
+                         [htmllib.ErrorCodes.NON_VALID_TAG_ID] * 3 + [htmllib.ErrorCodes.NEVER_ENDED_TAG])
+        self.assertEqual(nodes[0].message, "Invalid tag name/ ID '>'")
+        self.assertIs(nodes[0].exception, nodes[0].exception)
+
+        parser = htmllib.Parser(stream, max_errors=2)
+        nodes = parser._parse_tokens_to_node_list()
+        self.assertEqual(sum(type(node) == htmllib.HTMLErrorNode for node in nodes), 2)
+        self.assertEqual(parser.error_count, 4)
+
+        parser = htmllib.Parser(stream, error_policy=htmllib.ErrorPolicy.COUNT)
+        self.assertEqual([node.tag_name for node in parser._parse_tokens_to_node_list()], ["p"])
+        self.assertEqual(parser.error_count, 4)
+
+        parser = htmllib.Parser(stream, error_policy=htmllib.ErrorPolicy.FAIL_FAST)
+        self.assertRaises(htmllib.NonValidTagIDError, parser._parse_tokens_to_node_list)
+        self.assertEqual(parser.error_count, 1)
+
     def test_parser_open_tag_inner_content(self) -> None:
         nodes = self.parser_open_tag_inner_content._parse_tokens_to_node_list()
         self.assertIsInstance(nodes[0], htmllib.HTMLOpeningTagNode)
@@ -176,6 +208,147 @@ class TestParserMethods(TestCase):
         nodes = self.parser_not_all_valid._parse_tokens_to_node_list()
         self.assertIsInstance(nodes[0], htmllib.HTMLOpeningTagNode)
 
+    def test_parser_inner_html_lazy(self) -> None:
+        nodes = htmllib.Parser("<div><p>a</p></div>")._parse_tokens_to_node_list()
+        self.assertNotIn("inner_html", vars(nodes[0]))  # Sliced out of the stream when read, never stored.
+        self.assertEqual(nodes[0].inner_html, "<p>a</p>")
+        self.assertIn("inner_html='<p>a</p>'", repr(nodes[0]))
+        nodes[1].closing_tag = None
+        self.assertIsNone(nodes[1].inner_html)
+
+    def test_parser_void_elements(self) -> None:
+        nodes = htmllib.Parser("<div><IMG src='a'><br><meta charset='utf-8'></div><input/>")._parse_tokens_to_node_list()
+        self.assertEqual([type(node) for node in nodes],
+                         [htmllib.HTMLOpeningTagNode] + [htmllib.HTMLSelfClosingTagNode] * 3 +
+                         [htmllib.HTMLClosingTagNode, htmllib.HTMLSelfClosingTagNode])
+        self.assertEqual(nodes[1].attributes, {"src": "a"})
+        self.assertEqual(nodes[0].inner_html, "<IMG src='a'><br><meta charset='utf-8'>")
+
+    def test_parser_implied_end_tags(self) -> None:
+        nodes = htmllib.Parser("<ul><li>a<li><p>b<div>c</div></ul><p>d<p>e")._parse_tokens_to_node_list()
+        ul, li_a, li_b, p_b, div, _, _, p_d, p_e = nodes
+        self.assertEqual([li_a.inner_html, li_b.inner_html, p_b.inner_html], ["a", "<p>b<div>c</div>", "b"])
+        self.assertTrue(li_a.closing_tag.implied)
+        self.assertEqual(li_a.closing_tag.cursor_start, li_b.cursor_start)
+        self.assertFalse(div.closing_tag.implied)
+        self.assertEqual(p_d.inner_html, "d")
+        self.assertIsNone(p_e.inner_html)  # Never ended, not even by implication.
+
+    def test_parser_compact_tokens(self) -> None:
+        stream = "<div><div><div>test</div><p>a</p><p>456</p></p></div><!-- comment --><img src='null'/>"
+        nodes = htmllib.Parser(stream)._parse_tokens_to_node_list()
+        compact_nodes = htmllib.Parser(stream, compact_tokens=True)._parse_tokens_to_node_list()
+        self.assertEqual(compact_nodes, nodes)
+
+    def test_parser_raw_text_elements(self) -> None:
+        stream = "<script>if (a<b) { x = '</p>'; }</script><style>a > b {}</style>"
+        nodes = htmllib.Parser(stream)._parse_tokens_to_node_list()
+        self.assertEqual([type(node) for node in nodes], [htmllib.HTMLOpeningTagNode, htmllib.HTMLClosingTagNode] * 2)
+        self.assertEqual(nodes[0].inner_html, "if (a<b) { x = '</p>'; }")
+        self.assertEqual(nodes[2].inner_html, "a > b {}")
+
+    def test_parser_build_tree(self) -> None:
+        stream = "<!DOCTYPE html><div><p>a<img/></p></b><ul><li>1<li>2</ul><!-- c --></div><span>"
+        parser = htmllib.Parser(stream, build_tree=True)
+        nodes = parser._parse_tokens_to_node_list()
+        self.assertEqual(nodes, htmllib.Parser(stream)._parse_tokens_to_node_list())
+
+        doctype, div, span = parser.root_nodes
+        self.assertIsNone(div.parent)
+        self.assertEqual(div.closing_tag, nodes[-2])
+        self.assertEqual([type(node) for node in div.children],
+                         [htmllib.HTMLOpeningTagNode, htmllib.HTMLOpeningTagNode, htmllib.HTMLDoctypeOrCommNode])
+        p, ul, comment = div.children
+        self.assertIs(p.children[0].parent, p)
+        self.assertEqual(p.inner_html, "a<img/>")
+        self.assertEqual([node.tag_name for node in ul.children], ["li", "li"])  # A '<li>' ends the one before.
+        self.assertEqual([node.inner_html for node in ul.children], ["1", "2"])
+        self.assertTrue(ul.children[1].closing_tag.implied)
+        self.assertEqual(ul.inner_html, "<li>1<li>2")
+        self.assertIs(comment.parent, div)
+        self.assertIsNone(span.closing_tag)
+        self.assertEqual(span.children, [])
+        self.assertIsNone(htmllib.Parser(stream).root_nodes)
+
+    def test_parser_build_tree_misnested(self) -> None:
+        for stream in ("<div><span></div></span>", "<a><b></a></b>", "<p><b><i></b><div>x</div><span>"):
+            nodes = htmllib.Parser(stream)._parse_tokens_to_node_list()
+            tree_nodes = htmllib.Parser(stream, build_tree=True)._parse_tokens_to_node_list()
+            self.assertEqual([node.inner_html for node in tree_nodes if type(node) == htmllib.HTMLOpeningTagNode],
+                             [node.inner_html for node in nodes if type(node) == htmllib.HTMLOpeningTagNode])
+
+        parser = htmllib.Parser("<div><span></div><i></i></span>", build_tree=True)
+        div, span, _, i, _, _ = parser._parse_tokens_to_node_list()
+        self.assertEqual(span.inner_html, "</div><i></i>")  # Paired as without a tree...
+        self.assertEqual(parser.root_nodes, [div, i])  # ...but it still ends inside of its parent in the tree.
+        self.assertIs(span.parent, div)
+
+    def test_parser_pairing_scales(self) -> None:
+        def parse_time(stream: str, build_tree: bool) -> float:
+            timings = []
+            for _ in range(3):
+                start = perf_counter()
+                htmllib.Parser(stream, build_tree=build_tree)._parse_tokens_to_node_list()
+                timings.append(perf_counter() - start)
+            return min(timings)
+
+        def pile_up(count: int) -> str:  # Stray closing tags under open ones.
+            return "<span>" * count + "</div>" * count
+
+        def deep_matches(count: int) -> str:  # Closing tags matching far down the stack, under elements left open.
+            return "".join(f"<d{index}>" for index in range(count)) + "<span>" * count + \
+                "".join(f"</d{index}>" for index in reversed(range(count)))
+
+        for make_stream in (pile_up, deep_matches):
+            for build_tree in (False, True):
+                small, large = parse_time(make_stream(300), build_tree), parse_time(make_stream(1200), build_tree)
+                self.assertLess(large, small * 10)  # About 4 times as long, where quadratic pairing is 16 times.
+
+        div, span, _ = htmllib.Parser("<div><span></div>")._parse_tokens_to_node_list()
+        self.assertEqual((div.inner_html, span.closing_tag), ("<span>", None))
+
+    def test_parser_fused(self) -> None:
+        stream = "<div><p class='a'>a</p><!-- c --><img/></div><p>"
+        parser = htmllib.Parser(stream, fused=True)
+        nodes = parser.iter_nodes()
+        self.assertEqual(next(nodes).tag_name, "div")  # Nothing after the first tag has been lexed yet.
+        self.assertEqual(parser.curr_token.cursor.index, 4)
+        self.assertEqual(list(nodes), htmllib.Parser(stream)._parse_tokens_to_node_list()[1:])
+        self.assertEqual(parser.tag_nodes_list[0].inner_html, "<p class='a'>a</p><!-- c --><img/>")
+        self.assertEqual(parser.lexer.tokens, [])
+        self.assertRaises(IndexError, parser.lexed.__getitem__, 0)
+        self.assertRaises(AssertionError, htmllib.Parser, stream, fused=True, compact_tokens=True)
+
     def test_parser_nothing_to_parse(self) -> None:
         nodes = self.parser_nothing_to_parse._parse_tokens_to_node_list()
         self.assertEqual(nodes, [])
+
+    def test_parser_node_constructors(self) -> None:
+        doctype, = htmllib.Parser("<!DOCTYPE html>")._parse_tokens_to_node_list()
+        node = htmllib.HTMLDoctypeOrCommNode("DOCTYPE html", doctype.cursor_start, doctype.cursor_end)
+        self.assertEqual(node, doctype)  # The raw text can stand in for the token.
+        self.assertTrue(node.is_doctype)
+        self.assertRaises(TypeError, htmllib.HTMLDoctypeOrCommNode, "", doctype.cursor_start, doctype.cursor_end, None)
+        node = htmllib.HTMLDoctypeOrCommNode(text_raw="DOCTYPE html", cursor_start=doctype.cursor_start,
+                                             cursor_end=doctype.cursor_end)
+        self.assertEqual(node, doctype)
+        node = htmllib.HTMLDoctypeOrCommNode(text_raw="-- c --", cursor_start=None, cursor_end=None)
+        self.assertEqual((node.text_raw, node.is_doctype), ("-- c --", False))
+        self.assertRaises(AssertionError, htmllib.HTMLDoctypeOrCommNode, "", text_raw="")
+
+        div, _ = htmllib.Parser("<div></div>")._parse_tokens_to_node_list()
+        node = htmllib.HTMLOpeningTagNode("div", None, div.cursor_start, div.cursor_end, closing_tag=div.closing_tag)
+        self.assertEqual(node, div)
+        self.assertRaises(TypeError, htmllib.HTMLOpeningTagNode, "div", None, "", div.cursor_start, div.cursor_end)
+        closing_tag = htmllib.HTMLClosingTagNode("div", None, None)
+        node = htmllib.HTMLOpeningTagNode("div", None, None, None, closing_tag=closing_tag)
+        self.assertIsNone(node.inner_html)  # Not backed by a stream.
+        self.assertIn("inner_html=None", repr(node))
+
+        error, = htmllib.Parser("<>")._parse_tokens_to_node_list()
+        code = htmllib.ErrorCodes.NON_VALID_TAG_ID
+        node = htmllib.HTMLErrorNode(code, error.value, error.cursor_start, error.cursor_end)
+        self.assertEqual(node, error)
+        self.assertEqual(node.message, error.message)
+        self.assertRaises(AssertionError, htmllib.HTMLErrorNode, error.message, error.cursor_start, error.cursor_end,
+                          error.exception)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+
+
+"""
+==============================
+HTMLLIB Tree Rewriting Testing
+==============================
+
+Unit tests for the htmlib.rewrite module.
+"""
+
+
+from __future__ import annotations
+
+from src import htmllib
+from src.htmllib.rewrite import Rewrites, render_tag
+
+from unittest import TestCase
+
+
+class TestRewrites(TestCase):
+    def test_render_tag(self) -> None:
+        stream = "<img src='a' alt=\"b\" /><p class=\"x\">"
+        img, p = htmllib.HTMLTree(stream).nodes_list
+        self.assertEqual(render_tag(img, stream), '<img src="a" alt="b"/>')
+        p.attributes["title"] = "Fish & \"Chips\" 'n'"
+        self.assertEqual(render_tag(p, stream, escape_ampersands=True),
+                         '<p class="x" title="Fish &amp; &quot;Chips&quot; \'n\'">')
+        p.attributes = {"title": 'say "hi"'}
+        self.assertEqual(render_tag(p, stream), "<p title='say \"hi\"'>")
+
+    def test_rewrites(self) -> None:
+        stream = "<i>a</i><b>c</b>"
+        rewrites = Rewrites()
+        self.assertFalse(rewrites)
+        rewrites.replace(0, 3, "<em>")
+        rewrites.insert(8, "1")
+        rewrites.insert(8, "2")
+        self.assertEqual(rewrites.splice(stream, 0, len(stream)), "<em>a</i>12<b>c</b>")
+        self.assertEqual(rewrites.splice(stream, 0, 8, outer=False), "<em>a</i>")
+        rewrites.replace(0, 8, "")  # Drops the rewrite inside it, keeps the insertions after it.
+        self.assertEqual(rewrites.splice(stream, 0, len(stream)), "12<b>c</b>")
+        rewrites.replace(10, 16, "x")
+        rewrites.replace(8, 12, "y")  # Merged with the span it overlaps.
+        self.assertEqual(rewrites.splice(stream, 0, len(stream)), "12yx")
+        self.assertEqual([(span.cursor_start.index, span.cursor_end.index) for span in rewrites.iter_replaced(0, 16)],
+                         [(0, 7), (8, 15)])
+        self.assertRaises(AssertionError, rewrites.insert, 9, "z")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+
+"""
+=============================
+HTMLLIB CSS Selectors Testing
+=============================
+
+Unit tests for the ``select``/ ``select_one`` methods of ``HTMLTree`` and the htmlib.selector module.
+"""
+
+
+from __future__ import annotations
+
+from src import htmllib
+
+from unittest import TestCase
+
+
+class TestSelectorMethods(TestCase):
+    def setUp(self) -> None:
+        self.html = """<!DOCTYPE html><html><body>
+            <ul class="menu main"><li>1 <a href="https://x">x</a></li><li class="s">2<a href="/rel">r</a></li>
+            <li><img src="a.png"/><a href="https://y">y</a></li></ul>
+            <div id="main"><p>a<p>b<span title="hello world">s</span></div><BR>
+        </body></html>"""
+        self.htmltrees = htmllib.HTMLTree(self.html), htmllib.HTMLTree(self.html, build_tree=True)
+
+    def select(self, css: str) -> list:
+        results = [[node.cursor_start.index for node in htmltree.select(css)] for htmltree in self.htmltrees]
+        self.assertEqual(results[0], results[1])  # Same with or without a built tree.
+        return [self.html[index + 1 : index + 4] for index in results[0]]
+
+    def test_select_simple(self) -> None:
+        self.assertEqual(self.select("li"), ["li>", "li ", "li>"])
+        self.assertEqual(self.select("#main"), ["div"])
+        self.assertEqual(self.select(".s"), ["li "])
+        self.assertEqual(self.select("ul.main.menu"), ["ul "])
+        self.assertEqual(self.select("br"), ["BR>"])
+        self.assertEqual(self.select("[src]"), ["img"])
+        self.assertEqual(self.select("a[href='/rel']"), ["a h"])
+        self.assertEqual(len(self.select("a[href^='https://']")), 2)
+        self.assertEqual(len(self.select("a[href$=\"y\"]")), 1)
+        self.assertEqual(len(self.select("[title*=lo]")), 1)
+        self.assertEqual(self.select("[title^='']"), [])
+        self.assertEqual(len(self.select("*")), 15)
+        self.assertEqual(self.select("#missing"), [])
+
+    def test_select_structure(self) -> None:
+        self.assertEqual(len(self.select("ul.menu > li:nth-child(odd) a[href^='https://']")), 2)
+        self.assertEqual(self.select("#main > p"), ["p>a", "p>b"])  # The first '<p>' is closed by the second.
+        self.assertEqual(self.select("div span"), ["spa"])
+        self.assertEqual(self.select("ul > a"), [])
+        self.assertEqual(self.select("body > br"), ["BR>"])
+        self.assertEqual(self.select("li:nth-child(2)"), ["li "])
+        self.assertEqual(len(self.select("li:nth-child(-n+2)")), 2)
+        self.assertEqual(len(self.select("li:nth-child(2n+0)")), 1)
+        self.assertEqual(self.select("img, #main, img"), ["img", "div"])
+
+    def test_select_unclosed_and_misnested(self) -> None:
+        queries = ("div p", "span > footer", "p:nth-child(1)", "div > span", "footer:nth-child(3)", "i b", "b > i")
+        for stream in ('<div><span class="ad">x</div><p>after</p><footer>f</footer>', "<i><b></i><p>1</p></b>",
+                       "<ul><li><b>1<li><i>2</ul><b>"):
+            results = [[[node.cursor_start.index for node in htmltree.select(query)] for query in queries]
+                       for htmltree in (htmllib.HTMLTree(stream), htmllib.HTMLTree(stream, build_tree=True))]
+            self.assertEqual(results[0], results[1])
+        htmltree = htmllib.HTMLTree('<div><span class="ad">x</div><p>after</p><footer>f</footer>')
+        self.assertEqual(htmltree.select("div p") + htmltree.select("span > footer"), [])
+        self.assertEqual(len(htmltree.select("footer:nth-child(3)")), 1)  # The unclosed '<span>' ends with '<div>'.
+
+    def test_select_one(self) -> None:
+        for htmltree in self.htmltrees:
+            self.assertEqual(htmltree.select_one("a, img").attributes, {"href": "https://x"})
+            self.assertIsNone(htmltree.select_one("table"))
+
+    def test_select_after_edit(self) -> None:
+        htmltree = htmllib.HTMLTree("<div><p class='a'>1</p></div>")
+        self.assertEqual(len(htmltree.select("div > .a")), 1)
+        htmltree.apply_edit(0, len("<div>"), "<section>")
+        self.assertEqual(htmltree.select("div > .a"), [])
+
+    def test_query_many(self) -> None:
+        queries = {"items": "li", "main": "#main", "links": "a[href^='https://'], ul a", "odd": "li:nth-child(odd) > *",
+                   "menus": ".menu.main", "all": "*", "none": "table", "compiled": htmllib.compile_selector("p span")}
+        for htmltree in self.htmltrees:
+            results = htmltree.query_many(queries)
+            self.assertEqual(list(results), list(queries))
+            for name, query in queries.items():
+                self.assertEqual(results[name], htmltree.select(query if type(query) == str else query.css))
+            self.assertEqual(len(results["links"]), 3)
+            self.assertEqual(htmltree.query_many({}), {})
+
+    def test_compile_selector(self) -> None:
+        self.assertIs(htmllib.compile_selector("div p"), htmllib.compile_selector("div p"))
+        for css in ["", "a >", "a,", "p:hover", "[x", "#", "a b)", "li:nth-child(x)"]:
+            self.assertRaises(htmllib.SelectorSyntaxError, htmllib.compile_selector, css)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+
+
+"""
+===============================
+HTMLLIB Text Extraction Testing
+===============================
+
+Unit tests for the ``get_text``/ ``text`` methods and the htmlib.text module.
+"""
+
+
+from __future__ import annotations
+
+import io
+
+from src import htmllib
+
+from unittest import TestCase
+
+
+class TestTextMethods(TestCase):
+    def setUp(self) -> None:
+        self.html = """<!DOCTYPE html>
+            <html><head><title>Fish &amp; Chips</title><style>p { color: red; }</style></head>
+            <body>
+                <p id="first">Hello,   <b>World</b>!</p><!-- not text -->
+                <script>if (a < b) document.write("<p>not text</p>");</script>
+                <p id="second">Bye <br>now
+            </body></html>"""
+
+    def test_get_text(self) -> None:
+        htmltree = htmllib.HTMLTree(self.html)
+        text = htmltree.get_text()
+        self.assertIn("Hello,   World!", text)
+        self.assertNotIn("not text", text)
+        self.assertNotIn("color", text)
+        self.assertEqual(htmltree.get_text(collapse_whitespace=True), "Fish &amp; Chips Hello, World! Bye now")
+        self.assertEqual(htmltree.get_text(collapse_whitespace=True, decode_entities=True),
+                         "Fish & Chips Hello, World! Bye now")
+        self.assertEqual(htmltree.get_text(separator="|", collapse_whitespace=True),
+                         "Fish &amp; Chips|Hello,|World|!|Bye|now")
+        self.assertEqual(htmllib.HTMLTree(self.html, decode_entities=True).get_text(collapse_whitespace=True)[:12],
+                         "Fish & Chips")
+        self.assertEqual(htmllib.HTMLTree("").get_text(), "")
+
+    def test_get_text_of_node(self) -> None:
+        for htmltree in (htmllib.HTMLTree(self.html), htmllib.HTMLTree(self.html, build_tree=True)):
+            first, second = htmltree.search_tags_by_name("p")
+            self.assertEqual(htmltree.get_text(first), "Hello,   World!")
+            self.assertEqual(htmltree.get_text(second, collapse_whitespace=True), "Bye now")  # Closed by '</body>'.
+            self.assertRaises(AssertionError, htmltree.get_text, htmltree.self_closing_tag_nodes[0])
+
+        htmltree = htmllib.HTMLTree(self.html, build_tree=True)
+        for node in htmltree.opening_tag_nodes:
+            self.assertEqual(node.text(" ", collapse_whitespace=True), htmltree.get_text(node, " ",
+                                                                                      collapse_whitespace=True))
+        self.assertEqual(htmltree.search_tags_by_name("html")[0].text(collapse_whitespace=True, decode_entities=True),
+                         "Fish & Chips Hello, World! Bye now")
+        self.assertRaises(AssertionError, htmllib.HTMLTree(self.html).opening_tag_nodes[0].text)
+
+    def test_get_text_of_unclosed_node(self) -> None:
+        stream = '<div><span class="ad">x<b>y</b></div><p>after</p><footer>f</footer><i>z<u>w'
+        for build_tree in (False, True):
+            htmltree = htmllib.HTMLTree(stream, build_tree=build_tree)
+            span, i, u = (htmltree.search_tags_by_name(name)[0] for name in ("span", "i", "u"))
+            self.assertEqual(htmltree.get_text(span), "xy")  # Ends with its parent, not at the end of the stream.
+            self.assertEqual(htmltree.get_text(i), "zw")  # At the top level it does run to the end.
+            self.assertEqual(htmltree.get_text(u), "w")
+            if build_tree: self.assertEqual((span.text(), i.text()), ("xy", "zw"))
+
+    def test_write_text(self) -> None:
+        file_obj = io.StringIO()
+        htmltree = htmllib.HTMLTree(self.html, lazy=True)
+        htmltree.write_text(file_obj, separator="\n", collapse_whitespace=True)
+        self.assertEqual(file_obj.getvalue(), "Fish &amp; Chips\nHello,\nWorld\n!\nBye\nnow")
+        self.assertEqual(list(htmllib.HTMLTree("a<b>b</b>c").iter_text()), ["a", "b", "c"])